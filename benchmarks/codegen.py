@@ -0,0 +1,86 @@
+"""Compare importing a module written by doc_codegen with create_doc.
+
+The import runs in a fresh interpreter from the compiled `.pyc`, and includes
+the import of hydra_python_core itself.
+
+Usage:
+    python -m benchmarks.codegen --sizes 100 1000 --output codegen.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_codegen import write_module
+from hydra_python_core.doc_maker import create_doc, create_doc_from_generated
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc, strip_remote_contexts
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+_IMPORT = ("import sys, time; sys.path.insert(0, {directory!r}); start = time.perf_counter(); "
+           "import {module}; print(time.perf_counter() - start)")
+
+
+def import_seconds(directory: str, module: str) -> float:
+    """Import a module of `directory` in a fresh interpreter and get the seconds it took."""
+    process = subprocess.run(
+        [sys.executable, "-c", _IMPORT.format(directory=directory, module=module)],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return float(process.stdout)
+
+
+def bench_size(classes: int, repeat: int = 3) -> Dict[str, Any]:
+    """Time writing and importing the module of a doc, and the create_doc calls it replaces."""
+    apidoc = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME)
+    doc = json.loads(json.dumps(apidoc.generate()))
+    expandable = strip_remote_contexts(json.loads(json.dumps(doc)))
+    directory = tempfile.mkdtemp(prefix="hydra-codegen-")
+    try:
+        module = "api_doc_{}".format(classes)
+        path = os.path.join(directory, module + ".py")
+        start = time.perf_counter()
+        pyc = write_module(apidoc, path)
+        write = time.perf_counter() - start
+        return {
+            "classes": classes,
+            "source_bytes": os.path.getsize(path),
+            "pyc_bytes": os.path.getsize(pyc),
+            "seconds": {
+                "write_module": write,
+                "import_module": min(import_seconds(directory, module) for _ in range(repeat)),
+                "create_doc_from_generated": best_of(
+                    repeat, lambda: create_doc_from_generated(doc, SERVER_URL, API_NAME)),
+                "create_doc": best_of(repeat,
+                                      lambda: create_doc(expandable, SERVER_URL, API_NAME)),
+            },
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
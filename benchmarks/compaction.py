@@ -0,0 +1,80 @@
+"""Compare the payload size and speed of the regular and the compact generate output.
+
+Usage:
+    python -m benchmarks.compaction --sizes 100 1000 --output compaction.json
+"""
+import argparse
+import gzip
+import json
+import sys
+from typing import Any, Dict, Iterator, List
+
+from hydra_python_core.namespace import NamespaceRegistry
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def iris(node: Any) -> Iterator[str]:
+    """Yield every absolute IRI value of a generated doc."""
+    if isinstance(node, dict):
+        for value in node.values():
+            yield from iris(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iris(value)
+    elif isinstance(node, str) and "://" in node:
+        yield node
+
+
+def payload(doc: Dict[str, Any]) -> Dict[str, int]:
+    """Get the JSON and gzipped JSON sizes of a doc in bytes."""
+    data = json.dumps(doc).encode("utf-8")
+    return {"json": len(data), "gzip": len(gzip.compress(data))}
+
+
+def bench_size(classes: int, repeat: int = 3, **doc_params: Any) -> Dict[str, Any]:
+    """Measure the regular and compact output of a synthetic doc."""
+    apidoc = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME, **doc_params)
+    full = apidoc.generate()
+    compact = apidoc.generate(compact=True)
+    registry = NamespaceRegistry.from_context(compact["@context"])
+    values = list(iris(full))
+
+    def compact_iris() -> None:
+        for iri in values:
+            registry.curie(iri)
+
+    return {
+        "classes": classes,
+        "bytes": {"regular": payload(full), "compact": payload(compact)},
+        "seconds": {
+            "generate": best_of(repeat, apidoc.generate),
+            "generate_compact": best_of(repeat, lambda: apidoc.generate(compact=True)),
+        },
+        "iris": len(values),
+        "curies_per_second": len(values) / best_of(repeat, compact_iris),
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
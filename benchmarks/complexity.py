@@ -0,0 +1,51 @@
+"""Estimate the empirical growth rate of an operation over doubling input sizes."""
+import gc
+import math
+import time
+from typing import Any, Callable, Iterable, List, Sequence
+
+
+def growth_exponent(sizes: Sequence[int], timings: Sequence[float]) -> float:
+    """
+    Fit timings = c * sizes ** k with least squares in log-log space.
+
+    :return: the exponent k, about 1 for linear and 2 for quadratic growth
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(timing, 1e-9)) for timing in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def nlogn_exponent(sizes: Sequence[int]) -> float:
+    """Get the exponent an n log n operation shows over `sizes`."""
+    return growth_exponent(sizes, [size * math.log(size) for size in sizes])
+
+
+def time_sizes(setup: Callable[[int], Any], operation: Callable[[Any], Any],
+               sizes: Iterable[int], repeat: int = 3) -> List[float]:
+    """
+    Time `operation(setup(size))` for every size.
+
+    The setup is not timed, the garbage collector is paused while timing and
+    the fastest of `repeat` runs is kept to reduce the noise.
+    """
+    timings = []
+    for size in sizes:
+        argument = setup(size)
+        best = float("inf")
+        for _ in range(repeat):
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                operation(argument)
+                best = min(best, time.perf_counter() - start)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+        timings.append(best)
+    return timings
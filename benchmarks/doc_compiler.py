@@ -0,0 +1,70 @@
+"""Time the compilation of many doc files into bundles, in one process and in parallel.
+
+Usage:
+    python -m benchmarks.doc_compiler --docs 8 --classes 500 --jobs 4 --output compiler.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_compiler import compile_sources
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+
+def bench(docs: int, classes: int, jobs: int, repeat: int = 3) -> Dict[str, Any]:
+    """Compile `docs` files of `classes` classes with one process and with `jobs`."""
+    directory = tempfile.mkdtemp(prefix="hydra-compiler-")
+    try:
+        sources = []
+        for i in range(docs):
+            path = os.path.join(directory, "api{}.jsonld".format(i))
+            with open(path, "w") as f:
+                json.dump(build_doc(classes, api_name="api{}".format(i)).generate(), f)
+            sources.append(path)
+        output = os.path.join(directory, "bundles")
+        results = compile_sources(sources, output, jobs=jobs)
+        with open(os.path.join(results[0]["bundle"], "index.json")) as f:
+            vocab = [route for route in json.load(f)["routes"].values()
+                     if route["file"] == "vocab.jsonld"][0]
+        return {
+            "docs": docs,
+            "classes": classes,
+            "jobs": jobs,
+            "vocab_bytes": vocab["bytes"],
+            "vocab_gzip_bytes": vocab["gzip_bytes"],
+            "seconds": {
+                "one_process": best_of(repeat, lambda: compile_sources(sources, output)),
+                "parallel": best_of(repeat, lambda: compile_sources(sources, output,
+                                                                    jobs=jobs)),
+            },
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=8, help="number of doc files")
+    parser.add_argument("--classes", type=int, default=500, help="classes per doc")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="processes of the parallel compilation")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = bench(args.docs, args.classes, args.jobs, args.repeat)
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time the diff of two versions of large docs and compare the JSON Patch with the doc size.
+
+Usage:
+    python -m benchmarks.doc_diff --sizes 1000 10000 --output doc_diff.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_diff import DocDiff
+from hydra_python_core.doc_writer import HydraClass
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def bench_size(classes: int, edits: int = 10, repeat: int = 3) -> Dict[str, Any]:
+    """Time the diff of a doc and a version with `edits` classes changed, removed or added."""
+    old = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME).generate()
+    apidoc = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME)
+    keys = list(apidoc.parsed_classes)
+    for i in range(edits):
+        key = keys[i * len(keys) // edits]
+        if i % 3 == 0:
+            apidoc.parsed_classes[key]["class"].desc = "Changed"
+        elif i % 3 == 1:
+            del apidoc.parsed_classes[key]
+        else:
+            apidoc.add_supported_class(HydraClass("Added{}".format(i), "Added class"))
+    new = apidoc.generate()
+    diff = DocDiff(old, new)
+    return {
+        "classes": classes,
+        "edits": edits,
+        "changes": len(diff.changes),
+        "patch_operations": len(diff.patch),
+        "bytes": {
+            "doc": len(json.dumps(new)),
+            "patch": len(json.dumps(diff.patch)),
+        },
+        "seconds": {
+            "diff": best_of(repeat, lambda: DocDiff(old, new)),
+            "generate": best_of(repeat, apidoc.generate),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--edits", type=int, default=10, help="classes edited in the new version")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.edits, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Serve requests for many tenant APIs from a DocRegistry under a memory budget.
+
+Usage:
+    python -m benchmarks.doc_registry --tenants 50 --resident 10 --output doc_registry.json
+"""
+import argparse
+import json
+import pickle
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from hydra_python_core import doc_maker
+from hydra_python_core.doc_registry import DocRegistry, deep_sizeof
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import make_doc
+
+SERVER_URL = "http://hydrus.com/"
+
+
+def bench(tenants: int, resident: int, requests: int, classes: int,
+          seed: int = 0) -> Dict[str, Any]:
+    """Time `requests` gets with a Zipf-like tenant popularity and `resident` docs in budget."""
+    docs = {"api{}".format(i): make_doc(classes, server_url=SERVER_URL,
+                                        api_name="api{}".format(i)) for i in range(tenants)}
+
+    def loader(server_url: str, api_name: str) -> Any:
+        return doc_maker.create_doc(docs[api_name], server_url, api_name)
+
+    apidoc = loader(SERVER_URL, "api0")
+    size = deep_sizeof(apidoc)
+    snapshot = pickle.dumps(apidoc, protocol=pickle.HIGHEST_PROTOCOL)
+    registry = DocRegistry(loader, budget=resident * size)
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(tenants)]
+    names = rng.choices(list(docs), weights, k=requests)
+    start = time.perf_counter()
+    for name in names:
+        registry.get(SERVER_URL, name)
+    seconds = time.perf_counter() - start
+    registry.close()
+    totals = {}  # type: Dict[str, int]
+    for stats in registry.stats().values():
+        for counter, value in stats.items():
+            totals[counter] = totals.get(counter, 0) + value
+    del totals["bytes"]
+    return {
+        "tenants": tenants,
+        "resident": resident,
+        "requests": requests,
+        "classes": classes,
+        "doc_bytes": size,
+        "counters": totals,
+        "hit_rate": totals["hits"] / requests,
+        "seconds": {
+            "requests": seconds,
+            "build_one_doc": best_of(3, lambda: loader(SERVER_URL, "api0")),
+            "load_one_snapshot": best_of(3, lambda: pickle.loads(snapshot)),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=50, help="number of tenant APIs")
+    parser.add_argument("--resident", type=int, default=10,
+                        help="number of docs the memory budget holds")
+    parser.add_argument("--requests", type=int, default=2000, help="number of gets")
+    parser.add_argument("--classes", type=int, default=20, help="classes per doc")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    result = bench(args.tenants, args.resident, args.requests, args.classes)
+    dump = json.dumps({"results": [result]}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
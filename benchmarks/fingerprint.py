@@ -0,0 +1,62 @@
+"""Compare the cached fingerprints of a doc with hashing its sorted generate() output.
+
+Usage:
+    python -m benchmarks.fingerprint --sizes 1000 10000 --output fingerprint.json
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def bench_size(classes: int, repeat: int = 3) -> Dict[str, Any]:
+    """Time the first fingerprint, a cached one, one after a class changed and a JSON hash."""
+    apidoc = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME)
+    start = time.perf_counter()
+    apidoc.fingerprint()
+    first = time.perf_counter() - start
+    class_ = apidoc.parsed_classes["Class0"]["class"]
+
+    def change() -> None:
+        class_.desc += "!"
+        apidoc.fingerprint()
+
+    return {
+        "classes": classes,
+        "seconds": {
+            "first_fingerprint": first,
+            "cached_fingerprint": best_of(repeat, apidoc.fingerprint),
+            "fingerprint_after_change": best_of(repeat, change),
+            "json_hash": best_of(repeat, lambda: hashlib.sha256(
+                json.dumps(apidoc.generate(), sort_keys=True).encode()).hexdigest()),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare is-a queries on the ClassHierarchy of a doc with recursive walks of the parents.
+
+Usage:
+    python -m benchmarks.hierarchy --sizes 100 1000 --output hierarchy.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_hierarchy import class_parents
+from hydra_python_core.doc_writer import HydraClass, HydraDoc
+from hydra_python_core.namespace import hydra
+from benchmarks.run import best_of
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def build_tree_doc(classes: int, fanout: int = 2) -> HydraDoc:
+    """Build a doc whose classes form a tree, the class i being a subclass of (i - 1) // fanout."""
+    apidoc = HydraDoc(API_NAME, "Hierarchy", "Synthetic class hierarchy", "EntryPoint",
+                      SERVER_URL, "vocab")
+    class_list = []  # type: List[HydraClass]
+    for i in range(classes):
+        parent = class_list[(i - 1) // fanout].id_ if i else None
+        class_list.append(HydraClass("Class{}".format(i), "Class {}".format(i),
+                                     sub_classof=parent))
+    # children first, so that the closure is completed by the incremental updates
+    for class_ in reversed(class_list):
+        apidoc.add_supported_class(class_)
+    apidoc.add_baseResource()
+    apidoc.add_baseCollection()
+    return apidoc
+
+
+def walk_is_subclass(classes: Dict[str, HydraClass], sub: str, sup: str) -> bool:
+    """Recursive walk up the parents of the HydraClass templates."""
+    if sub == sup:
+        return True
+    class_ = classes.get(sub)
+    parents = class_parents(class_.parents) if class_ is not None else []
+    if not parents and sub != hydra["Resource"]:
+        parents = [hydra["Resource"]]
+    return any(walk_is_subclass(classes, parent, sup) for parent in parents)
+
+
+def bench_size(classes: int, repeat: int = 3) -> Dict[str, Any]:
+    """Time the hierarchy build and all the is-a queries against the root and a leaf."""
+    apidoc = build_tree_doc(classes)
+    templates = {apidoc.parsed_classes[key]["class"].id_: apidoc.parsed_classes[key]["class"]
+                 for key in apidoc.parsed_classes}
+    ids = list(templates)
+    pairs = [(sub, sup) for sub in ids for sup in (ids[-1], ids[0], hydra["Resource"])]
+    assert all(apidoc.is_subclass(sub, sup) == walk_is_subclass(templates, sub, sup)
+               for sub, sup in pairs)
+    return {
+        "classes": classes,
+        "queries": len(pairs),
+        "seconds": {
+            "build_doc": best_of(repeat, lambda: build_tree_doc(classes)),
+            "is_subclass": best_of(
+                repeat, lambda: [apidoc.is_subclass(sub, sup) for sub, sup in pairs]),
+            "recursive_walk": best_of(
+                repeat, lambda: [walk_is_subclass(templates, sub, sup) for sub, sup in pairs]),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
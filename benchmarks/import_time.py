@@ -0,0 +1,82 @@
+"""Measure the import time of the package modules with python -X importtime.
+
+Every module is imported in a fresh interpreter, and the run fails when one
+takes longer than the budget or imports one of the heavy modules loaded only
+by JSON-LD expansion.
+
+Usage:
+    python -m benchmarks.import_time --budget-ms 100 --output import_time.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+MODULES = ["hydra_python_core.doc_writer", "hydra_python_core.doc_maker"]
+# imported by the first create_doc expansion, not by the modules
+DEFERRED = ["pyld", "requests"]
+BUDGET_MS = 100.0
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Get the self and cumulative microseconds of every module of -X importtime output."""
+    times = dict()  # type: Dict[str, Tuple[int, int]]
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # the header line
+            continue
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def import_time(module: str) -> Dict[str, Tuple[int, int]]:
+    """Import a module in a fresh interpreter and get its -X importtime output."""
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True, check=True)
+    return parse_importtime(process.stderr)
+
+
+def bench_module(module: str, repeat: int = 3, budget_ms: float = BUDGET_MS) -> Dict[str, Any]:
+    """Get the best cumulative import time of a module and the deferred modules it imports."""
+    best = float("inf")
+    deferred = []  # type: List[str]
+    for _ in range(repeat):
+        times = import_time(module)
+        best = min(best, times[module][1] / 1000)
+        deferred = sorted(name for name in DEFERRED if name in times)
+    return {
+        "module": module,
+        "milliseconds": best,
+        "deferred_imported": deferred,
+        "within_budget": best <= budget_ms and not deferred,
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=MODULES, help="modules to import")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                        help="milliseconds allowed for the import of each module")
+    parser.add_argument("--repeat", type=int, default=3, help="imports per module")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_module(module, args.repeat, args.budget_ms) for module in args.modules]
+    dump = json.dumps({"budget_ms": args.budget_ms, "results": results}, indent=4,
+                      sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+    if not all(result["within_budget"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
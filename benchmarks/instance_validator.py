@@ -0,0 +1,88 @@
+"""Compare validating a batch of instances at once with validating them one at a time.
+
+Usage:
+    python -m benchmarks.instance_validator --sizes 10000 100000 --output validation.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp
+from hydra_python_core.instance_validator import validate_batch, validate_columns
+from benchmarks.members import RANGES, make_members
+from benchmarks.run import best_of
+
+
+def instance_class() -> HydraClass:
+    """Get a class of the members of benchmarks.members, its title required, its year readonly."""
+    class_ = HydraClass("Book", "A book")
+    for title, range_ in RANGES:
+        class_.add_supported_prop(HydraClassProp(
+            "http://props.hydrus.com/" + title, title, read=True, write=(title != "year"),
+            required=(title == "title"), range=range_))
+    return class_
+
+
+def make_instances(count: int) -> List[Dict[str, Any]]:
+    """Get instances to create, one in a hundred with an error."""
+    instances = make_members(count)
+    for i, instance in enumerate(instances):
+        del instance["year"]
+        if i % 300 == 0:
+            del instance["title"]
+        elif i % 300 == 100:
+            instance["pages"] = str(instance["pages"])
+        elif i % 300 == 200:
+            instance["year"] = 2000
+    return instances
+
+
+def bench_size(count: int, repeat: int = 3) -> Dict[str, Any]:
+    """Validate `count` instances one at a time, as a batch and as columns."""
+    class_ = instance_class()
+    instances = make_instances(count)
+    keys = [title for title, _ in RANGES]
+    columns = {key: [instance.get(key) for instance in instances] for key in keys}
+
+    def one_at_a_time() -> Dict[int, List[str]]:
+        errors = dict()
+        for row, instance in enumerate(instances):
+            instance_errors = validate_batch(class_, [instance])
+            if instance_errors:
+                errors[row] = instance_errors[0]
+        return errors
+
+    errors = validate_batch(class_, instances)
+    assert one_at_a_time() == errors
+    assert validate_columns(class_, columns) == errors
+    return {
+        "instances": count,
+        "invalid": len(errors),
+        "seconds": {
+            "one_at_a_time": best_of(repeat, one_at_a_time),
+            "batch": best_of(repeat, lambda: validate_batch(class_, instances)),
+            "columns": best_of(repeat, lambda: validate_columns(class_, columns)),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="numbers of instances to validate")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Time the precomputation of the LinkGraph of large docs and the planned paths.
+
+Usage:
+    python -m benchmarks.link_graph --sizes 1000 10000 --output link_graph.json
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_graph import LinkGraph
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def bench_size(classes: int, repeat: int = 3, **doc_params: Any) -> Dict[str, Any]:
+    """Time the graph build, the first search from the EntryPoint and cached paths."""
+    apidoc = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME, **doc_params)
+    targets = [apidoc.parsed_classes[key]["class"].id_ for key in apidoc.parsed_classes]
+
+    def search() -> None:
+        LinkGraph(apidoc).reachable()
+
+    graph = LinkGraph(apidoc)
+    start = time.perf_counter()
+    graph.reachable()
+    first = time.perf_counter() - start
+    return {
+        "classes": classes,
+        "nodes": len(graph.nodes),
+        "edges": sum(len(edges) for edges in graph.adjacency),
+        "seconds": {
+            "build": best_of(repeat, lambda: LinkGraph(apidoc)),
+            "build_and_search": best_of(repeat, search),
+            "first_search": first,
+            "paths_to_all_classes": best_of(
+                repeat, lambda: [graph.shortest_path(target) for target in targets]),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--links", type=int, default=2, help="links per class")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat, links=args.links, properties=0, operations=1,
+                          statuses=0) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare the memory and page serialization of doc_members buffers with lists of dicts.
+
+Usage:
+    python -m benchmarks.members --sizes 10000 100000 --page-size 1000 --output members.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from hydra_python_core import doc_members
+from hydra_python_core.doc_members import MemberBuffer
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp
+from benchmarks.resources import allocated
+from benchmarks.run import best_of
+
+RANGES = (("title", "xsd:string"), ("status", "xsd:string"), ("pages", "xsd:integer"),
+          ("year", "xsd:integer"), ("price", "xsd:decimal"), ("available", "xsd:boolean"))
+
+
+def member_class() -> HydraClass:
+    """Get a class with string, integer, decimal and boolean properties."""
+    class_ = HydraClass("Book", "A book")
+    for title, range_ in RANGES:
+        class_.add_supported_prop(HydraClassProp("http://props.hydrus.com/" + title, title,
+                                                 True, True, False, range=range_))
+    return class_
+
+
+def make_members(count: int) -> List[Dict[str, Any]]:
+    statuses = ["draft", "published", "archived"]
+    return [{"@id": "http://hydrus.com/api/Book/{}".format(i), "@type": "Book",
+             "title": "Title {}".format(i), "status": statuses[i % 3], "pages": 100 + i % 900,
+             "year": 1900 + i % 120, "price": (i % 5000) / 100, "available": i % 2 == 0}
+            for i in range(count)]
+
+
+def bench_size(count: int, page_size: int = 1000, repeat: int = 3,
+               use_numpy: bool = False) -> Dict[str, Any]:
+    """Hold `count` members as dicts and in a buffer, and serialize all their pages.
+
+    The dicts are measured with their values, which the buffer copies into its columns.
+    """
+    data = make_members(count)
+    class_ = member_class()
+
+    def buffer() -> MemberBuffer:
+        members = MemberBuffer(class_, use_numpy)
+        members.extend(data)
+        return members
+
+    members = buffer()
+    starts = range(0, count, page_size)
+    return {
+        "members": count,
+        "page_size": page_size,
+        "numpy": use_numpy,
+        "bytes": {
+            "dicts": allocated(lambda: make_members(count)),
+            "buffer": allocated(buffer),
+        },
+        "seconds": {
+            "dicts_json": best_of(repeat, lambda: [
+                json.dumps(data[start:start + page_size]) for start in starts]),
+            "buffer_json": best_of(repeat, lambda: [
+                members.members_json(start, start + page_size) for start in starts]),
+            "buffer_extend": best_of(repeat, buffer),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="numbers of members to measure")
+    parser.add_argument("--page-size", type=int, default=1000, help="members per page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    backends = [False, True] if doc_members.numpy is not None else [False]
+    results = [bench_size(size, args.page_size, args.repeat, use_numpy)
+               for size in args.sizes for use_numpy in backends]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
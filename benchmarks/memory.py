@@ -0,0 +1,67 @@
+"""Measure the memory retained by the HydraDoc built by create_doc.
+
+Usage:
+    python -m benchmarks.memory --sizes 100 1000 --output memory.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+from hydra_python_core import doc_maker
+from benchmarks.synthetic_doc import make_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """Get the bytes still allocated once `build()` returned, its result being alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bench_size(classes: int, **doc_params: Any) -> Dict[str, Any]:
+    """Compare the memory of a doc built with and without the IRI pool."""
+    doc = make_doc(classes, server_url=SERVER_URL, api_name=API_NAME, **doc_params)
+    pooled = retained_bytes(lambda: doc_maker.create_doc(doc, SERVER_URL, API_NAME))
+    with mock.patch.object(doc_maker, "IriPool", contextlib.nullcontext):
+        unpooled = retained_bytes(lambda: doc_maker.create_doc(doc, SERVER_URL, API_NAME))
+    return {
+        "classes": classes,
+        "bytes": {"pooled": pooled, "unpooled": unpooled},
+        "reduction": 1 - pooled / unpooled,
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    dump = json.dumps({"results": [bench_size(size) for size in args.sizes]},
+                      indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
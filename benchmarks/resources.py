@@ -0,0 +1,70 @@
+"""Compare the memory and speed of doc_resources instances with plain dicts.
+
+Usage:
+    python -m benchmarks.resources --sizes 10000 100000 --output resources.json
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from hydra_python_core.doc_resources import resource_classes
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+
+def allocated(build: Callable[[], Any]) -> int:
+    """Get the bytes still allocated by `build` while its result is alive."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_size(instances: int, repeat: int = 3) -> Dict[str, Any]:
+    """Hold `instances` instances of a class with 5 properties and a link, as dicts and slots."""
+    class_ = resource_classes(build_doc(2))["Class0"]
+    values = ["value{}".format(i) for i in range(6)]
+    data = [{"@type": "Class0", "@id": "/api/Class0/{}".format(i), "prop0": values[0],
+             "prop1": values[1], "prop2": values[2], "prop3": values[3], "prop4": values[4],
+             "link0": values[5]} for i in range(instances)]
+    resources = [class_.from_jsonld(item) for item in data]
+    return {
+        "instances": instances,
+        "bytes": {
+            "dicts": allocated(lambda: [dict(item) for item in data]),
+            "resources": allocated(lambda: [class_.from_jsonld(item) for item in data]),
+        },
+        "seconds": {
+            "dict_copy": best_of(repeat, lambda: [dict(item) for item in data]),
+            "from_jsonld": best_of(repeat, lambda: [class_.from_jsonld(item) for item in data]),
+            "to_jsonld": best_of(repeat, lambda: [resource.to_jsonld() for resource in resources]),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="numbers of instances to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare rebuilding a doc from its generate() output with create_doc.
+
+Usage:
+    python -m benchmarks.roundtrip --sizes 100 1000 --output roundtrip.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from hydra_python_core.doc_maker import create_doc, create_doc_from_generated
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc, strip_remote_contexts
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def bench_size(classes: int, repeat: int = 3) -> Dict[str, Any]:
+    """Time create_doc_from_generated and create_doc on the same doc."""
+    doc = json.loads(json.dumps(build_doc(classes).generate()))
+    # create_doc expands offline without the remote context of the statuses
+    expandable = strip_remote_contexts(json.loads(json.dumps(doc)))
+    rebuilt = create_doc_from_generated(doc, SERVER_URL, API_NAME)
+    return {
+        "classes": classes,
+        "identical": rebuilt.generate() == doc,
+        "seconds": {
+            "create_doc_from_generated": best_of(
+                repeat, lambda: create_doc_from_generated(doc, SERVER_URL, API_NAME)),
+            "create_doc": best_of(repeat, lambda: create_doc(expandable, SERVER_URL, API_NAME)),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time create_doc, generate, HydraEntryPoint.get and JSON serialization on synthetic docs.
+
+Usage:
+    python -m benchmarks.run --sizes 10 100 1000 --output results.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from hydra_python_core.doc_maker import create_doc
+from hydra_python_core.instrumentation import Instrumentation
+from benchmarks.synthetic_doc import make_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def best_of(repeat: int, function: Callable[[], Any]) -> float:
+    """Get the fastest wall time in seconds of `repeat` calls of `function`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_size(classes: int, repeat: int = 3, **doc_params: Any) -> Dict[str, Any]:
+    """Run every benchmark on a synthetic doc with `classes` classes."""
+    doc = make_doc(classes, server_url=SERVER_URL, api_name=API_NAME, **doc_params)
+    with Instrumentation() as instrumentation:
+        apidoc = create_doc(doc, SERVER_URL, API_NAME)
+    generated = apidoc.generate()
+    result = {
+        "classes": classes,
+        "supportedClass": len(generated["supportedClass"]),
+        "seconds": {
+            "create_doc": best_of(repeat, lambda: create_doc(doc, SERVER_URL, API_NAME)),
+            "generate": best_of(repeat, apidoc.generate),
+            "entrypoint_get": best_of(repeat, apidoc.entrypoint.get),
+            "json_dumps": best_of(repeat, lambda: json.dumps(generated)),
+        },
+        "bytes": len(json.dumps(generated)),
+        "create_doc_phases": instrumentation.as_dict(),
+    }
+    return result
+
+
+def run(sizes: List[int], repeat: int = 3, **doc_params: Any) -> Dict[str, Any]:
+    """Benchmark every size and collect the results as a python dict."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "doc_params": doc_params,
+        "results": [bench_size(size, repeat, **doc_params) for size in sizes],
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="numbers of classes to benchmark, up to the 50k range")
+    parser.add_argument("--properties", type=int, default=5, help="properties per class")
+    parser.add_argument("--links", type=int, default=1, help="links per class")
+    parser.add_argument("--operations", type=int, default=4, help="operations per class")
+    parser.add_argument("--collections", type=int, default=None,
+                        help="number of collections, defaults to classes / 10")
+    parser.add_argument("--statuses", type=int, default=3, help="statuses per operation")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, properties=args.properties, links=args.links,
+                  operations=args.operations, collections=args.collections,
+                  statuses=args.statuses)
+    dump = json.dumps(results, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Generate synthetic Hydra API Documentations of configurable size."""
+from typing import Any, Dict
+
+from hydra_python_core.doc_writer import (HydraDoc, HydraClass, HydraClassProp, HydraClassOp,
+                                          HydraStatus, HydraLink, HydraCollection)
+
+METHODS = ("GET", "PUT", "POST", "DELETE")
+
+
+def build_doc(classes: int = 10, properties: int = 5, links: int = 1, operations: int = 4,
+              collections: int = None, statuses: int = 3,
+              server_url: str = "http://hydrus.com/", api_name: str = "api") -> HydraDoc:
+    """
+    Build a HydraDoc with doc_writer.
+
+    :param classes: number of classes
+    :param properties: number of literal properties per class
+    :param links: number of HydraLink properties per class, each linking to another class
+    :param operations: number of operations per class
+    :param collections: number of collections, defaults to one for every ten classes
+    :param statuses: number of possibleStatus per operation and for the whole doc
+    :param server_url: url of the hydrus server
+    :param api_name: name of the api
+    :return: HydraDoc with the base classes and the EntryPoint generated
+    :raise ValueError: If `classes` is less than 1, the links and collections need a class.
+    """
+    if classes < 1:
+        raise ValueError("build_doc needs at least one class, got {}".format(classes))
+    if collections is None:
+        collections = max(1, classes // 10)
+    api_doc = HydraDoc(api_name, "Synthetic API", "Synthetic API Documentation",
+                       api_name, server_url, "vocab")
+
+    class_list = [HydraClass("Class{}".format(i), "Synthetic class {}".format(i),
+                             endpoint=(i % 2 == 0)) for i in range(classes)]
+    for i, class_ in enumerate(class_list):
+        for j in range(properties):
+            class_.add_supported_prop(HydraClassProp(
+                "http://props.hydrus.com/prop{}".format(j), "prop{}".format(j),
+                required=(j == 0), read=True, write=(j % 2 == 0), range="xsd:string"))
+        for j in range(links):
+            target = class_list[(i + j + 1) % classes]
+            link = HydraLink("Class{}_link{}".format(i, j), "link{}".format(j),
+                             "Link from {} to {}".format(class_.title, target.title),
+                             class_.id_, target.id_)
+            link.add_supported_op(HydraClassOp("Get{}".format(target.title), "GET",
+                                               None, target.id_))
+            class_.add_supported_prop(HydraClassProp(link, "link{}".format(j),
+                                                     required=False, read=True, write=True))
+        for j in range(operations):
+            method = METHODS[j % len(METHODS)]
+            class_.add_supported_op(HydraClassOp(
+                "{}{}{}".format(method.capitalize(), class_.title, j), method,
+                class_.id_ if method in ("PUT", "POST") else None,
+                class_.id_ if method != "DELETE" else None,
+                [], ["Content-Type"],
+                [HydraStatus(200 + k, title="status{}".format(k),
+                             desc="{} {} status {}".format(class_.title, method, k))
+                 for k in range(statuses)]))
+        api_doc.add_supported_class(class_)
+
+    for i in range(collections):
+        managed = class_list[i % classes]
+        api_doc.add_supported_collection(HydraCollection(
+            collection_name="Collection{}".format(i),
+            collection_description="Collection of {}".format(managed.title),
+            manages={"property": "rdf:type", "object": managed.id_},
+            collection_path="Collection{}".format(i)))
+
+    for k in range(statuses):
+        api_doc.add_possible_status(HydraStatus(400 + k, title="error{}".format(k),
+                                                desc="Synthetic error {}".format(k)))
+    api_doc.add_baseResource()
+    api_doc.add_baseCollection()
+    api_doc.gen_EntryPoint()
+    return api_doc
+
+
+def strip_remote_contexts(object_: Any) -> Any:
+    """Drop the remote hydra context of statuses so the doc expands offline."""
+    if isinstance(object_, dict):
+        if object_.get("@context") == "https://www.w3.org/ns/hydra/core":
+            del object_["@context"]
+        for value in object_.values():
+            strip_remote_contexts(value)
+    elif isinstance(object_, list):
+        for value in object_:
+            strip_remote_contexts(value)
+    return object_
+
+
+def make_doc(classes: int = 10, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Get a synthetic API Documentation as a python dict, ready for create_doc.
+
+    Takes the same arguments as `build_doc`.
+    """
+    return strip_remote_contexts(build_doc(classes, **kwargs).generate())
@@ -0,0 +1,83 @@
+"""Compare pattern queries on the DocIndex of a doc with naive scans.
+
+Usage:
+    python -m benchmarks.triple_index --sizes 100 1000 --output triple_index.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List
+
+from hydra_python_core.doc_index import DocIndex
+from hydra_python_core.namespace import hydra
+from benchmarks.run import best_of
+from benchmarks.synthetic_doc import build_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def nodes(node: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every node of a generated doc."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from nodes(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from nodes(value)
+
+
+def bench_size(classes: int, repeat: int = 3, **doc_params: Any) -> Dict[str, Any]:
+    """Time the index build and one query answered three ways."""
+    apidoc = build_doc(classes, server_url=SERVER_URL, api_name=API_NAME, **doc_params)
+    triples = list(apidoc.iter_triples())
+    index = DocIndex(apidoc)
+    targets = [apidoc.parsed_classes[key]["class"].id_ for key in apidoc.parsed_classes]
+    targets = targets[::max(1, len(targets) // 20)]
+
+    def query_index() -> None:
+        for target in targets:
+            list(index.match(None, hydra["returns"], target))
+
+    def scan_triples() -> None:
+        for target in targets:
+            [triple for triple in triples
+             if triple[1] == hydra["returns"] and triple[2] == target]
+
+    def scan_generate() -> None:
+        for target in targets:
+            [node for node in nodes(apidoc.generate()) if node.get("returns") == target]
+
+    return {
+        "classes": classes,
+        "triples": len(index),
+        "queries": len(targets),
+        "seconds": {
+            "build": best_of(repeat, lambda: DocIndex(apidoc)),
+            "query_index": best_of(repeat, query_index),
+            "scan_triples": best_of(repeat, scan_triples),
+            "scan_generate": best_of(1, scan_generate),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="numbers of classes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_size(size, args.repeat) for size in args.sizes]
+    dump = json.dumps({"results": results}, indent=4, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(dump)
+    else:
+        sys.stdout.write(dump + "\n")
+
+
+if __name__ == "__main__":
+    main()
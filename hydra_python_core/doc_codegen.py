@@ -0,0 +1,201 @@
+"""Generate a Python module building a HydraDoc, for startup without any parsing.
+
+The module holds the state of every template of the doc as Python literals
+and restores the templates from it without running their constructors, so
+the IRIs, the contexts and the class hierarchy are not computed again.
+Objects held in several places, like the operations of a class and of its
+EntryPoint link, are still the same object in the restored doc. Once the
+module is compiled, importing its `.pyc` is the whole cost of loading the doc.
+
+Example:
+    write_module(create_doc(doc, HYDRUS_SERVER_URL, API_NAME), "api_doc.py")
+    from api_doc import api_doc
+
+Usage:
+    python -m hydra_python_core.doc_codegen api_doc.jsonld --output api_doc.py
+"""
+import argparse
+import math
+import py_compile
+import sys
+from typing import Any, Dict, List, Set, Tuple
+from urllib.parse import urljoin
+
+from hydra_python_core.doc_writer import DocUrl, HydraClass, HydraCollection, HydraDoc
+
+_SCALARS = (type(None), bool, int, str)
+# templates written as one statement each, which keeps the expressions small
+_HOISTED = (HydraClass, HydraCollection)
+
+_HEADER = '''"""HydraDoc {title!r}, generated by hydra_python_core.doc_codegen, do not edit."""
+{imports}
+
+
+def _new(type_, state):
+    object_ = type_.__new__(type_)
+    object_.__dict__.update(state)
+    return object_
+
+
+def _build():
+'''
+
+_FOOTER = '''
+
+{name} = _build()
+# as create_doc does, the templates created afterwards are in the doc's vocabulary
+DocUrl.doc_url = {doc_url!r}
+'''
+
+
+def _state(object_: Any) -> Dict[str, Any]:
+    """Get the attributes of a template to restore, as pickled."""
+    state = object_.__getstate__() if hasattr(object_, "__getstate__") else None
+    if not isinstance(state, dict):
+        state = object_.__dict__
+    return state
+
+
+def _children(object_: Any) -> List[Any]:
+    if isinstance(object_, dict):
+        return list(object_.keys()) + list(object_.values())
+    if isinstance(object_, (list, tuple, set, frozenset)):
+        return list(object_)
+    return list(_state(object_).values())
+
+
+class _Writer:
+    """Python source of an object graph, its shared objects bound to local names."""
+
+    def __init__(self, root: Any) -> None:
+        self.lines = list()  # type: List[str]
+        self.names = dict()  # type: Dict[int, str]
+        # DocUrl is imported for the doc_url it sets
+        self.types = {DocUrl: "DocUrl"}  # type: Dict[type, str]
+        self.hoisted = set()  # type: Set[int]
+        self._count(root)
+
+    def _count(self, root: Any) -> None:
+        """Find the objects referenced more than once."""
+        seen = set()  # type: Set[int]
+        stack = [root]
+        while stack:
+            object_ = stack.pop()
+            if isinstance(object_, _SCALARS) or isinstance(object_, float):
+                continue
+            if id(object_) in seen:
+                self.hoisted.add(id(object_))
+                continue
+            seen.add(id(object_))
+            if isinstance(object_, _HOISTED):
+                self.hoisted.add(id(object_))
+            stack.extend(_children(object_))
+
+    def _type(self, type_: type) -> str:
+        name = self.types.get(type_)
+        if name is None:
+            # the generated module imports it, as pickle would
+            if getattr(sys.modules.get(type_.__module__), type_.__qualname__, None) is not type_:
+                raise ValueError("Can't import {!r}".format(type_))
+            name = type_.__name__
+            if name in self.types.values() or name in ("_new", "_build"):
+                name = "_{}{}".format(name, len(self.types))
+            self.types[type_] = name
+        return name
+
+    def imports(self) -> str:
+        imports = []
+        for type_, name in self.types.items():
+            alias = "" if name == type_.__name__ else " as {}".format(name)
+            imports.append("from {} import {}{}".format(type_.__module__, type_.__name__, alias))
+        return "\n".join(sorted(imports))
+
+    def expr(self, object_: Any, path: Tuple[int, ...]=()) -> str:
+        """Get the expression of an object, writing the statements of its shared parts first."""
+        if isinstance(object_, _SCALARS):
+            return repr(object_)
+        if isinstance(object_, float):
+            if not math.isfinite(object_):
+                return "float({!r})".format(repr(object_))
+            return repr(object_)
+        key = id(object_)
+        if key in self.names:
+            return self.names[key]
+        if key in path:
+            raise ValueError("Can't write a cycle through {!r}".format(object_))
+        path = path + (key,)
+        if isinstance(object_, list):
+            expr = "[{}]".format(", ".join(self.expr(item, path) for item in object_))
+        elif isinstance(object_, tuple):
+            expr = "({}{})".format(", ".join(self.expr(item, path) for item in object_),
+                                   "," if len(object_) == 1 else "")
+        elif isinstance(object_, (set, frozenset)):
+            items = ", ".join(self.expr(item, path) for item in object_)
+            expr = "{{{}}}".format(items) if items else "set()"
+            if isinstance(object_, frozenset):
+                expr = "frozenset({})".format(expr)
+        elif isinstance(object_, dict):
+            expr = "{{{}}}".format(", ".join("{}: {}".format(self.expr(item, path),
+                                                             self.expr(value, path))
+                                             for item, value in object_.items()))
+        elif hasattr(object_, "__dict__"):
+            expr = "_new({}, {})".format(self._type(type(object_)),
+                                         self.expr(_state(object_), path))
+        else:
+            raise ValueError("Can't write {!r}".format(object_))
+        if key not in self.hoisted:
+            return expr
+        name = "_{}".format(len(self.names))
+        self.names[key] = name
+        self.lines.append("    {} = {}".format(name, expr))
+        return name
+
+
+def generate_module(apidoc: HydraDoc, name: str = "api_doc") -> str:
+    """
+    Get the source of a Python module building the HydraDoc.
+
+    :param apidoc: the HydraDoc, as built by doc_writer or create_doc
+    :param name: name of the module attribute holding the HydraDoc
+    :return: Python source, setting DocUrl.doc_url to the doc's when imported
+    :raise ValueError: If an attribute of the doc can't be written as Python.
+    """
+    writer = _Writer(apidoc)
+    root = writer.expr(apidoc)
+    writer.lines.append("    return {}".format(root))
+    doc_url = "{}/{}?resource=".format(urljoin(apidoc.base_url, apidoc.API), apidoc.doc_name)
+    return "".join([
+        _HEADER.format(title=apidoc.title, imports=writer.imports()),
+        "\n".join(writer.lines),
+        "\n",
+        _FOOTER.format(name=name, doc_url=doc_url),
+    ])
+
+
+def write_module(apidoc: HydraDoc, path: str, name: str = "api_doc") -> str:
+    """
+    Write the module building the HydraDoc and compile it.
+
+    :return: path of the compiled `.pyc`, used by the first import already
+    """
+    with open(path, "w") as f:
+        f.write(generate_module(apidoc, name))
+    return py_compile.compile(path, doraise=True)
+
+
+def main(argv: List[str] = None) -> None:
+    from hydra_python_core.doc_compiler import load_source
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="JSON or JSON-LD file, or Python module as a path or name")
+    parser.add_argument("--output", "-o", required=True, help="path of the Python module")
+    parser.add_argument("--name", default="api_doc", help="attribute holding the HydraDoc")
+    parser.add_argument("--server-url", help="url of the hydrus server")
+    parser.add_argument("--api-name", help="name of the api")
+    args = parser.parse_args(argv)
+
+    apidoc = load_source(args.source, args.server_url, args.api_name)
+    write_module(apidoc, args.output, args.name)
+
+
+if __name__ == "__main__":
+    main()
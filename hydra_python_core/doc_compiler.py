@@ -0,0 +1,240 @@
+"""Compile API Docs into bundles of pre-serialized files for fast serving.
+
+A source is a JSON or JSON-LD API Documentation file, or a Python module, given
+as a file or a dotted name, holding a HydraDoc or the dict of a doc. The source
+is validated, built into a HydraDoc and written to its own bundle directory:
+
+    vocab.jsonld             the `generate()` output
+    entrypoint.jsonld        the EntryPoint object of `HydraEntryPoint.get()`
+    contexts/<name>.jsonld   the contexts of the EntryPoint, classes and collections
+    index.json               the files by route, with their ETag and sizes
+
+Every file is written compact and gzipped next to it. The ETags are the
+fingerprints of the templates the files come from, the same as `HydraDoc.etag()`
+for the vocab. Many sources are compiled in parallel processes.
+
+Usage:
+    python -m hydra_python_core.doc_compiler api_doc.jsonld samples.doc_writer_sample \
+        --output bundles --jobs 4
+"""
+import argparse
+import gzip
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urljoin, urlparse
+
+from hydra_python_core.doc_validator import validate_doc
+from hydra_python_core.doc_writer import HydraDoc
+
+CONTENT_TYPE = "application/ld+json"
+# attributes holding the doc in a source module, when none is given
+MODULE_ATTRIBUTES = ("api_doc", "apidoc", "doc")
+
+
+def _load_module(source: str) -> Any:
+    if source.endswith(".py"):
+        name = os.path.splitext(os.path.basename(source))[0]
+        spec = importlib.util.spec_from_file_location(name, source)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)  # type: ignore
+        return module
+    return importlib.import_module(source)
+
+
+def _validated(doc: Any, source: str) -> Any:
+    """Get `doc` if it is a valid API Documentation, raise SyntaxError otherwise."""
+    errors = validate_doc(doc)
+    if errors:
+        raise SyntaxError("{} is not a valid API Documentation: {}".format(
+            source, "; ".join("{} {}".format(error["path"], error["message"])
+                              for error in errors[:5])))
+    return doc
+
+
+def load_source(source: str, HYDRUS_SERVER_URL: str = None, API_NAME: str = None,
+                attribute: str = None) -> HydraDoc:
+    """
+    Build the HydraDoc of a source.
+
+    :param source: path of a JSON or JSON-LD file, or a Python module as a path or
+                   a dotted name
+    :param HYDRUS_SERVER_URL: url of the hydrus server
+    :param API_NAME: name of the api
+    :param attribute: attribute of the module holding the HydraDoc or the dict of the
+                      doc, the first of MODULE_ATTRIBUTES by default
+    :return: the validated HydraDoc
+    :raise SyntaxError: If the doc is not a valid API Documentation.
+    """
+    from hydra_python_core.doc_maker import create_doc_from_generated
+    if os.path.isfile(source) and not source.endswith(".py"):
+        with open(source) as f:
+            doc = json.load(f)
+    else:
+        module = _load_module(source)
+        if attribute:
+            names = [attribute]
+        else:
+            names = [name for name in MODULE_ATTRIBUTES if hasattr(module, name)]
+        if not names:
+            raise SyntaxError("{} has none of the attributes {}".format(
+                source, ", ".join(MODULE_ATTRIBUTES)))
+        doc = getattr(module, names[0])
+    if isinstance(doc, HydraDoc):
+        _validated(doc.generate(), source)
+        return doc
+    return create_doc_from_generated(_validated(doc, source), HYDRUS_SERVER_URL, API_NAME)
+
+
+def _write(directory: str, path: str, value: Any) -> Tuple[bytes, bytes]:
+    """Write the compact JSON of `value` and its gzip, return both."""
+    data = json.dumps(value, separators=(",", ":")).encode()
+    # no timestamp, a bundle of the same doc is the same bytes
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(data)
+    compressed = buffer.getvalue()
+    full_path = os.path.join(directory, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "wb") as f:
+        f.write(data)
+    with open(full_path + ".gz", "wb") as f:
+        f.write(compressed)
+    return data, compressed
+
+
+def write_bundle(apidoc: HydraDoc, directory: str) -> Dict[str, Any]:
+    """
+    Write the files and the index of the bundle of a HydraDoc.
+
+    :param apidoc: the HydraDoc, with its EntryPoint generated
+    :param directory: directory of the bundle, created if needed
+    :return: the index, also written to index.json
+    """
+    api_url = urljoin(apidoc.base_url, apidoc.API)
+    doc_id = "{}/{}".format(api_url, apidoc.doc_name)
+    entrypoint_url = urljoin(apidoc.base_url, apidoc.entrypoint_endpoint)
+    # the contexts are served under the EntryPoint, as its @context says
+    contexts_url = "{}{}/contexts/".format(apidoc.base_url, apidoc.entrypoint_endpoint)
+    contexts_path = urlparse(contexts_url).path
+    routes = dict()  # type: Dict[str, Dict[str, Any]]
+    classes = dict()  # type: Dict[str, str]
+
+    def add(route: str, path: str, value: Any, etag: str) -> None:
+        data, compressed = _write(directory, path, value)
+        routes[route] = {
+            "file": path,
+            "gzip": path + ".gz",
+            "etag": etag,
+            "bytes": len(data),
+            "gzip_bytes": len(compressed),
+            "content_type": CONTENT_TYPE,
+        }
+
+    add(urlparse(doc_id).path, "vocab.jsonld", apidoc.generate(), apidoc.etag())
+    entrypoint = apidoc.entrypoint
+    add(urlparse(entrypoint_url).path, "entrypoint.jsonld", entrypoint.get(), entrypoint.etag())
+    add(contexts_path + "EntryPoint.jsonld", "contexts/EntryPoint.jsonld",
+        {"@context": entrypoint.context.generate()}, entrypoint.context.etag())
+    templates = [(path, entry["context"], entry["class"].id_)
+                 for path, entry in apidoc.parsed_classes.items()]
+    templates.extend((path, entry["context"], entry["collection"].collection_id)
+                     for path, entry in apidoc.collections.items())
+    for path, context, class_id in templates:
+        name = "{}.jsonld".format(quote(path, safe=''))
+        add(contexts_path + name, "contexts/" + name, {"@context": context.generate()},
+            context.etag())
+        classes[class_id] = contexts_path + name
+    index = {
+        "@id": doc_id,
+        "entrypoint": entrypoint_url,
+        "etag": apidoc.etag(),
+        "routes": routes,
+        "classes": classes,
+    }
+    with open(os.path.join(directory, "index.json"), "w") as f:
+        json.dump(index, f, indent=4, sort_keys=True)
+    return index
+
+
+def bundle_name(source: str) -> str:
+    """Get the name of the bundle directory of a source."""
+    if os.path.isfile(source):
+        return os.path.splitext(os.path.basename(source))[0]
+    return source.rsplit(".", 1)[-1]
+
+
+def compile_source(source: str, output: str, HYDRUS_SERVER_URL: str = None,
+                   API_NAME: str = None, attribute: str = None) -> Dict[str, Any]:
+    """
+    Compile a source into the bundle directory of its name under `output`.
+
+    :return: {"source", "bundle": directory, "routes": number of files,
+              "etag", "dangling": number of dangling references of the doc}
+    """
+    apidoc = load_source(source, HYDRUS_SERVER_URL, API_NAME, attribute)
+    directory = os.path.join(output, bundle_name(source))
+    index = write_bundle(apidoc, directory)
+    return {
+        "source": source,
+        "bundle": directory,
+        "routes": len(index["routes"]),
+        "etag": index["etag"],
+        "dangling": len(apidoc.check_integrity()["dangling"]),
+    }
+
+
+def _compile(args: Tuple[str, str, Optional[str], Optional[str], Optional[str]]) -> Dict[str, Any]:
+    """Compile a source in a worker, its error being reported instead of raised."""
+    try:
+        return compile_source(*args)
+    except Exception as error:
+        return {"source": args[0], "error": "{}: {}".format(type(error).__name__, error)}
+
+
+def compile_sources(sources: List[str], output: str, HYDRUS_SERVER_URL: str = None,
+                    API_NAME: str = None, attribute: str = None,
+                    jobs: int = 1) -> List[Dict[str, Any]]:
+    """
+    Compile many sources, in `jobs` processes.
+
+    Each process builds its docs with its own DocUrl, so the docs don't share
+    any state.
+
+    :return: the result of `compile_source` for each source in order, or
+             {"source", "error"} for the sources which failed
+    """
+    args = [(source, output, HYDRUS_SERVER_URL, API_NAME, attribute) for source in sources]
+    if jobs <= 1 or len(sources) <= 1:
+        return [_compile(arg) for arg in args]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_compile, args))
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="+",
+                        help="JSON or JSON-LD files, or Python modules as paths or names")
+    parser.add_argument("--output", "-o", default="bundles",
+                        help="directory of the bundles, one per source")
+    parser.add_argument("--server-url", help="url of the hydrus server")
+    parser.add_argument("--api-name", help="name of the api")
+    parser.add_argument("--attribute", help="attribute of the modules holding the doc")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="processes compiling the sources")
+    args = parser.parse_args(argv)
+
+    results = compile_sources(args.sources, args.output, args.server_url, args.api_name,
+                              args.attribute, args.jobs)
+    sys.stdout.write(json.dumps({"results": results}, indent=4, sort_keys=True) + "\n")
+    if any("error" in result for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Structural diff of two versions of an API Doc, as changes and as a JSON Patch.
+
+The lists of the `generate()` output are matched by the id of their items
+instead of their positions: classes by @id, supported properties by property,
+operations by method and title and statuses by code and title. Equal items are
+skipped after a plain comparison and the others are walked once, so the diff
+takes linear time.
+
+Example:
+    diff = diff_docs(old_apidoc, new_apidoc)
+    for change in diff.changes:
+        ...  # Change("added", "class", class_id, doc_id)
+    response = diff.patch  # RFC 6902 JSON Patch from old.generate() to new.generate()
+"""
+import copy
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Union
+
+from hydra_python_core.doc_writer import HydraDoc
+
+Change = NamedTuple("Change", [("action", str), ("kind", str), ("id", str),
+                               ("owner", Optional[str])])
+Change.__doc__ = """A class, property, operation or status "added", "removed" or "changed".
+
+`owner` is the id of the class, property, operation or doc holding it. A
+changed item is reported along with every item holding it.
+"""
+
+# kind of change for the items of the lists keyed by id
+_KINDS = {
+    "supportedClass": "class",
+    "supportedProperty": "property",
+    "supportedOperation": "operation",
+    "possibleStatus": "status",
+}
+
+
+def _key(item: Any) -> Optional[str]:
+    """Get the id matching the item of a list with its next version."""
+    if not isinstance(item, dict):
+        return None
+    if "@id" in item:
+        return item["@id"]
+    if "property" in item:
+        prop = item["property"]
+        return prop.get("@id") if isinstance(prop, dict) else prop
+    if "method" in item:
+        return "{} {}".format(item["method"], item.get("title"))
+    if "statusCode" in item:
+        return "{} {}".format(item["statusCode"], item.get("title"))
+    return None
+
+
+def _keys(items: List[Any]) -> Optional[List[str]]:
+    """Get the ids of the items, None if one has no id or two have the same."""
+    keys = [_key(item) for item in items]
+    if None in keys or len(set(keys)) != len(keys):
+        return None
+    return keys
+
+
+def escape(token: Union[str, int]) -> str:
+    """Escape a key for a JSON Pointer (RFC 6901)."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def unescape(token: str) -> str:
+    """Unescape a key of a JSON Pointer."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+class DocDiff:
+    """Changes and JSON Patch between two `generate()` outputs."""
+
+    def __init__(self, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        self.patch = list()  # type: List[Dict[str, Any]]
+        self.changes = list()  # type: List[Change]
+        self._diff(old, new, "", new.get("@id", old.get("@id")))
+
+    def _op(self, op: str, path: str, value: Any = None) -> None:
+        if op == "remove":
+            self.patch.append({"op": op, "path": path})
+        else:
+            self.patch.append({"op": op, "path": path, "value": value})
+
+    def _diff(self, old: Any, new: Any, path: str, owner: Optional[str]) -> None:
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in old:
+                if key not in new:
+                    self._op("remove", "{}/{}".format(path, escape(key)))
+                    if key in _KINDS and isinstance(old[key], list):
+                        self._changes("removed", _KINDS[key], old[key], owner)
+            for key in new:
+                key_path = "{}/{}".format(path, escape(key))
+                if key not in old:
+                    self._op("add", key_path, new[key])
+                    if key in _KINDS and isinstance(new[key], list):
+                        self._changes("added", _KINDS[key], new[key], owner)
+                elif key in _KINDS and isinstance(old[key], list) \
+                        and isinstance(new[key], list):
+                    self._diff_items(old[key], new[key], key_path, _KINDS[key], owner)
+                else:
+                    self._diff(old[key], new[key], key_path, owner)
+        elif isinstance(old, list) and isinstance(new, list):
+            if old != new:
+                self._op("replace", path, new)
+        elif old != new or type(old) != type(new):
+            self._op("replace", path, new)
+
+    def _changes(self, action: str, kind: str, items: List[Any],
+                 owner: Optional[str]) -> None:
+        for item in items:
+            self.changes.append(Change(action, kind, _key(item), owner))
+
+    def _diff_items(self, old: List[Any], new: List[Any], path: str, kind: str,
+                    owner: Optional[str]) -> None:
+        """Diff the lists of classes, properties, operations or statuses by the ids of the items."""
+        old_keys = _keys(old)
+        new_keys = _keys(new)
+        if old_keys is None or new_keys is None:
+            if old != new:
+                self._op("replace", path, new)
+            return
+        new_index = {key: i for i, key in enumerate(new_keys)}
+        old_index = {key: i for i, key in enumerate(old_keys)}
+        # remove from the end, the indexes of the items before stay valid
+        for i in range(len(old) - 1, -1, -1):
+            if old_keys[i] not in new_index:
+                self._op("remove", "{}/{}".format(path, i))
+                self.changes.append(Change("removed", kind, old_keys[i], owner))
+        kept = [key for key in old_keys if key in new_index]
+        if kept != [key for key in new_keys if key in old_index]:
+            # reordered, the whole list is sent again
+            del self.patch[len(self.patch) - (len(old) - len(kept)):]
+            self._op("replace", path, new)
+            for key in kept:
+                if old[old_index[key]] != new[new_index[key]]:
+                    self.changes.append(Change("changed", kind, key, owner))
+            self.changes.extend(Change("added", kind, key, owner)
+                                for key in new_keys if key not in old_index)
+            return
+        # the kept items are in order, the i-th item of new goes at index i
+        for i, key in enumerate(new_keys):
+            item_path = "{}/{}".format(path, i)
+            if key not in old_index:
+                self._op("add", item_path, new[i])
+                self.changes.append(Change("added", kind, key, owner))
+                continue
+            if old[old_index[key]] == new[i]:
+                # most items are unchanged, compared at C speed instead of walked
+                continue
+            # reported before the changes inside the item, dropped if there are none
+            self.changes.append(Change("changed", kind, key, owner))
+            size = len(self.patch)
+            self._diff(old[old_index[key]], new[i], item_path, key)
+            if len(self.patch) == size:
+                self.changes.pop()
+
+    def changed_classes(self) -> Set[str]:
+        """Get the ids of the classes added, removed or changed."""
+        return {change.id for change in self.changes if change.kind == "class"}
+
+
+def diff_docs(old: Union[HydraDoc, Dict[str, Any]],
+              new: Union[HydraDoc, Dict[str, Any]]) -> DocDiff:
+    """
+    Diff two versions of an API Doc.
+
+    :param old: HydraDoc or its `generate()` output
+    :param new: HydraDoc or its `generate()` output
+    :return: DocDiff with the changes and the JSON Patch from old to new
+    """
+    if isinstance(old, HydraDoc):
+        old = old.generate()
+    if isinstance(new, HydraDoc):
+        new = new.generate()
+    return DocDiff(old, new)
+
+
+def json_patch(old: Union[HydraDoc, Dict[str, Any]],
+               new: Union[HydraDoc, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Get the RFC 6902 JSON Patch turning the `generate()` output of `old` into `new`."""
+    return diff_docs(old, new).patch
+
+
+def _parent(doc: Any, path: str) -> Any:
+    if not path.startswith("/"):
+        raise ValueError("Invalid JSON Pointer {!r}".format(path))
+    tokens = [unescape(token) for token in path[1:].split("/")]
+    target = doc
+    for token in tokens[:-1]:
+        target = target[int(token)] if isinstance(target, list) else target[token]
+    return target, tokens[-1]
+
+
+def apply_patch(doc: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply a JSON Patch to a copy of a doc.
+
+    Supports the add, remove, replace and test operations.
+
+    Raises:
+        ValueError: If an operation is not supported or a test fails.
+
+    """
+    doc = copy.deepcopy(doc)
+    for operation in patch:
+        op = operation["op"]
+        if operation["path"] == "":
+            if op == "replace":
+                doc = copy.deepcopy(operation["value"])
+                continue
+            raise ValueError("Unsupported {} of the whole document".format(op))
+        parent, token = _parent(doc, operation["path"])
+        if op == "test":
+            value = parent[int(token)] if isinstance(parent, list) else parent[token]
+            if value != operation["value"]:
+                raise ValueError("Test failed at {}".format(operation["path"]))
+        elif op == "remove":
+            del parent[int(token) if isinstance(parent, list) else token]
+        elif op in ("add", "replace"):
+            value = copy.deepcopy(operation["value"])
+            if isinstance(parent, list):
+                index = len(parent) if token == "-" else int(token)
+                if op == "add":
+                    parent.insert(index, value)
+                else:
+                    parent[index] = value
+            else:
+                parent[token] = value
+        else:
+            raise ValueError("Unsupported JSON Patch operation {!r}".format(op))
+    return doc
@@ -0,0 +1,152 @@
+"""Class level link graph of a HydraDoc and shortest request paths for agents.
+
+The nodes are the classes and collections of the doc. The edges are the
+properties an agent can follow from a resource of one class to a resource of
+another: the hydra:Link properties (domain to range), the properties of the
+EntryPoint and the members of the collections (collection to managed class).
+
+Example:
+    graph = LinkGraph(apidoc)
+    for edge in graph.shortest_path(class_.id_):
+        ...  # GET the current resource and follow edge.property
+"""
+from collections import deque
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+from hydra_python_core.doc_ir import (COLLECTION, ENTRYPOINT, ENTRYPOINT_CLASS,
+                                      ENTRYPOINT_COLLECTION, LINK, NO_REF, compile_doc)
+from hydra_python_core.doc_writer import HydraDoc
+from hydra_python_core.namespace import hydra
+
+Edge = NamedTuple("Edge", [("source", str), ("target", str), ("property", str),
+                           ("kind", str)])
+Edge.__doc__ = """Property leading from resources of `source` to resources of `target`.
+
+`kind` is "entrypoint" for the EntryPoint properties, "link" for hydra:Link
+properties and "member" for the members of a collection.
+"""
+
+
+class LinkGraph:
+    """Link graph of the classes of a HydraDoc, with cached breadth first searches."""
+
+    def __init__(self, apidoc: HydraDoc) -> None:
+        self.nodes = list()  # type: List[str]
+        self.index = dict()  # type: Dict[str, int]
+        self.adjacency = list()  # type: List[List[Edge]]
+        # breadth first search trees and reachable sets, by source node
+        self._parents = dict()  # type: Dict[int, List[Optional[Edge]]]
+        self._reachable = dict()  # type: Dict[int, FrozenSet[str]]
+        self.entrypoint = apidoc.entrypoint.entrypoint.id_
+        self._build(apidoc)
+
+    def _build(self, apidoc: HydraDoc) -> None:
+        compiled = compile_doc(apidoc)
+        iris = compiled.iri_values
+        # the EntryPoint links use the vocabulary IRI of the EntryPoint as domain
+        self._aliases = {"{}EntryPoint".format(compiled.vocab): self.entrypoint}
+        self.node(self.entrypoint)
+        for row in compiled.supported_classes:
+            kind = compiled.class_kind[row]
+            class_iri = iris[compiled.class_iri[row]]
+            self.node(class_iri)
+            if kind == COLLECTION:
+                if compiled.class_manages_object[row] != NO_REF:
+                    self.add_edge(class_iri, iris[compiled.class_manages_object[row]],
+                                  hydra["member"], "member")
+                continue
+            for prop in compiled.properties(row):
+                prop_kind = compiled.prop_kind[prop]
+                if prop_kind == LINK:
+                    link = compiled.prop_target[prop]
+                    self.add_edge(iris[compiled.link_domain[link]] or class_iri,
+                                  iris[compiled.link_range[link]], iris[compiled.link_iri[link]],
+                                  "link")
+                elif kind == ENTRYPOINT and prop_kind in (ENTRYPOINT_CLASS, ENTRYPOINT_COLLECTION):
+                    # the EntryPoint properties reference the row of their class
+                    target = compiled.class_iri[compiled.prop_target[prop]]
+                    self.add_edge(self.entrypoint, iris[target], iris[compiled.prop_iri[prop]],
+                                  "entrypoint")
+
+    def node(self, iri: str) -> int:
+        """Get the number of the node of a class, adding it if needed."""
+        iri = self._aliases.get(iri, iri)
+        number = self.index.get(iri)
+        if number is None:
+            number = self.index[iri] = len(self.nodes)
+            self.nodes.append(iri)
+            self.adjacency.append([])
+        return number
+
+    def add_edge(self, source: str, target: str, property_: str, kind: str) -> None:
+        """Add an edge, invalidating the cached searches."""
+        source_node = self.node(source)
+        self.node(target)
+        self.adjacency[source_node].append(Edge(self.nodes[source_node],
+                                                self._aliases.get(target, target),
+                                                property_, kind))
+        self._parents.clear()
+        self._reachable.clear()
+
+    def successors(self, iri: str) -> List[Edge]:
+        """Get the edges leaving a class."""
+        number = self.index.get(self._aliases.get(iri, iri))
+        return list(self.adjacency[number]) if number is not None else []
+
+    def _tree(self, source: int) -> List[Optional[Edge]]:
+        """Get the edge reaching every node in a breadth first search from `source`."""
+        parents = self._parents.get(source)
+        if parents is not None:
+            return parents
+        parents = [None] * len(self.nodes)  # type: List[Optional[Edge]]
+        seen = [False] * len(self.nodes)
+        seen[source] = True
+        queue = deque([source])
+        index = self.index
+        while queue:
+            for edge in self.adjacency[queue.popleft()]:
+                target = index[edge.target]
+                if not seen[target]:
+                    seen[target] = True
+                    parents[target] = edge
+                    queue.append(target)
+        self._parents[source] = parents
+        self._reachable[source] = frozenset(
+            self.nodes[node] for node, found in enumerate(seen) if found)
+        return parents
+
+    def _source(self, source: Optional[str]) -> Optional[int]:
+        if source is None:
+            source = self.entrypoint
+        return self.index.get(self._aliases.get(source, source))
+
+    def reachable(self, source: str = None) -> FrozenSet[str]:
+        """Get the classes reachable from `source`, the EntryPoint by default."""
+        number = self._source(source)
+        if number is None:
+            return frozenset()
+        if number not in self._reachable:
+            self._tree(number)
+        return self._reachable[number]
+
+    def shortest_path(self, target: str, source: str = None) -> Optional[List[Edge]]:
+        """
+        Get the shortest list of edges to follow from `source` to a resource of `target`.
+
+        :param target: IRI of the class to reach
+        :param source: IRI of the class to start from, the EntryPoint by default
+        :return: list of edges, empty if target is the source, None if it can't be reached
+        """
+        number = self._source(source)
+        target = self._aliases.get(target, target)
+        if number is None or target not in self.reachable(self.nodes[number]):
+            return None
+        parents = self._tree(number)
+        path = []
+        node = self.index[target]
+        while node != number:
+            edge = parents[node]
+            path.append(edge)
+            node = self.index[edge.source]
+        path.reverse()
+        return path
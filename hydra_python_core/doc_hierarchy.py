@@ -0,0 +1,123 @@
+"""Transitive closure of the rdfs:subClassOf hierarchy of a HydraDoc.
+
+Every class with subclasses gets a bit number, and every class the bitset of
+all its ancestors, so `is_subclass` is a single shift and mask instead of a
+walk up the hierarchy. Leaf classes get no bit, which keeps the bitsets as
+small as the number of parent classes. Classes without parents are
+subclasses of hydra:Resource, as is hydra:Collection.
+"""
+from typing import Any, Dict, Iterable, List, Set
+
+from hydra_python_core.namespace import hydra
+
+
+class ClassHierarchy:
+    """Ancestor bitsets of the classes, updated as the classes are added."""
+
+    def __init__(self) -> None:
+        self.classes = list()  # type: List[str]
+        self.node = dict()  # type: Dict[str, int]
+        self.ancestors = list()  # type: List[int]
+        self.children = list()  # type: List[Set[int]]
+        # bit of every node, -1 until it has a subclass, and node of every bit
+        self.bits = list()  # type: List[int]
+        self.bit_nodes = list()  # type: List[int]
+        self.add_class(hydra["Resource"])
+        self.add_class(hydra["Collection"], [hydra["Resource"]])
+
+    def __contains__(self, iri: str) -> bool:
+        return iri in self.node
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def _node(self, iri: str) -> int:
+        node = self.node.get(iri)
+        if node is None:
+            node = self.node[iri] = len(self.classes)
+            self.classes.append(iri)
+            self.ancestors.append(0)
+            self.children.append(set())
+            self.bits.append(-1)
+        return node
+
+    def _bit(self, node: int) -> None:
+        """Give a bit to a class getting its first subclass."""
+        if self.bits[node] < 0:
+            self.bits[node] = len(self.bit_nodes)
+            self.bit_nodes.append(node)
+            # a class without bit has no subclass, only its own bitset changes
+            self.ancestors[node] |= 1 << self.bits[node]
+
+    def add_class(self, iri: str, parents: Iterable[str] = ()) -> None:
+        """
+        Add a class and its direct superclasses, or more superclasses of a known class.
+
+        Parents which are not known yet are added as subclasses of hydra:Resource,
+        the descendants of a class are updated when its own parents are added later.
+        """
+        parents = [parent for parent in parents if parent is not None]
+        if not parents and iri != hydra["Resource"]:
+            parents = [hydra["Resource"]]
+        node = self._node(iri)
+        mask = 0
+        for parent in parents:
+            if parent not in self.node:
+                self.add_class(parent)
+            parent_node = self.node[parent]
+            self._bit(parent_node)
+            self.children[parent_node].add(node)
+            mask |= self.ancestors[parent_node]
+        self._propagate(node, mask)
+
+    def _propagate(self, node: int, mask: int) -> None:
+        """Add the bits of `mask` to the ancestors of `node` and of its descendants."""
+        ancestors = self.ancestors
+        ancestors[node] |= mask
+        mask = ancestors[node]
+        stack = list(self.children[node])
+        while stack:
+            child = stack.pop()
+            updated = ancestors[child] | mask
+            # descendants already knowing all the ancestors stop the walk, cycles too
+            if updated != ancestors[child]:
+                ancestors[child] = updated
+                stack.extend(self.children[child])
+
+    def is_subclass(self, sub: str, sup: str) -> bool:
+        """Check if `sub` is `sup` or one of its direct or indirect subclasses."""
+        if sub == sup:
+            return True
+        sub_node = self.node.get(sub)
+        sup_node = self.node.get(sup)
+        if sub_node is None or sup_node is None or self.bits[sup_node] < 0:
+            return False
+        return (self.ancestors[sub_node] >> self.bits[sup_node]) & 1 == 1
+
+    def superclasses(self, iri: str) -> Set[str]:
+        """Get the class and all its ancestors."""
+        node = self.node.get(iri)
+        if node is None:
+            return {iri}
+        mask = self.ancestors[node]
+        ancestors = {self.classes[self.bit_nodes[bit]]
+                     for bit in range(mask.bit_length()) if (mask >> bit) & 1}
+        ancestors.add(iri)
+        return ancestors
+
+    def subclasses(self, iri: str) -> Set[str]:
+        """Get the class and all its descendants."""
+        node = self.node.get(iri)
+        if node is None or self.bits[node] < 0:
+            return {iri}
+        bit = self.bits[node]
+        return {self.classes[i] for i, mask in enumerate(self.ancestors) if (mask >> bit) & 1}
+
+
+def class_parents(parents: Any) -> List[str]:
+    """Get the IRIs of the `parents` of a HydraClass: an IRI, a HydraClass or a list of them."""
+    if parents is None:
+        return []
+    if not isinstance(parents, list):
+        parents = [parents]
+    return [getattr(parent, "id_", parent) for parent in parents]
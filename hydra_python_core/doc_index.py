@@ -0,0 +1,231 @@
+"""In-memory triple index of a HydraDoc for pattern queries.
+
+The triples of doc_rdf are kept in three hash indexes, subject -> predicate ->
+objects (SPO), predicate -> object -> subjects (POS) and object -> subject ->
+predicates (OSP), so that any pattern with a bound term is answered from the
+index instead of walking the whole doc.
+
+Example:
+    index = apidoc.triple_index()
+    for op, _, _ in index.match(None, hydra["returns"], class_.id_):
+        ...
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from hydra_python_core.doc_rdf import DocTriples, Term, Triple, valid_triples
+from hydra_python_core.doc_writer import HydraClass, HydraCollection, HydraDoc, HydraStatus
+from hydra_python_core.namespace import hydra, rdfs
+
+Index = Dict[Any, Dict[Any, Set[Any]]]
+
+
+def _add(index: Index, first: Any, second: Any, third: Any) -> bool:
+    level = index.get(first)
+    if level is None:
+        level = index[first] = {}
+    values = level.get(second)
+    if values is None:
+        values = level[second] = set()
+    if third in values:
+        return False
+    values.add(third)
+    return True
+
+
+def _remove(index: Index, first: Any, second: Any, third: Any) -> None:
+    level = index[first]
+    values = level[second]
+    values.discard(third)
+    if not values:
+        del level[second]
+        if not level:
+            del index[first]
+
+
+class TripleIndex:
+    """Set of triples indexed by subject, predicate and object."""
+
+    def __init__(self, triples: Iterable[Triple] = ()) -> None:
+        self.spo = dict()  # type: Index
+        self.pos = dict()  # type: Index
+        self.osp = dict()  # type: Index
+        self.size = 0
+        self.update(triples)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, triple: Triple) -> bool:
+        subject, predicate, object_ = triple
+        return object_ in self.spo.get(subject, {}).get(predicate, ())
+
+    def __iter__(self) -> Iterator[Triple]:
+        return self.match()
+
+    def add(self, subject: str, predicate: str, object_: Term) -> bool:
+        """Add a triple, return False if it was already there."""
+        if not _add(self.spo, subject, predicate, object_):
+            return False
+        _add(self.pos, predicate, object_, subject)
+        _add(self.osp, object_, subject, predicate)
+        self.size += 1
+        return True
+
+    def update(self, triples: Iterable[Triple]) -> None:
+        """Add many triples."""
+        for subject, predicate, object_ in triples:
+            self.add(subject, predicate, object_)
+
+    def remove(self, subject: str, predicate: str, object_: Term) -> None:
+        """Remove a triple.
+
+        Raises:
+            KeyError: If the triple is not in the index.
+
+        """
+        if (subject, predicate, object_) not in self:
+            raise KeyError((subject, predicate, object_))
+        _remove(self.spo, subject, predicate, object_)
+        _remove(self.pos, predicate, object_, subject)
+        _remove(self.osp, object_, subject, predicate)
+        self.size -= 1
+
+    def match(self, subject: Optional[str] = None, predicate: Optional[str] = None,
+              object_: Optional[Term] = None) -> Iterator[Triple]:
+        """
+        Iterate over the triples matching a pattern, None being a wildcard.
+
+        Every pattern is answered by the index whose first level is bound, only the
+        matching triples are visited.
+        """
+        if subject is not None:
+            level = self.spo.get(subject, {})
+            if predicate is not None:
+                objects = level.get(predicate, ())
+                if object_ is not None:
+                    if object_ in objects:
+                        yield subject, predicate, object_
+                    return
+                for o in objects:
+                    yield subject, predicate, o
+                return
+            if object_ is not None:
+                for p in self.osp.get(object_, {}).get(subject, ()):
+                    yield subject, p, object_
+                return
+            for p, objects in level.items():
+                for o in objects:
+                    yield subject, p, o
+            return
+        if predicate is not None:
+            level = self.pos.get(predicate, {})
+            if object_ is not None:
+                for s in level.get(object_, ()):
+                    yield s, predicate, object_
+                return
+            for o, subjects in level.items():
+                for s in subjects:
+                    yield s, predicate, o
+            return
+        if object_ is not None:
+            for s, predicates in self.osp.get(object_, {}).items():
+                for p in predicates:
+                    yield s, p, object_
+            return
+        for s, level in self.spo.items():
+            for p, objects in level.items():
+                for o in objects:
+                    yield s, p, o
+
+    def subjects(self, predicate: str, object_: Term) -> Set[str]:
+        """Get the subjects of the triples (?, predicate, object_)."""
+        return set(self.pos.get(predicate, {}).get(object_, ()))
+
+    def objects(self, subject: str, predicate: str) -> Set[Term]:
+        """Get the objects of the triples (subject, predicate, ?)."""
+        return set(self.spo.get(subject, {}).get(predicate, ()))
+
+
+class DocIndex(TripleIndex):
+    """Triple index of a HydraDoc, kept up to date as the doc grows.
+
+    The templates are indexed when they are added to the doc, a class or
+    collection added at the path of another one replacing its triples;
+    templates modified after that are re-indexed by `rebuild`.
+    """
+
+    def __init__(self, apidoc: HydraDoc) -> None:
+        super().__init__()
+        self.apidoc = apidoc
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Index the whole doc again."""
+        self.spo.clear()
+        self.pos.clear()
+        self.osp.clear()
+        self.size = 0
+        self._triples = DocTriples(self.apidoc)
+        self.update(valid_triples(self._triples.triples()))
+        self._entrypoint_props = len(self.apidoc.entrypoint.entrypoint.supportedProperty)
+
+    def add_class(self, class_: HydraClass, replaced: Optional[HydraClass] = None) -> None:
+        """Index a class, added in place of `replaced` if it had the same path."""
+        if replaced is not None:
+            self._remove_supported(replaced.id_)
+        self.update(valid_triples(self._triples.supported_class(class_)))
+
+    def add_collection(self, collection: HydraCollection,
+                       replaced: Optional[HydraCollection] = None) -> None:
+        """Index a collection, added in place of `replaced` if it had the same path."""
+        if replaced is not None:
+            self._remove_supported(replaced.collection_id)
+        self.update(valid_triples(self._triples.supported_collection(collection)))
+
+    def _remove_supported(self, class_id: str) -> None:
+        """Remove a supported class, its triples and those of the nodes only it leads to."""
+        node = self._triples.iri(class_id)
+        if node is None:
+            return
+        if (self._triples.doc_id, hydra["supportedClass"], node) in self:
+            self.remove(self._triples.doc_id, hydra["supportedClass"], node)
+        stack = [node]
+        while stack:
+            subject = stack.pop()
+            for _, predicate, object_ in list(self.match(subject)):
+                self.remove(subject, predicate, object_)
+                # the blank nodes, links and statuses of the class, unless held elsewhere
+                if isinstance(object_, str) and object_ not in self.osp:
+                    stack.append(object_)
+
+    def add_status(self, status: HydraStatus) -> None:
+        self.update(valid_triples(self._triples.statuses(self._triples.doc_id, [status])))
+
+    def sync_entrypoint(self) -> None:
+        """Index the properties added to the EntryPoint since the last call."""
+        entrypoint = self.apidoc.entrypoint.entrypoint
+        props = entrypoint.supportedProperty[self._entrypoint_props:]
+        self._entrypoint_props = len(entrypoint.supportedProperty)
+        self.update(valid_triples(self._triples.supported_props(entrypoint, props)))
+
+    def operations_returning(self, class_id: str) -> List[Tuple[str, str]]:
+        """Get the (class or link, operation node) of the operations returning `class_id`."""
+        return [(owner, op)
+                for op in self.subjects(hydra["returns"], class_id)
+                for owner in self.subjects(hydra["supportedOperation"], op)]
+
+    def properties_with_range(self, range_: str) -> Set[str]:
+        """Get the properties, supported properties and links, whose range is `range_`."""
+        properties = set()
+        for node in self.subjects(rdfs["range"], range_):
+            # a supported property node, or a link which is a property itself
+            properties.update(self.objects(node, hydra["property"]) or {node})
+        return properties
+
+    def classes_linking_to(self, class_id: str) -> Set[str]:
+        """Get the classes with a hydra:Link property whose range is `class_id`."""
+        classes = set()
+        for link in self.subjects(rdfs["range"], class_id):
+            for prop in self.subjects(hydra["property"], link):
+                classes.update(self.subjects(hydra["supportedProperty"], prop))
+        return classes
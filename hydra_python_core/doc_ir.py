@@ -0,0 +1,527 @@
+"""Compiled integer-ID representation of a HydraDoc.
+
+`compile_doc` flattens the object graph of a HydraDoc into column tables.
+Classes (collections and the EntryPoint included), properties, links,
+operations and statuses get dense integer ids, their children are stored as
+contiguous row ranges and every IRI is stored once in an IRI table and
+referenced by its integer id. Lookups, traversals and serialization are then
+index operations.
+
+The compiled doc is a snapshot: changes to the HydraDoc after compiling it are
+not reflected. doc_graph builds its LinkGraph from the compiled tables.
+"""
+from array import array
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urljoin
+
+from hydra_python_core.doc_writer import (HydraDoc, HydraClass, HydraCollectionOp,
+                                          HydraCollection, HydraLink, HydraError,
+                                          EntryPointClass, EntryPointCollection, EntryPointOp)
+
+NO_REF = -1
+
+# kinds of the class table rows
+CLASS, COLLECTION, ENTRYPOINT = 0, 1, 2
+# kinds of the property table rows
+PROPERTY, LINK, ENTRYPOINT_CLASS, ENTRYPOINT_COLLECTION = 0, 1, 2, 3
+# kinds of the operation table rows
+CLASS_OP, COLLECTION_OP, ENTRYPOINT_OP = 0, 1, 2
+
+_CLASS_OP_TYPES = {
+    "POST": "http://schema.org/UpdateAction",
+    "PUT": "http://schema.org/AddAction",
+    "DELETE": "http://schema.org/DeleteAction",
+    "GET": "http://schema.org/FindAction",
+}
+
+
+class IriTable:
+    """Two way mapping between IRIs and dense integer ids."""
+
+    def __init__(self) -> None:
+        self.iris = list()  # type: List[str]
+        self.ids = dict()  # type: Dict[str, int]
+
+    def __len__(self) -> int:
+        return len(self.iris)
+
+    def add(self, iri: Optional[str]) -> int:
+        """Get the id of `iri`, adding it to the table if needed. None is NO_REF."""
+        if iri is None:
+            return NO_REF
+        id_ = self.ids.get(iri)
+        if id_ is None:
+            id_ = self.ids[iri] = len(self.iris)
+            self.iris.append(iri)
+        return id_
+
+    def get(self, id_: int) -> Optional[str]:
+        """Get the IRI of `id_`, None for NO_REF."""
+        return None if id_ == NO_REF else self.iris[id_]
+
+
+class CompiledDoc:
+    """Column tables of a compiled HydraDoc."""
+
+    def __init__(self) -> None:
+        self.iris = IriTable()
+        self.class_by_iri = array("q")  # IRI id -> class row or NO_REF
+
+        self.class_kind = array("b")
+        self.class_iri = array("q")
+        self.class_title = list()  # type: List[Any]
+        self.class_desc = list()  # type: List[Any]
+        self.class_path = list()  # type: List[Any]
+        self.class_endpoint = array("b")
+        self.class_parents = list()  # type: List[Any]
+        self.class_manages = list()  # type: List[Any]
+        self.class_manages_object = array("q")
+        # row ranges: the children of class i are [start[i], start[i + 1])
+        self.class_prop_start = array("q")
+        self.class_op_start = array("q")
+
+        self.prop_kind = array("b")
+        self.prop_iri = array("q")
+        self.prop_title = list()  # type: List[Any]
+        self.prop_desc = list()  # type: List[Any]
+        self.prop_read = list()  # type: List[Any]
+        self.prop_write = list()  # type: List[Any]
+        self.prop_required = list()  # type: List[Any]
+        self.prop_range = array("q")
+        self.prop_has_range = array("b")
+        # link row for links, target class row for the EntryPoint properties
+        self.prop_target = array("q")
+
+        self.link_iri = array("q")
+        self.link_title = list()  # type: List[Any]
+        self.link_desc = list()  # type: List[Any]
+        self.link_domain = array("q")
+        self.link_range = array("q")
+        self.link_op_start = array("q")
+
+        self.op_kind = array("b")
+        self.op_id = list()  # type: List[Any]
+        self.op_type = list()  # type: List[Any]
+        self.op_title = list()  # type: List[Any]
+        self.op_method = list()  # type: List[Any]
+        self.op_desc = list()  # type: List[Any]
+        self.op_label = list()  # type: List[Any]
+        self.op_expects = array("q")
+        self.op_returns = array("q")
+        self.op_expects_header = list()  # type: List[Any]
+        self.op_returns_header = list()  # type: List[Any]
+        self.op_status_start = array("q")
+
+        self.status_code = list()  # type: List[Any]
+        self.status_id = list()  # type: List[Any]
+        self.status_title = list()  # type: List[Any]
+        self.status_desc = list()  # type: List[Any]
+        self.status_error = array("b")
+        # statuses are leaves, their serialized form is built once and copied
+        self.status_doc = list()  # type: List[Dict[str, Any]]
+
+        # rows of the classes in the order HydraDoc.generate lists them
+        self.supported_classes = array("q")
+        self.doc_status_start = 0
+        self.doc_status_end = 0
+        self.doc = dict()  # type: Dict[str, Any]
+        self.vocab = ""
+        # IRI of every id, NO_REF indexes the trailing None
+        self.iri_values = [None]  # type: List[Optional[str]]
+
+    # lookups
+
+    def class_index(self, iri: str) -> int:
+        """Get the row of the class or collection with id `iri`, NO_REF if unknown."""
+        iri_id = self.iris.ids.get(iri)
+        return NO_REF if iri_id is None else self.class_by_iri[iri_id]
+
+    def resolve(self, iri_id: int) -> int:
+        """Get the class row an IRI id points to, NO_REF if it is not a class."""
+        return NO_REF if iri_id == NO_REF else self.class_by_iri[iri_id]
+
+    def properties(self, class_row: int) -> range:
+        """Get the property rows of a class."""
+        return range(self.class_prop_start[class_row], self.class_prop_start[class_row + 1])
+
+    def operations(self, class_row: int) -> range:
+        """Get the operation rows of a class."""
+        return range(self.class_op_start[class_row], self.class_op_start[class_row + 1])
+
+    def link_operations(self, link_row: int) -> range:
+        """Get the operation rows of a link."""
+        return range(self.link_op_start[link_row], self.link_op_start[link_row + 1])
+
+    def statuses(self, op_row: int) -> range:
+        """Get the status rows of an operation."""
+        return range(self.op_status_start[op_row], self.op_status_start[op_row + 1])
+
+    # serialization
+
+    def generate(self) -> Dict[str, Any]:
+        """Get the API Doc as a python dict, like HydraDoc.generate."""
+        doc = dict(self.doc)
+        doc["supportedClass"] = [self.generate_class(row) for row in self.supported_classes]
+        doc["possibleStatus"] = self.generate_statuses(self.doc_status_start,
+                                                       self.doc_status_end)
+        return doc
+
+    def generate_class(self, row: int) -> Dict[str, Any]:
+        """Get a class, collection or the EntryPoint as a python dict."""
+        iris = self.iri_values
+        if self.class_kind[row] == COLLECTION:
+            return {
+                "@id": iris[self.class_iri[row]],
+                "@type": "Collection",
+                "subClassOf": "http://www.w3.org/ns/hydra/core#Collection",
+                "title": self.class_title[row],
+                "description": self.class_desc[row],
+                "supportedOperation": [self.generate_op(op) for op in self.operations(row)],
+                "supportedProperty": [self.generate_prop(prop)
+                                      for prop in self.properties(row)],
+                "manages": self.class_manages[row]
+            }
+        class_ = {
+            "@id": iris[self.class_iri[row]],
+            "@type": "hydra:Class",
+            "title": self.class_title[row],
+            "description": self.class_desc[row],
+            "supportedProperty": [self.generate_prop(prop) for prop in self.properties(row)],
+            "supportedOperation": [self.generate_op(op) for op in self.operations(row)],
+        }
+        if self.class_parents[row] is not None:
+            class_["subClassOf"] = self.class_parents[row]
+        return class_
+
+    def generate_prop(self, row: int) -> Dict[str, Any]:
+        """Get a supportedProperty as a python dict."""
+        kind = self.prop_kind[row]
+        if kind == ENTRYPOINT_CLASS or kind == ENTRYPOINT_COLLECTION:
+            return self._generate_entrypoint_prop(row)
+        prop = {
+            "@type": "SupportedProperty",
+            "title": self.prop_title[row],
+            "required": self.prop_required[row],
+            "readable": self.prop_read[row],
+            "writeable": self.prop_write[row]
+        }
+        if kind == LINK:
+            prop["property"] = self.generate_link(self.prop_target[row])
+        else:
+            prop["property"] = self.iri_values[self.prop_iri[row]]
+        if len(self.prop_desc[row]) > 0:
+            prop["description"] = self.prop_desc[row]
+        if self.prop_has_range[row]:
+            prop["range"] = self.iri_values[self.prop_range[row]]
+        return prop
+
+    def _generate_entrypoint_prop(self, row: int) -> Dict[str, Any]:
+        name = self.prop_title[row]
+        target = self.prop_target[row]
+        operations = []
+        for op in self.operations(target):
+            if self.prop_kind[row] == ENTRYPOINT_CLASS:
+                operations.append(self._generate_entrypoint_op(
+                    op, self.op_title[op].lower(), None, None, self.op_title[op]))
+            else:
+                operations.append(self._generate_entrypoint_op(
+                    op, self.op_id[op].lower(), self.op_desc[op], self.op_type[op], ""))
+        is_collection = self.prop_kind[row] == ENTRYPOINT_COLLECTION
+        description = "The {} collection".format(name) if is_collection \
+            else "The {} Class".format(name)
+        property_ = {
+            "@id": self.iri_values[self.prop_iri[row]],
+            "@type": "hydra:Link",
+            "label": name,
+            "description": description if is_collection else self.prop_desc[row],
+            "domain": "{}EntryPoint".format(self.vocab),
+            "range": "{}{}".format(self.vocab, name),
+        }  # type: Dict[str, Any]
+        if is_collection:
+            property_["manages"] = self.class_manages[target]
+        property_["supportedOperation"] = operations
+        return {
+            "property": property_,
+            "hydra:title": name.lower(),
+            "hydra:description": description,
+            "required": None,
+            "readable": True,
+            "writeable": False
+        }
+
+    def generate_link(self, row: int) -> Dict[str, Any]:
+        """Get a HydraLink as a python dict."""
+        iris = self.iri_values
+        return {
+            "@id": iris[self.link_iri[row]],
+            "@type": "hydra:Link",
+            "title": self.link_title[row],
+            "description": self.link_desc[row],
+            "range": iris[self.link_range[row]],
+            "domain": iris[self.link_domain[row]],
+            "supportedOperation": [self.generate_op(op) for op in self.link_operations(row)],
+        }
+
+    def generate_op(self, row: int) -> Dict[str, Any]:
+        """Get a supportedOperation as a python dict."""
+        iris = self.iri_values
+        kind = self.op_kind[row]
+        if kind == ENTRYPOINT_OP:
+            return self._generate_entrypoint_op(row, self.op_id[row], self.op_desc[row],
+                                                self.op_type[row], self.op_label[row])
+        if kind == COLLECTION_OP:
+            return {
+                "@id": self.op_id[row],
+                "@type": self.op_type[row],
+                "method": self.op_method[row],
+                "description": self.op_desc[row],
+                "expects": iris[self.op_expects[row]],
+                "returns": iris[self.op_returns[row]],
+                "expectsHeader": self.op_expects_header[row],
+                "returnsHeader": self.op_returns_header[row],
+                "possibleStatus": self.generate_statuses(
+                    self.op_status_start[row], self.op_status_start[row + 1])
+            }
+        method = self.op_method[row]
+        if method not in _CLASS_OP_TYPES:
+            raise NameError("Please select methods from GET, PUT, POST and DELETE")
+        return {
+            "@type": _CLASS_OP_TYPES[method],
+            "title": self.op_title[row],
+            "method": method,
+            "expects": iris[self.op_expects[row]],
+            "returns": iris[self.op_returns[row]],
+            "expectsHeader": self.op_expects_header[row],
+            "returnsHeader": self.op_returns_header[row],
+            "possibleStatus": self.generate_statuses(self.op_status_start[row],
+                                                     self.op_status_start[row + 1])
+        }
+
+    def _generate_entrypoint_op(self, row: int, id_: str, desc: Optional[str],
+                                type_: Optional[str], label: str) -> Dict[str, Any]:
+        method = self.op_method[row]
+        prop = {
+            "@id": id_,
+            "@type": _CLASS_OP_TYPES.get(method, "http://schema.org/FindAction"),
+            "method": method,
+            "description": desc,
+            "expects": self.iri_values[self.op_expects[row]],
+            "returns": self.iri_values[self.op_returns[row]],
+            "expectsHeader": self.op_expects_header[row],
+            "returnsHeader": self.op_returns_header[row],
+            "possibleStatus": self.generate_statuses(self.op_status_start[row],
+                                                     self.op_status_start[row + 1])
+        }
+        if type_ is not None:
+            prop["@type"] = type_
+        if len(label) > 0:
+            prop["label"] = label
+        return prop
+
+    def generate_status(self, row: int) -> Dict[str, Any]:
+        """Get a possibleStatus as a python dict."""
+        return dict(self.status_doc[row])
+
+    def generate_statuses(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Get the possibleStatus of the rows [start, end) as python dicts."""
+        return [dict(status) for status in self.status_doc[start:end]]
+
+    def _serialize_status(self, row: int) -> Dict[str, Any]:
+        status = {
+            "@context": "https://www.w3.org/ns/hydra/core",
+            "@type": "Error" if self.status_error[row] else "Status",
+            "statusCode": self.status_code[row],
+            "title": self.status_title[row],
+            "description": self.status_desc[row],
+        }
+        if self.status_id[row] is not None:
+            status["@id"] = self.status_id[row]
+        return status
+
+
+class _Compiler:
+    """Fill the tables of a CompiledDoc from the objects of a HydraDoc."""
+
+    def __init__(self) -> None:
+        self.ir = CompiledDoc()
+        self.class_rows = dict()  # type: Dict[int, int]
+        # class row of every supportedOperation list, the EntryPoint properties share them
+        self.entrypoint_targets = dict()  # type: Dict[int, int]
+        self.links = list()  # type: List[HydraLink]
+        self.op_statuses = list()  # type: List[List[Any]]
+
+    def add_class(self, class_: Union[HydraClass, HydraCollection], kind: int) -> int:
+        """Add the class row, its properties and operations are added by `fill_class`."""
+        ir = self.ir
+        row = len(ir.class_kind)
+        self.class_rows[id(class_)] = row
+        ir.class_kind.append(kind)
+        if kind == COLLECTION:
+            ir.class_iri.append(ir.iris.add(class_.collection_id))
+            ir.class_title.append(class_.name)
+            ir.class_desc.append(class_.collection_description)
+            ir.class_endpoint.append(True)
+            ir.class_parents.append(None)
+            ir.class_manages.append(class_.manages)
+            object_ = class_.manages.get("object") if isinstance(class_.manages, dict) else None
+            ir.class_manages_object.append(ir.iris.add(object_))
+        else:
+            ir.class_iri.append(ir.iris.add(class_.id_))
+            ir.class_title.append(class_.title)
+            ir.class_desc.append(class_.desc)
+            ir.class_endpoint.append(bool(class_.endpoint))
+            ir.class_parents.append(class_.parents)
+            ir.class_manages.append(None)
+            ir.class_manages_object.append(NO_REF)
+        ir.class_path.append(class_.path if kind != ENTRYPOINT else None)
+        return row
+
+    def fill_class(self, class_: Union[HydraClass, HydraCollection]) -> None:
+        ir = self.ir
+        ir.class_prop_start.append(len(ir.prop_kind))
+        ir.class_op_start.append(len(ir.op_kind))
+        for prop in class_.supportedProperty:
+            self.add_prop(prop)
+        for op in class_.supportedOperation:
+            self.add_op(op)
+
+    def add_prop(self, prop: Any) -> None:
+        ir = self.ir
+        if isinstance(prop, (EntryPointClass, EntryPointCollection)):
+            is_class = isinstance(prop, EntryPointClass)
+            ir.prop_kind.append(ENTRYPOINT_CLASS if is_class else ENTRYPOINT_COLLECTION)
+            ir.prop_iri.append(ir.iris.add(prop.id_))
+            ir.prop_title.append(prop.name)
+            ir.prop_desc.append(prop.desc if is_class else None)
+            ir.prop_target.append(self.entrypoint_targets[id(prop.supportedOperation)])
+            ir.prop_read.append(True)
+            ir.prop_write.append(False)
+            ir.prop_required.append(None)
+            ir.prop_range.append(NO_REF)
+            ir.prop_has_range.append(False)
+            return
+        if isinstance(prop.prop, HydraLink):
+            ir.prop_kind.append(LINK)
+            ir.prop_iri.append(ir.iris.add(prop.prop.id_))
+            ir.prop_target.append(self.add_link(prop.prop))
+        else:
+            ir.prop_kind.append(PROPERTY)
+            ir.prop_iri.append(ir.iris.add(prop.prop))
+            ir.prop_target.append(NO_REF)
+        ir.prop_title.append(prop.title)
+        ir.prop_desc.append(prop.desc)
+        ir.prop_read.append(prop.read)
+        ir.prop_write.append(prop.write)
+        ir.prop_required.append(prop.required)
+        ir.prop_has_range.append("range" in prop.kwargs)
+        ir.prop_range.append(ir.iris.add(prop.kwargs.get("range")))
+
+    def add_link(self, link: HydraLink) -> int:
+        ir = self.ir
+        row = len(ir.link_iri)
+        ir.link_iri.append(ir.iris.add(link.id_))
+        ir.link_title.append(link.title)
+        ir.link_desc.append(link.desc)
+        ir.link_domain.append(ir.iris.add(link.domain))
+        ir.link_range.append(ir.iris.add(link.range))
+        # the operations of the links are stored after all the class operations
+        self.links.append(link)
+        return row
+
+    def add_op(self, op: Any) -> None:
+        ir = self.ir
+        if isinstance(op, EntryPointOp):
+            ir.op_kind.append(ENTRYPOINT_OP)
+            ir.op_id.append(op.id_)
+            ir.op_type.append(op.type_)
+            ir.op_title.append(None)
+            ir.op_desc.append(op.desc)
+            ir.op_label.append(op.label)
+        elif isinstance(op, HydraCollectionOp):
+            ir.op_kind.append(COLLECTION_OP)
+            ir.op_id.append(op.id_)
+            ir.op_type.append(op.type_)
+            ir.op_title.append(None)
+            ir.op_desc.append(op.desc)
+            ir.op_label.append("")
+        else:
+            ir.op_kind.append(CLASS_OP)
+            ir.op_id.append(None)
+            ir.op_type.append(None)
+            ir.op_title.append(op.title)
+            ir.op_desc.append(None)
+            ir.op_label.append("")
+        ir.op_method.append(op.method)
+        ir.op_expects.append(ir.iris.add(op.expects))
+        ir.op_returns.append(ir.iris.add(op.returns))
+        ir.op_expects_header.append(op.expects_header)
+        ir.op_returns_header.append(op.returns_header)
+        self.op_statuses.append(op.possible_status)
+
+    def add_statuses(self, statuses: List[Any]) -> None:
+        ir = self.ir
+        for status in statuses:
+            ir.status_code.append(status.code)
+            ir.status_id.append(status.id_)
+            ir.status_title.append(status.title)
+            ir.status_desc.append(status.desc)
+            ir.status_error.append(isinstance(status, HydraError))
+
+    def compile(self, apidoc: HydraDoc) -> CompiledDoc:
+        ir = self.ir
+        # the vocabulary of this doc, DocUrl.doc_url being the one of the last doc made
+        ir.vocab = "{}/{}?resource=".format(urljoin(apidoc.base_url, apidoc.API),
+                                            apidoc.doc_name)
+        parsed_classes = [apidoc.parsed_classes[key]["class"] for key in apidoc.parsed_classes]
+        collections = [apidoc.collections[key]["collection"] for key in apidoc.collections]
+        entrypoint = apidoc.entrypoint.entrypoint
+
+        ordered = [(class_, CLASS) for class_ in parsed_classes + apidoc.other_classes]
+        ordered += [(collection, COLLECTION) for collection in collections]
+        ordered.append((entrypoint, ENTRYPOINT))
+        for class_, kind in ordered:
+            ir.supported_classes.append(self.add_class(class_, kind))
+        for class_, _ in ordered:
+            self.entrypoint_targets[id(class_.supportedOperation)] = self.class_rows[id(class_)]
+        for class_, _ in ordered:
+            self.fill_class(class_)
+        ir.class_prop_start.append(len(ir.prop_kind))
+        ir.class_op_start.append(len(ir.op_kind))
+        for link in self.links:
+            ir.link_op_start.append(len(ir.op_kind))
+            for op in link.supportedOperation:
+                self.add_op(op)
+        ir.link_op_start.append(len(ir.op_kind))
+
+        for statuses in self.op_statuses:
+            ir.op_status_start.append(len(ir.status_code))
+            self.add_statuses(statuses)
+        ir.op_status_start.append(len(ir.status_code))
+        ir.doc_status_start = len(ir.status_code)
+        self.add_statuses(apidoc.possible_status)
+        ir.doc_status_end = len(ir.status_code)
+
+        ir.status_doc = [ir._serialize_status(row) for row in range(len(ir.status_code))]
+        ir.iri_values = ir.iris.iris + [None]
+        ir.class_by_iri = array("q", [NO_REF]) * len(ir.iris)
+        for row in range(len(ir.class_kind)):
+            ir.class_by_iri[ir.class_iri[row]] = row
+        ir.doc = {
+            "@context": apidoc.context.generate(),
+            "@id": "{}/{}".format(urljoin(apidoc.base_url, apidoc.API), apidoc.doc_name),
+            "@type": "ApiDocumentation",
+            "title": apidoc.title,
+            "description": apidoc.desc,
+            "entrypoint": urljoin(apidoc.base_url, apidoc.entrypoint_endpoint),
+        }
+        return ir
+
+
+def compile_doc(apidoc: HydraDoc) -> CompiledDoc:
+    """
+    Compile a HydraDoc into its integer-ID table representation.
+
+    :param apidoc: the HydraDoc to compile, with its EntryPoint generated
+    :return: CompiledDoc whose generate() gives the same dict as apidoc.generate()
+    """
+    return _Compiler().compile(apidoc)
@@ -3,16 +3,41 @@ create a HydraDoc object for it
 """
 import re
 import json
-from pyld import jsonld
-import requests
 from hydra_python_core.doc_writer import (HydraDoc, HydraClass, HydraClassProp,
                                           HydraClassOp, HydraStatus, HydraLink,
-                                          HydraCollection, DocUrl)
-from typing import Any, Dict, Match, Optional, Tuple, Union, List
+                                          HydraCollection, DocUrl, IriPool,
+                                          intern_iri)
+from typing import Any, Dict, Iterable, Match, Optional, Tuple, Union, List
+from hydra_python_core.doc_roundtrip import rebuild_doc
+from hydra_python_core.doc_rdf import parse_ntriples, parse_turtle, triples_to_expanded
 from hydra_python_core.namespace import hydra, rdfs
+from hydra_python_core.instrumentation import phase
 from urllib.parse import urlparse
 
-jsonld.set_document_loader(jsonld.requests_document_loader())
+# loader of the remote contexts for the expansions of create_doc, made on first use
+_document_loader = None  # type: Any
+
+
+def __getattr__(name: str) -> Any:
+    """Import pyld on first use of `doc_maker.jsonld` instead of with the module."""
+    if name == "jsonld":
+        from pyld import jsonld
+        return jsonld
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def expand(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a JSON-LD doc with pyld, its remote contexts being fetched with requests.
+
+    pyld and requests are imported by the first expansion. The document loader
+    is given to each expansion, the global loader of pyld is left as is.
+    """
+    global _document_loader
+    from pyld import jsonld
+    if _document_loader is None:
+        _document_loader = jsonld.requests_document_loader()
+    return jsonld.expand(doc, {"documentLoader": _document_loader})
 
 
 def create_doc(doc: Dict[str, Any], HYDRUS_SERVER_URL: str = None,
@@ -31,7 +56,77 @@ def create_doc(doc: Dict[str, Any], HYDRUS_SERVER_URL: str = None,
     if not all(key in doc for key in ('@context', '@id', '@type')):
         raise SyntaxError("Please make sure doc contains @context, @id and @type")
 
-    _context = doc['@context']
+    # share one copy of each IRI and literal among the objects of the doc
+    with IriPool():
+        return _create_doc(doc, HYDRUS_SERVER_URL, API_NAME)
+
+
+def create_doc_from_triples(source: Union[str, Iterable[str]], HYDRUS_SERVER_URL: str = None,
+                            API_NAME: str = None, format: str = "ntriples",
+                            context: Dict[str, Any]=None) -> HydraDoc:
+    """
+    Create the HydraDoc object from the triples of an API Documentation.
+
+    The triples are parsed in one pass and grouped by subject into the expanded
+    doc create_doc gets from JSON-LD expansion, no JSON-LD processing is involved.
+
+    :param source: N-Triples, N-Quads or Turtle text, or an iterable of its lines
+                   such as an open file
+    :param HYDRUS_SERVER_URL: url of the hydrus server
+    :param API_NAME: name of the api
+    :param format: "ntriples", "nquads" or "turtle"
+    :param context: additional context entries for the doc, like the @context of a doc
+    :return: instance of HydraDoc which server and agent can understand
+    :raise SyntaxError: If the triples are invalid or have no hydra:ApiDocumentation.
+    """
+    if format in ("ntriples", "nquads"):
+        lines = source.splitlines() if isinstance(source, str) else source
+        triples = parse_ntriples(lines)
+    elif format == "turtle":
+        triples = parse_turtle(source if isinstance(source, str) else "".join(source))
+    else:
+        raise ValueError("Unknown triples format {!r}".format(format))
+
+    with IriPool():
+        with phase("create_doc.parse_triples"):
+            expanded_doc = triples_to_expanded(triples)
+        return _build_doc(expanded_doc, context or {}, HYDRUS_SERVER_URL, API_NAME)
+
+
+def create_doc_from_generated(doc: Dict[str, Any], HYDRUS_SERVER_URL: str = None,
+                              API_NAME: str = None) -> HydraDoc:
+    """
+    Create the HydraDoc object from the `generate()` output of a HydraDoc.
+
+    Such a doc, as saved by a hydrus server, is rebuilt directly with the
+    templates and generates the same output again. Other docs, or docs written
+    for another server url or api name, are created by create_doc.
+
+    :param doc: dictionary of hydra api doc
+    :param HYDRUS_SERVER_URL: url of the hydrus server
+    :param API_NAME: name of the api
+    :return: instance of HydraDoc which server and agent can understand
+    :raise SyntaxError: If the `doc` doesn't have an entry for `@id` , `@context`, `@type` key.
+    """
+    with IriPool():
+        with phase("create_doc.rebuild"):
+            apidoc = rebuild_doc(doc, HYDRUS_SERVER_URL, API_NAME)
+    if apidoc is not None:
+        return apidoc
+    return create_doc(doc, HYDRUS_SERVER_URL, API_NAME)
+
+
+def _create_doc(doc: Dict[str, Any], HYDRUS_SERVER_URL: Optional[str],
+                API_NAME: Optional[str]) -> HydraDoc:
+    """Build the HydraDoc of a doc which has @context, @id and @type."""
+    with phase("create_doc.expand"):
+        expanded_doc = expand(doc)
+    return _build_doc(expanded_doc, doc['@context'], HYDRUS_SERVER_URL, API_NAME)
+
+
+def _build_doc(expanded_doc: List[Dict[str, Any]], _context: Dict[str, Any],
+               HYDRUS_SERVER_URL: Optional[str], API_NAME: Optional[str]) -> HydraDoc:
+    """Build the HydraDoc of an expanded doc, `_context` being added to the doc's context."""
     base_url = ''
     entrypoint = ''
     doc_name = 'vocab'
@@ -42,65 +137,62 @@ def create_doc(doc: Dict[str, Any], HYDRUS_SERVER_URL: str = None,
     _description = "This is the default description"
     _classes = []
     _collections = []
-    _endpoints = []
+    _endpoints = set()
     _possible_status = []
     _endpoint_class = []
     _endpoint_collection = []
     _non_endpoint_classes = []
 
-    expanded_doc = jsonld.expand(doc)
-    for item in expanded_doc:
-        _id = item['@id']
-        # Extract base_url, entrypoint and API name
-        base_url = urlparse(_id).scheme + '//' + urlparse(_id).netloc
-        entrypoint = _entrypoint
-        doc_name = urlparse(_id).path.split('/')[-1]
-        doc_url = DocUrl(HYDRUS_SERVER_URL, api_name=API_NAME, doc_name=doc_name).doc_url
-        for entrypoint in item[hydra['entrypoint']]:
-            _entrypoint = entrypoint['@id']
-        if hydra['title'] in item:
-            for title in item[hydra['title']]:
-                _title = title['@value']
-        if hydra['description'] in item:
-            for description in item[hydra['description']]:
-                _description = description['@value']
-        for classes in item[hydra['supportedClass']]:
-            isCollection = False
-            if hydra['manages'] in classes:
-                isCollection = True
-                _collections.append(classes)
-            for supported_prop in classes[hydra['supportedProperty']]:
-                for prop in supported_prop[hydra['property']]:
-                    if '@type' in prop:
-                        for prop_type in prop['@type']:
-                            if prop_type == hydra['Link']:
-                                # find the range of the link
-                                for resource_range in prop[rdfs['range']]:
-                                    _endpoints.append(check_namespace(resource_range['@id']))
-            if not isCollection:
-                _classes.append(classes)
-        for status in item[hydra['possibleStatus']]:
-            _possible_status.append(status)
-    for classes in _classes:
-        if classes['@id'] == hydra['Resource'] or classes['@id'] == hydra['Collection']:
-            continue
-        endpoint = False
-        if classes['@id'].find("EntryPoint") != -1:
-            classes['@id'] = "{}{}".format(doc_url, "EntryPoint")
-        else:
-            classes['@id'] = check_namespace(classes['@id'])
-        for endpoints in _endpoints:
-            if classes['@id'] == endpoints:
-                endpoint = True
+    with phase("create_doc.classify") as classify_phase:
+        for item in expanded_doc:
+            _id = item['@id']
+            # Extract base_url, entrypoint and API name
+            base_url = urlparse(_id).scheme + '//' + urlparse(_id).netloc
+            entrypoint = _entrypoint
+            doc_name = urlparse(_id).path.split('/')[-1]
+            doc_url = DocUrl(HYDRUS_SERVER_URL, api_name=API_NAME, doc_name=doc_name).doc_url
+            for entrypoint in item[hydra['entrypoint']]:
+                _entrypoint = entrypoint['@id']
+            if hydra['title'] in item:
+                for title in item[hydra['title']]:
+                    _title = title['@value']
+            if hydra['description'] in item:
+                for description in item[hydra['description']]:
+                    _description = description['@value']
+            for classes in item[hydra['supportedClass']]:
+                isCollection = False
+                if hydra['manages'] in classes:
+                    isCollection = True
+                    _collections.append(classes)
+                for supported_prop in classes[hydra['supportedProperty']]:
+                    for prop in supported_prop[hydra['property']]:
+                        if '@type' in prop:
+                            for prop_type in prop['@type']:
+                                if prop_type == hydra['Link']:
+                                    # find the range of the link
+                                    for resource_range in prop[rdfs['range']]:
+                                        _endpoints.add(check_namespace(resource_range['@id']))
+                if not isCollection:
+                    _classes.append(classes)
+            for status in item[hydra['possibleStatus']]:
+                _possible_status.append(status)
+        for classes in _classes:
+            if classes['@id'] == hydra['Resource'] or classes['@id'] == hydra['Collection']:
+                continue
+            if classes['@id'].find("EntryPoint") != -1:
+                classes['@id'] = "{}{}".format(doc_url, "EntryPoint")
+            else:
+                classes['@id'] = check_namespace(classes['@id'])
+            if classes['@id'] in _endpoints:
                 _endpoint_class.append(classes)
-        if not endpoint:
-            _non_endpoint_classes.append(classes)
+            else:
+                _non_endpoint_classes.append(classes)
 
-    for collections in _collections:
-        collections['@id'] = check_namespace(collections['@id'])
-        for endpoints in _endpoints:
-            if collections['@id'] == endpoints:
+        for collections in _collections:
+            collections['@id'] = check_namespace(collections['@id'])
+            if collections['@id'] in _endpoints:
                 _endpoint_collection.append(collections)
+        classify_phase.add(len(_classes) + len(_collections))
     # Main doc object
     if HYDRUS_SERVER_URL is not None and API_NAME is not None:
         apidoc = HydraDoc(
@@ -115,37 +207,46 @@ def create_doc(doc: Dict[str, Any], HYDRUS_SERVER_URL: str = None,
     for entry in _context:
         apidoc.add_to_context(entry, _context[entry])
 
-    # make endpoint classes
-    for endpoint_classes in _endpoint_class:
-        if endpoint_classes['@id'] == hydra['Resource'] or \
-            endpoint_classes['@id'] == hydra['Collection'] or \
-                endpoint_classes['@id'].find("EntryPoint") != -1:
-            continue
-        class_ = create_class(endpoint_classes, endpoint=True)
-        apidoc.add_supported_class(class_)
-
-    # make non-endpoint classes
-    for classes in _non_endpoint_classes:
-        if classes['@id'] == hydra['Resource'] or classes['@id'] == hydra['Collection'] or \
-                classes['@id'].find("EntryPoint") != -1:
-            continue
-        class_ = create_class(classes, endpoint=False)
-        apidoc.add_supported_class(class_)
-
-    # make endpoint collections
-    for endpoint_collection in _endpoint_collection:
-        collection_ = create_collection(endpoint_collection)
-        apidoc.add_supported_collection(collection_)
-
-    # add possibleStatus
-    status_list = create_status(_possible_status)
-    for status in status_list:
-        apidoc.add_possible_status(status)
+    with phase("create_doc.create_class") as class_phase:
+        # make endpoint classes
+        for endpoint_classes in _endpoint_class:
+            if endpoint_classes['@id'] == hydra['Resource'] or \
+                endpoint_classes['@id'] == hydra['Collection'] or \
+                    endpoint_classes['@id'].find("EntryPoint") != -1:
+                continue
+            class_ = create_class(endpoint_classes, endpoint=True)
+            apidoc.add_supported_class(class_)
+            class_phase.add()
+
+        # make non-endpoint classes
+        for classes in _non_endpoint_classes:
+            if classes['@id'] == hydra['Resource'] or classes['@id'] == hydra['Collection'] or \
+                    classes['@id'].find("EntryPoint") != -1:
+                continue
+            class_ = create_class(classes, endpoint=False)
+            apidoc.add_supported_class(class_)
+            class_phase.add()
+
+    with phase("create_doc.create_collection") as collection_phase:
+        # make endpoint collections
+        for endpoint_collection in _endpoint_collection:
+            collection_ = create_collection(endpoint_collection)
+            apidoc.add_supported_collection(collection_)
+            collection_phase.add()
+
+    with phase("create_doc.create_status") as status_phase:
+        # add possibleStatus
+        status_list = create_status(_possible_status)
+        for status in status_list:
+            apidoc.add_possible_status(status)
+        status_phase.add(len(status_list))
 
     # add base collection and resource
     apidoc.add_baseResource()
     apidoc.add_baseCollection()
-    apidoc.gen_EntryPoint()
+    with phase("create_doc.gen_EntryPoint") as entrypoint_phase:
+        apidoc.gen_EntryPoint()
+        entrypoint_phase.add(len(apidoc.entrypoint.entrypoint.supportedProperty))
     return apidoc
 
 
@@ -217,8 +318,13 @@ def create_class(expanded_class: Dict[str, Any], endpoint: bool) -> HydraClass:
     if hydra['description'] in expanded_class:
         class_description = expanded_class[hydra['description']][0]['@value']
 
+    # one parent is kept as an IRI, as doc_writer writes it
+    parents = [check_namespace(parent['@id'])
+               for parent in expanded_class.get(rdfs['subClassOf'], []) if '@id' in parent]
+    sub_classof = parents if len(parents) > 1 else parents[0] if parents else None
+
     class_ = HydraClass(class_title,
-                        class_description, endpoint=endpoint)
+                        class_description, endpoint=endpoint, sub_classof=sub_classof)
 
     # add supported Property
     for supported_property in expanded_class[hydra["supportedProperty"]]:
@@ -260,11 +366,11 @@ def create_operation(supported_operation: Dict[str, Any]) -> HydraClassOp:
 
     if hydra['expectsHeader'] in supported_operation:
         for header in supported_operation[hydra['expectsHeader']]:
-            op_expects_header.append(header['@value'])
+            op_expects_header.append(intern_iri(header['@value']))
 
     if hydra['returnsHeader'] in supported_operation:
         for header in supported_operation[hydra['returnsHeader']]:
-            op_returns_header.append(header['@value'])
+            op_returns_header.append(intern_iri(header['@value']))
 
     if hydra['possibleStatus'] in supported_operation:
         op_possible_status = create_status(supported_operation[hydra['possibleStatus']])
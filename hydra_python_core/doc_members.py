@@ -0,0 +1,438 @@
+"""Columnar buffers of the members of a collection, serialized page by page.
+
+A MemberBuffer holds the members of a collection of one HydraClass as one
+typed column per supported property instead of one dict per member:
+
+- integer, floating point and boolean properties, by their `range`, are typed
+  vectors with a presence mask made when a value is first missing,
+- the other properties are interned: a vector of codes into their distinct
+  values, each encoded to JSON once,
+- the @id column is the UTF-8 bytes of all the ids and their offsets.
+
+The vectors are numpy arrays when numpy is installed, `array.array` otherwise.
+A page is serialized to JSON from the columns, a column at a time, without a
+dict per member.
+
+Example:
+    members = MemberBuffer.for_collection(apidoc, apidoc.collections["Books"]["collection"])
+    members.extend(rows)  # compacted JSON-LD of the members
+    body = members.page_json("http://hydrus.com/api/Books", page=1, page_size=1000)
+"""
+import json
+import math
+from array import array
+from json.encoder import encode_basestring_ascii  # type: ignore
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from hydra_python_core.doc_writer import Context, HydraClass, HydraCollection, HydraDoc, \
+    HydraLink
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# local names of the xsd datatypes of the typed columns
+_INTEGERS = frozenset({"integer", "int", "long", "short", "byte", "nonNegativeInteger",
+                       "positiveInteger", "negativeInteger", "nonPositiveInteger",
+                       "unsignedLong", "unsignedInt", "unsignedShort", "unsignedByte"})
+_FLOATS = frozenset({"decimal", "float", "double"})
+_BOOLEANS = frozenset({"boolean"})
+_DTYPES = {"q": "int64", "d": "float64", "b": "int8", "I": "uint32", "Q": "uint64"}
+# terms of the pages, added to the Context of the class of the members
+_PAGE_TERMS = {
+    "Collection": "hydra:Collection",
+    "PartialCollectionView": "hydra:PartialCollectionView",
+    "totalItems": "hydra:totalItems",
+    "view": "hydra:view",
+    "first": {"@id": "hydra:first", "@type": "@id"},
+    "last": {"@id": "hydra:last", "@type": "@id"},
+    "previous": {"@id": "hydra:previous", "@type": "@id"},
+    "next": {"@id": "hydra:next", "@type": "@id"},
+}  # type: Dict[str, Any]
+
+
+def literal(value: Any) -> Any:
+    """Get the value of a compacted value or of an expanded value object or list of one."""
+    if isinstance(value, list) and len(value) == 1:
+        value = value[0]
+    if isinstance(value, dict):
+        if "@value" in value:
+            return value["@value"]
+        if "@id" in value and len(value) == 1:
+            return value["@id"]
+    return value
+
+
+def column_type(range_: Optional[str]) -> str:
+    """Get the typecode of the column of a property range: "q", "d", "b", or "s" for interned."""
+    if not isinstance(range_, str):
+        return "s"
+    name = range_.rsplit("#", 1)[-1].rsplit(":", 1)[-1]
+    if name in _INTEGERS:
+        return "q"
+    if name in _FLOATS:
+        return "d"
+    if name in _BOOLEANS:
+        return "b"
+    return "s"
+
+
+class Vector:
+    """Growable vector of one typecode, a numpy array if numpy is installed."""
+
+    def __init__(self, typecode: str, use_numpy: bool = None) -> None:
+        self.typecode = typecode
+        self.numpy = numpy is not None if use_numpy is None else use_numpy
+        self.size = 0
+        if self.numpy:
+            self.data = numpy.empty(16, dtype=_DTYPES[typecode])  # type: Any
+        else:
+            self.data = array(typecode)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self.data):
+            data = numpy.empty(max(size, 2 * len(self.data)), dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+
+    def append(self, value: Any) -> None:
+        if self.numpy:
+            self._reserve(self.size + 1)
+            self.data[self.size] = value
+        else:
+            self.data.append(value)
+        self.size += 1
+
+    def extend(self, values: List[Any]) -> None:
+        if self.numpy:
+            self._reserve(self.size + len(values))
+            self.data[self.size:self.size + len(values)] = values
+        else:
+            self.data.extend(values)
+        self.size += len(values)
+
+    def values(self) -> Any:
+        """Get the array of the values, a view of the numpy array."""
+        return self.data[:self.size] if self.numpy else self.data
+
+    def tolist(self, start: int, stop: int) -> List[Any]:
+        return self.data[start:stop].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        if self.numpy:
+            return self.size * self.data.itemsize
+        return len(self.data) * self.data.itemsize
+
+
+class _TypedColumn:
+    """Column of integers, floats or booleans, None being kept in a presence mask."""
+
+    def __init__(self, typecode: str, use_numpy: bool = None) -> None:
+        self.typecode = typecode
+        self.vector = Vector(typecode, use_numpy)
+        self.present = None  # type: Optional[bytearray]
+
+    def _check(self, value: Any) -> Any:
+        if value is None:
+            return None
+        if self.typecode == "q":
+            if type(value) is not int:
+                raise TypeError("Expected an integer, got {!r}".format(value))
+            return value
+        if self.typecode == "d":
+            if type(value) not in (int, float):
+                raise TypeError("Expected a number, got {!r}".format(value))
+            if not math.isfinite(value):
+                # NaN and Infinity have no JSON
+                raise ValueError("Expected a finite number, got {!r}".format(value))
+            return float(value)
+        if type(value) is not bool:
+            raise TypeError("Expected a boolean, got {!r}".format(value))
+        return int(value)
+
+    def prepare(self, values: List[Any]) -> List[Any]:
+        """Check the values and convert them to the typecode, without changing the column."""
+        return [self._check(value) for value in values]
+
+    def extend(self, values: List[Any]) -> None:
+        if None in values:
+            if self.present is None:
+                self.present = bytearray(b"\x01") * len(self.vector)
+            self.present.extend(value is not None for value in values)
+            values = [0 if value is None else value for value in values]
+        elif self.present is not None:
+            self.present.extend(b"\x01" * len(values))
+        self.vector.extend(values)
+
+    def tolist(self, start: int, stop: int) -> List[Any]:
+        values = self.vector.tolist(start, stop)
+        if self.typecode == "b":
+            values = [value == 1 for value in values]
+        if self.present is not None:
+            values = [value if present else None
+                      for value, present in zip(values, self.present[start:stop])]
+        return values
+
+    def encoded(self, start: int, stop: int) -> List[Optional[str]]:
+        """Get the JSON of the values, None for the missing ones."""
+        values = self.vector.tolist(start, stop)
+        if self.typecode == "q":
+            encoded = list(map(str, values))  # type: List[Optional[str]]
+        elif self.typecode == "d":
+            encoded = list(map(repr, values))
+        else:
+            encoded = ["true" if value else "false" for value in values]
+        if self.present is not None:
+            encoded = [value if present else None
+                       for value, present in zip(encoded, self.present[start:stop])]
+        return encoded
+
+    @property
+    def nbytes(self) -> int:
+        return self.vector.nbytes + (len(self.present) if self.present is not None else 0)
+
+
+class _InternedColumn:
+    """Column of codes into the distinct values, code 0 being None."""
+
+    def __init__(self, use_numpy: bool = None) -> None:
+        self.codes = Vector("I", use_numpy)
+        self.values = [None]  # type: List[Any]
+        self.index = {None: 0}  # type: Dict[Any, int]
+        self._encoded = [None]  # type: List[Optional[str]]
+
+    def prepare(self, values: List[Any]) -> List[Any]:
+        for value in values:
+            hash(value)  # the values are interned by equality, lists and dicts can't be
+        return values
+
+    def extend(self, values: List[Any]) -> None:
+        index = self.index
+        codes = []
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(self.values)
+                self.values.append(value)
+            codes.append(code)
+        self.codes.extend(codes)
+
+    def tolist(self, start: int, stop: int) -> List[Any]:
+        values = self.values
+        return [values[code] for code in self.codes.tolist(start, stop)]
+
+    def encoded(self, start: int, stop: int) -> List[Optional[str]]:
+        encoded = self._encoded
+        if len(encoded) < len(self.values):
+            encoded.extend(json.dumps(value) for value in self.values[len(encoded):])
+        return [encoded[code] for code in self.codes.tolist(start, stop)]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+
+class _StringColumn:
+    """Column of strings, as their UTF-8 bytes one after the other and their end offsets."""
+
+    def __init__(self, use_numpy: bool = None) -> None:
+        self.data = bytearray()
+        self.ends = Vector("Q", use_numpy)
+
+    def extend(self, values: List[str]) -> None:
+        ends = []
+        data = self.data
+        for value in values:
+            data += value.encode()
+            ends.append(len(data))
+        self.ends.extend(ends)
+
+    def tolist(self, start: int, stop: int) -> List[str]:
+        if start >= stop:
+            return []
+        ends = self.ends.tolist(max(start - 1, 0), stop)
+        first = ends[0] if start > 0 else 0
+        if start > 0:
+            ends = ends[1:]
+        chunk = bytes(self.data[first:ends[-1]])
+        starts = [first] + ends[:-1]
+        # ASCII ids, the most common, are decoded at once and sliced by their byte offsets
+        try:
+            text = chunk.decode("ascii")
+        except UnicodeDecodeError:
+            return [chunk[begin - first:end - first].decode() for begin, end in zip(starts, ends)]
+        return [text[begin - first:end - first] for begin, end in zip(starts, ends)]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.ends.nbytes
+
+
+class MemberBuffer:
+    """
+    Members of a HydraClass held in columns, one per supported property.
+
+    :param class_: the HydraClass of the members
+    :param use_numpy: use numpy arrays, by default if numpy is installed
+    """
+
+    def __init__(self, class_: HydraClass, use_numpy: bool = None) -> None:
+        self.class_ = class_
+        self.type_ = class_.title
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        if self.use_numpy and numpy is None:
+            raise ImportError("numpy is not installed")
+        self.ids = _StringColumn(self.use_numpy)
+        # context key, IRI and column of each property
+        self.columns = list()  # type: List[Tuple[str, str, Any]]
+        for prop in class_.supportedProperty:
+            iri = prop.prop.id_ if isinstance(prop.prop, HydraLink) else prop.prop
+            typecode = column_type(prop.kwargs.get("range"))
+            if typecode == "s":
+                column = _InternedColumn(self.use_numpy)  # type: Any
+            else:
+                column = _TypedColumn(typecode, self.use_numpy)
+            self.columns.append((prop.title, iri, column))
+        self._keys = {key: i for i, (key, _, _) in enumerate(self.columns)}
+        self._keys.update((iri, i) for i, (_, iri, _) in enumerate(self.columns))
+        self._size = 0
+        # @context of the pages, the terms of the class and of the collection pages
+        self.context = dict(Context(class_.id_, class_=class_).generate(), **_PAGE_TERMS)
+
+    @classmethod
+    def for_collection(cls, apidoc: HydraDoc, collection: HydraCollection,
+                       use_numpy: bool = None) -> 'MemberBuffer':
+        """Get the buffer of the members of a collection, of the class it manages."""
+        managed = collection.manages.get("object") if isinstance(collection.manages, dict) \
+            else None
+        for entry in apidoc.parsed_classes.values():
+            if entry["class"].id_ == managed:
+                return cls(entry["class"], use_numpy)
+        raise ValueError("The class {!r} managed by {} is not in the doc".format(
+            managed, collection.name))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, member: Dict[str, Any]) -> None:
+        """Add a member, as compacted or expanded JSON-LD."""
+        self.extend([member])
+
+    def extend(self, members: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add members, as compacted or expanded JSON-LD with an @id.
+
+        Raises:
+            ValueError: If a member has a property which is not of the class, or a
+                        number which is not finite.
+            TypeError: If a value does not have the type of the range of its property.
+
+        """
+        members = list(members)
+        ids = [member["@id"] for member in members]
+        for id_ in ids:
+            if not isinstance(id_, str):
+                raise TypeError("Expected a string @id, got {!r}".format(id_))
+        rows = [[None] * len(self.columns) for _ in members]  # type: List[List[Any]]
+        keys = self._keys
+        for member, row in zip(members, rows):
+            for key, value in member.items():
+                i = keys.get(key)
+                if i is not None:
+                    # expanded values are value objects in lists
+                    row[i] = literal(value) if isinstance(value, (list, dict)) else value
+                elif key not in ("@id", "@type", "@context"):
+                    raise ValueError("{!r} is not a property of {}".format(key, self.type_))
+        values = list(zip(*rows)) if rows else [()] * len(self.columns)
+        # every column is checked before any of them changes
+        prepared = [column.prepare(list(column_values))
+                    for (_, _, column), column_values in zip(self.columns, values)]
+        self.ids.extend(ids)
+        for (_, _, column), column_values in zip(self.columns, prepared):
+            column.extend(column_values)
+        self._size += len(members)
+
+    def column(self, key: str) -> Any:
+        """Get the vector of a typed column, or the values of an interned one, by key or IRI."""
+        column = self.columns[self._keys[key]][2]
+        if isinstance(column, _TypedColumn):
+            return column.vector.values()
+        return column.tolist(0, self._size)
+
+    def _stop(self, start: int, stop: Optional[int]) -> int:
+        if start < 0:
+            raise ValueError("The members start at 0, got {}".format(start))
+        return self._size if stop is None else min(stop, self._size)
+
+    def members(self, start: int = 0, stop: int = None) -> List[Dict[str, Any]]:
+        """Get members as compacted JSON-LD dicts, missing properties left out."""
+        stop = self._stop(start, stop)
+        columns = [(key, column.tolist(start, stop)) for key, _, column in self.columns]
+        members = []
+        for i, id_ in enumerate(self.ids.tolist(start, stop)):
+            member = {"@id": id_, "@type": self.type_}
+            for key, values in columns:
+                if values[i] is not None:
+                    member[key] = values[i]
+            members.append(member)
+        return members
+
+    def members_json(self, start: int = 0, stop: int = None) -> str:
+        """Get the JSON array of the members of a page, serialized from the columns."""
+        stop = self._stop(start, stop)
+        if start >= stop:
+            return "[]"
+        head = ',"@type":{}'.format(encode_basestring_ascii(self.type_))
+        fragments = [['{"@id":' + encode_basestring_ascii(id_) + head
+                      for id_ in self.ids.tolist(start, stop)]]
+        for key, _, column in self.columns:
+            prefix = "," + encode_basestring_ascii(key) + ":"
+            fragments.append(["" if value is None else prefix + value
+                              for value in column.encoded(start, stop)])
+        return "[" + "},".join(map("".join, zip(*fragments))) + "}]"
+
+    def page_json(self, collection_id: str, page: int = 1, page_size: int = 1000,
+                  context: Any = None) -> str:
+        """
+        Get a page of the collection as JSON-LD, with a hydra:PartialCollectionView.
+
+        :param collection_id: @id of the collection, the pages being `?page=n` of it
+        :param page: number of the page, from 1
+        :param page_size: members per page
+        :param context: @context of the page, `self.context` by default; the URL of a
+                        served context defining the same terms can be given instead
+        """
+        if page < 1 or page_size < 1:
+            raise ValueError("The page and the page size start at 1, got {} and {}".format(
+                page, page_size))
+        last = max(1, -(-self._size // page_size))
+        view = {
+            "@id": "{}?page={}".format(collection_id, page),
+            "@type": "PartialCollectionView",
+            "first": "{}?page=1".format(collection_id),
+            "last": "{}?page={}".format(collection_id, last),
+        }
+        if page > 1:
+            view["previous"] = "{}?page={}".format(collection_id, page - 1)
+        if page < last:
+            view["next"] = "{}?page={}".format(collection_id, page + 1)
+        envelope = json.dumps({
+            "@context": self.context if context is None else context,
+            "@id": collection_id,
+            "@type": "Collection",
+            "totalItems": self._size,
+            "view": view,
+        }, separators=(",", ":"))
+        start = (page - 1) * page_size
+        members = self.members_json(start, start + page_size)
+        return '{},"members":{}}}'.format(envelope[:-1], members)
+
+    @property
+    def nbytes(self) -> int:
+        """Get the bytes of the columns, without the distinct values of the interned ones."""
+        return self.ids.nbytes + sum(column.nbytes for _, _, column in self.columns)
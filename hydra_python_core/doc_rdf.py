@@ -0,0 +1,675 @@
+"""Stream the RDF triples of a HydraDoc as N-Triples or N-Quads.
+
+The triples are emitted straight from the template objects, without going
+through generate() and JSON-LD expansion. They are the triples a JSON-LD
+processor gets from the generated doc when the hydra core context is known, as
+it is to any Hydra client: relative IRIs are dropped, blank node labels of the
+doc are kept per document and the other nodes get fresh blank nodes.
+
+Example:
+    with open("vocab.nt", "w") as f:
+        write_ntriples(apidoc.iter_triples(), f)
+"""
+import re
+from typing import (Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO,
+                    Tuple, Union)
+from urllib.parse import urljoin
+
+from hydra_python_core.doc_writer import (EntryPointClass, EntryPointCollection,
+                                          EntryPointOp, HydraClass, HydraClassOp,
+                                          HydraClassProp, HydraCollection, HydraCollectionOp,
+                                          HydraDoc, HydraError, HydraLink, HydraStatus)
+from hydra_python_core.namespace import NamespaceRegistry, hydra, hydraNamespace, rdf, rdfs
+
+xsdNamespace = "http://www.w3.org/2001/XMLSchema#"
+
+Literal = NamedTuple("Literal", [("value", str), ("datatype", str)])
+Term = Union[str, Literal]
+Triple = Tuple[str, str, Term]
+
+_ABSOLUTE_IRI = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:[^\s]*$")
+_DOUBLE_EXPONENT = re.compile(r"(\d)0*E\+?0*(\d)")
+_OPERATION_TYPES = {"POST": "http://schema.org/UpdateAction",
+                    "PUT": "http://schema.org/AddAction",
+                    "DELETE": "http://schema.org/DeleteAction"}
+_FIND_ACTION = "http://schema.org/FindAction"
+
+
+def literal(value: Any) -> Optional[Literal]:
+    """Get the typed literal of a JSON value, None for null."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return Literal("true" if value else "false", xsdNamespace + "boolean")
+    if isinstance(value, float) or (isinstance(value, int) and abs(value) >= 10 ** 21):
+        canonical = _DOUBLE_EXPONENT.sub(r"\1E\2", "{:1.15E}".format(value))
+        return Literal(canonical, xsdNamespace + "double")
+    if isinstance(value, int):
+        return Literal(str(value), xsdNamespace + "integer")
+    return Literal(str(value), xsdNamespace + "string")
+
+
+def literals(value: Any) -> Iterator[Literal]:
+    """Get the literals of a JSON value which may be a list or an expanded value object."""
+    for value_ in (value if isinstance(value, list) else [value]):
+        if isinstance(value_, dict):
+            if "@type" in value_:
+                yield Literal(str(value_["@value"]), value_["@type"])
+                continue
+            value_ = value_.get("@value")
+        if value_ is not None:
+            yield literal(value_)
+
+
+class DocTriples:
+    """Walk the templates of a HydraDoc and yield their triples.
+
+    The methods yield None for the terms which are not valid RDF, valid_triples
+    drops those triples. One instance numbers the blank nodes of one graph.
+    """
+
+    def __init__(self, apidoc: HydraDoc) -> None:
+        self.apidoc = apidoc
+        self.registry = NamespaceRegistry.from_context(apidoc.context.generate())
+        self.labels = dict()  # type: Dict[str, str]
+        self.count = 0
+        self.doc_id = self.iri("{}/{}".format(urljoin(apidoc.base_url, apidoc.API),
+                                              apidoc.doc_name))
+
+    def blank(self, label: Optional[str] = None) -> str:
+        """Get a fresh blank node, or the blank node of a label of the doc."""
+        if label is not None and label in self.labels:
+            return self.labels[label]
+        node = "_:b{}".format(self.count)
+        self.count += 1
+        if label is not None:
+            self.labels[label] = node
+        return node
+
+    def iri(self, value: Any, vocab: bool = False) -> Optional[str]:
+        """Expand an IRI value of the doc, None if it is not an absolute IRI."""
+        if not isinstance(value, str):
+            return None
+        if value.startswith("_:"):
+            return self.blank(value)
+        value = self.registry.expand(value, vocab)
+        return value if _ABSOLUTE_IRI.match(value) else None
+
+    def text(self, subject: Optional[str], predicate: str, value: Any) -> Iterator[Any]:
+        """Yield the triples of a title, description or label."""
+        for literal_ in literals(value):
+            yield subject, predicate, literal_
+
+    def triples(self) -> Iterator[Tuple[Optional[str], str, Optional[Term]]]:
+        apidoc = self.apidoc
+        yield from self.header()
+        classes = [apidoc.parsed_classes[key]["class"] for key in apidoc.parsed_classes]
+        classes.extend(apidoc.other_classes)
+        for class_ in classes:
+            yield from self.supported_class(class_)
+        for key in apidoc.collections:
+            yield from self.supported_collection(apidoc.collections[key]["collection"])
+        yield from self.supported_class(apidoc.entrypoint.entrypoint)
+        yield from self.statuses(self.doc_id, apidoc.possible_status)
+
+    def header(self) -> Iterator[Any]:
+        """Yield the triples of the ApiDocumentation node itself."""
+        subject = self.doc_id
+        yield subject, rdf["type"], hydra["ApiDocumentation"]
+        yield from self.text(subject, hydra["title"], self.apidoc.title)
+        yield from self.text(subject, hydra["description"], self.apidoc.desc)
+        yield subject, hydra["entrypoint"], self.iri(
+            urljoin(self.apidoc.base_url, self.apidoc.entrypoint_endpoint))
+
+    def supported_class(self, class_: HydraClass) -> Iterator[Any]:
+        node = self.iri(class_.id_)
+        yield self.doc_id, hydra["supportedClass"], node
+        yield from self.class_(class_, node)
+
+    def supported_collection(self, collection: HydraCollection) -> Iterator[Any]:
+        node = self.iri(collection.collection_id)
+        yield self.doc_id, hydra["supportedClass"], node
+        yield from self.collection(collection, node)
+
+    def supported_props(self, class_: HydraClass, props: Iterable[Any]) -> Iterator[Any]:
+        """Yield the triples of supported properties of a class, EntryPoint ones included."""
+        subject = self.iri(class_.id_)
+        for prop in props:
+            node = self.blank()
+            yield subject, hydra["supportedProperty"], node
+            if isinstance(prop, EntryPointClass):
+                yield from self.entrypoint_class(prop, node)
+            elif isinstance(prop, EntryPointCollection):
+                yield from self.entrypoint_collection(prop, node)
+            else:
+                yield from self.prop(prop, node)
+
+    def class_(self, class_: HydraClass, subject: Optional[str]) -> Iterator[Any]:
+        yield subject, rdf["type"], hydra["Class"]
+        yield from self.text(subject, hydra["title"], class_.title)
+        yield from self.text(subject, hydra["description"], class_.desc)
+        yield from self.supported_props(class_, class_.supportedProperty)
+        yield from self.operations(subject, class_.supportedOperation)
+        parents = class_.parents
+        for parent in (parents if isinstance(parents, list) else [parents]):
+            yield subject, rdfs["subClassOf"], self.iri(parent)
+
+    def prop(self, prop: HydraClassProp, subject: str) -> Iterator[Any]:
+        yield subject, rdf["type"], hydra["SupportedProperty"]
+        yield from self.text(subject, hydra["title"], prop.title)
+        yield subject, hydra["required"], literal(prop.required)
+        yield subject, hydra["readable"], literal(prop.read)
+        yield subject, hydra["writeable"], literal(prop.write)
+        if isinstance(prop.prop, HydraLink):
+            node = self.iri(prop.prop.id_)
+            yield subject, hydra["property"], node
+            yield from self.link(prop.prop, node)
+        else:
+            yield subject, hydra["property"], self.iri(prop.prop)
+        if len(prop.desc) > 0:
+            yield from self.text(subject, hydra["description"], prop.desc)
+        if "range" in prop.kwargs:
+            yield subject, rdfs["range"], self.iri(prop.kwargs["range"])
+
+    def link(self, link: HydraLink, subject: Optional[str]) -> Iterator[Any]:
+        yield subject, rdf["type"], hydra["Link"]
+        yield from self.text(subject, hydra["title"], link.title)
+        yield from self.text(subject, hydra["description"], link.desc)
+        yield subject, rdfs["range"], self.iri(link.range)
+        yield subject, rdfs["domain"], self.iri(link.domain)
+        yield from self.operations(subject, link.supportedOperation)
+
+    def entrypoint_link(self, subject: str, entry: Union[EntryPointClass, EntryPointCollection],
+                        description: str) -> Iterator[Any]:
+        """Yield the hydra:Link property shared by the EntryPoint classes and collections."""
+        node = self.iri(entry.id_)
+        yield subject, hydra["property"], node
+        yield node, rdf["type"], hydra["Link"]
+        yield from self.text(node, rdfs["label"], entry.name)
+        yield node, rdfs["domain"], self.iri("{}EntryPoint".format(entry.doc_url))
+        yield node, rdfs["range"], self.iri("{}{}".format(entry.doc_url, entry.name))
+        yield from self.text(subject, hydra["title"], entry.name.lower())
+        yield from self.text(subject, hydra["description"], description)
+        yield subject, hydra["readable"], literal(True)
+        yield subject, hydra["writeable"], literal(False)
+
+    def entrypoint_class(self, entry: EntryPointClass, subject: str) -> Iterator[Any]:
+        yield from self.entrypoint_link(subject, entry, "The {} Class".format(entry.name))
+        node = self.iri(entry.id_)
+        yield from self.text(node, hydra["description"], entry.desc)
+        yield from self.operations(node, [
+            EntryPointOp(op.title.lower(), op.method, None, op.expects, op.returns,
+                         op.expects_header, op.returns_header, op.possible_status,
+                         label=op.title)
+            for op in entry.supportedOperation])
+
+    def entrypoint_collection(self, entry: EntryPointCollection, subject: str) -> Iterator[Any]:
+        description = "The {} collection".format(entry.name)
+        yield from self.entrypoint_link(subject, entry, description)
+        node = self.iri(entry.id_)
+        yield from self.text(node, hydra["description"], description)
+        yield from self.manages(node, entry.manages)
+        yield from self.operations(node, [
+            EntryPointOp(op.id_.lower(), op.method, op.desc, op.expects, op.returns,
+                         op.expects_header, op.returns_header, op.possible_status,
+                         type_=op.type_)
+            for op in entry.supportedOperation])
+
+    def collection(self, collection: HydraCollection, subject: Optional[str]) -> Iterator[Any]:
+        yield subject, rdf["type"], hydra["Collection"]
+        yield subject, rdfs["subClassOf"], hydra["Collection"]
+        yield from self.text(subject, hydra["title"], collection.name)
+        yield from self.text(subject, hydra["description"], collection.collection_description)
+        yield from self.operations(subject, collection.supportedOperation)
+        for prop in collection.supportedProperty:
+            node = self.blank()
+            yield subject, hydra["supportedProperty"], node
+            yield from self.prop(prop, node)
+        yield from self.manages(subject, collection.manages)
+
+    def manages(self, subject: Optional[str], manages: Any) -> Iterator[Any]:
+        for block in (manages if isinstance(manages, list) else [manages]):
+            if not isinstance(block, dict):
+                continue
+            node = self.blank()
+            yield subject, hydra["manages"], node
+            for key, value in block.items():
+                predicate = self.iri(key, vocab=True)
+                coerced = self.registry.coercion(key) == "@id"
+                for value_ in (value if isinstance(value, list) else [value]):
+                    yield node, predicate, self.iri(value_) if coerced else literal(value_)
+
+    def operations(self, subject: Optional[str], operations: Iterable[Any]) -> Iterator[Any]:
+        for op in operations:
+            if isinstance(op, HydraCollectionOp):
+                node = self.iri(op.id_)
+                type_ = self.iri(op.type_, vocab=True)
+            elif isinstance(op, HydraClassOp):
+                node = self.blank()
+                type_ = op.get_type(op.method)
+            else:
+                node = self.iri(op.id_)
+                type_ = self.iri(op.type_, vocab=True) if op.type_ is not None \
+                    else _OPERATION_TYPES.get(op.method, _FIND_ACTION)
+            yield subject, hydra["supportedOperation"], node
+            yield node, rdf["type"], type_
+            yield node, hydra["method"], literal(op.method)
+            if isinstance(op, HydraCollectionOp) or not isinstance(op, HydraClassOp):
+                yield from self.text(node, hydra["description"], op.desc)
+            else:
+                yield from self.text(node, hydra["title"], op.title)
+            if isinstance(op, EntryPointOp) and len(op.label) > 0:
+                yield from self.text(node, rdfs["label"], op.label)
+            yield node, hydra["expects"], self.iri(op.expects)
+            yield node, hydra["returns"], self.iri(op.returns)
+            for header in op.expects_header:
+                yield node, hydra["expectsHeader"], literal(header)
+            for header in op.returns_header:
+                yield node, hydra["returnsHeader"], literal(header)
+            yield from self.statuses(node, op.possible_status)
+
+    def statuses(self, subject: Optional[str], statuses: Iterable[HydraStatus]) -> Iterator[Any]:
+        for status in statuses:
+            node = self.iri(status.id_) if status.id_ is not None else self.blank()
+            yield subject, hydra["possibleStatus"], node
+            status_type = "Error" if isinstance(status, HydraError) else "Status"
+            yield node, rdf["type"], hydraNamespace + status_type
+            yield node, hydra["statusCode"], literal(status.code)
+            yield from self.text(node, hydra["title"], status.title)
+            yield from self.text(node, hydra["description"], status.desc)
+
+
+def iter_triples(apidoc: HydraDoc) -> Iterator[Triple]:
+    """
+    Iterate over the RDF triples of an API Doc.
+
+    :param apidoc: HydraDoc object
+    :return: iterator of (subject, predicate, object) triples, IRIs and blank nodes
+             ("_:b0") as str, literals as Literal(value, datatype)
+    """
+    return valid_triples(DocTriples(apidoc).triples())
+
+
+def valid_triples(triples: Iterable[Tuple[Any, Any, Any]]) -> Iterator[Triple]:
+    """Drop the triples with a term which is not valid RDF."""
+    for subject, predicate, object_ in triples:
+        if subject is not None and predicate is not None and object_ is not None:
+            yield subject, predicate, object_
+
+
+def to_nquad(triple: Triple, graph: Optional[str] = None) -> str:
+    """Get the N-Triples line of a triple, the N-Quads line when `graph` is given."""
+    subject, predicate, object_ = triple
+    if isinstance(object_, Literal):
+        value = object_.value.replace("\\", "\\\\").replace("\t", "\\t").replace(
+            "\n", "\\n").replace("\r", "\\r").replace("\"", "\\\"")
+        if object_.datatype == xsdNamespace + "string":
+            object_ = "\"{}\"".format(value)
+        else:
+            object_ = "\"{}\"^^<{}>".format(value, object_.datatype)
+    else:
+        object_ = _node(object_)
+    if graph is None:
+        return "{} <{}> {} .\n".format(_node(subject), predicate, object_)
+    return "{} <{}> {} {} .\n".format(_node(subject), predicate, object_, _node(graph))
+
+
+def _node(node: str) -> str:
+    return node if node.startswith("_:") else "<{}>".format(node)
+
+
+def write_ntriples(triples: Iterable[Triple], out: TextIO) -> int:
+    """
+    Write triples to a text stream as N-Triples, one at a time.
+
+    :return: number of triples written
+    """
+    count = 0
+    for triple in triples:
+        out.write(to_nquad(triple))
+        count += 1
+    return count
+
+
+def write_nquads(triples: Iterable[Triple], out: TextIO, graph: str) -> int:
+    """
+    Write triples to a text stream as N-Quads in the named graph `graph`.
+
+    :return: number of quads written
+    """
+    count = 0
+    for triple in triples:
+        out.write(to_nquad(triple, graph))
+        count += 1
+    return count
+
+
+_ESCAPE = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))", re.S)
+_ESCAPES = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+_LITERAL = r'"((?:[^"\\]|\\.)*)"(?:@([A-Za-z]+(?:-[A-Za-z0-9]+)*)|\^\^<([^>]*)>)?'
+_NODE = r"<([^>]*)>|(_:[^\s<>\"]*[^\s<>\".])"
+_NQUAD = re.compile(r"\s*(?:{node})\s*<([^>]*)>\s*(?:{node}|{literal})\s*"
+                    r"(?:<[^>]*>\s*|_:[^\s<>\"]*[^\s<>\".]\s*)?\.\s*(?:#.*)?$".format(
+                        node=_NODE, literal=_LITERAL))
+_LANG_STRING = rdf["namespace"] + "langString"
+
+
+def _unescape(value: str) -> str:
+    """Decode the string escapes and unicode escapes of N-Triples and Turtle."""
+    if "\\" not in value:
+        return value
+
+    def replace(match: Any) -> str:
+        code = match.group(1) or match.group(2)
+        if code is not None:
+            return chr(int(code, 16))
+        return _ESCAPES.get(match.group(3), match.group(3))
+
+    return _ESCAPE.sub(replace, value)
+
+
+def parse_ntriples(lines: Iterable[str]) -> Iterator[Triple]:
+    """
+    Parse N-Triples or N-Quads line by line, graph names are ignored.
+
+    :param lines: iterable of lines, a text file for instance
+    :return: iterator of triples, in the format of iter_triples
+    :raise SyntaxError: on a line which is not a triple, a comment or blank
+    """
+    for number, line in enumerate(lines, 1):
+        match = _NQUAD.match(line)
+        if match is None:
+            if line.strip() and not line.lstrip().startswith("#"):
+                raise SyntaxError("Invalid N-Triples line {}: {}".format(number, line.strip()))
+            continue
+        iri, bnode, predicate, o_iri, o_bnode, value, language, datatype = match.groups()
+        subject = _unescape(iri) if iri is not None else bnode
+        if o_iri is not None:
+            object_ = _unescape(o_iri)  # type: Term
+        elif o_bnode is not None:
+            object_ = o_bnode
+        else:
+            object_ = Literal(_unescape(value), _LANG_STRING if language is not None
+                              else datatype or xsdNamespace + "string")
+        yield subject, _unescape(predicate), object_
+
+
+_TURTLE_TOKEN = re.compile(r"""
+    (?P<skip>\s+|\#[^\n]*)
+    |<(?P<iri>[^>]*)>
+    |(?P<long>\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"|'''(?:[^'\\]|\\.|'(?!''))*''')
+    |(?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    |(?P<at>@[A-Za-z]+(?:-[A-Za-z0-9]+)*)
+    |(?P<datatype>\^\^)
+    |(?P<number>[+-]?(?:\d+\.\d*[eE][+-]?\d+|\.?\d+[eE][+-]?\d+|\d*\.\d+|\d+))
+    |(?P<bnode>_:[^\s;,()\[\]<>"']*[^\s;,()\[\]<>"'.])
+    |(?P<pname>(?:[A-Za-z][\w.-]*)?:(?:[\w\-:%]|\\.|\.(?=[\w\-:%\\]))*)
+    |(?P<keyword>[A-Za-z]+)
+    |(?P<punct>[;,.\[\]()])
+    """, re.X | re.S)
+_LOCAL_ESCAPE = re.compile(r"\\([_~.\-!$&'()*+,;=/?#@%])")
+
+
+class _TurtleParser:
+    """Parse the Turtle statements of a text one at a time."""
+
+    def __init__(self, text: str, base: str = "") -> None:
+        self.tokens = self._tokenize(text)
+        self.token = next(self.tokens, None)
+        self.base = base
+        self.prefixes = dict()  # type: Dict[str, str]
+        self.count = 0
+        self.triples = list()  # type: List[Triple]
+
+    @staticmethod
+    def _tokenize(text: str) -> Iterator[Tuple[str, str]]:
+        position = 0
+        for match in _TURTLE_TOKEN.finditer(text):
+            if match.start() != position:
+                break
+            position = match.end()
+            if match.lastgroup != "skip":
+                yield match.lastgroup, match.group(match.lastgroup)
+        if position != len(text):
+            raise SyntaxError("Invalid Turtle at offset {}: {!r}".format(
+                position, text[position:position + 20]))
+
+    def error(self, expected: str) -> SyntaxError:
+        return SyntaxError("Invalid Turtle, expected {} instead of {!r}".format(
+            expected, self.token[1] if self.token else "end of input"))
+
+    def next(self) -> Tuple[str, str]:
+        token = self.token
+        if token is None:
+            raise self.error("more input")
+        self.token = next(self.tokens, None)
+        return token
+
+    def accept(self, value: str) -> bool:
+        if self.token is not None and self.token[1] == value:
+            self.token = next(self.tokens, None)
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        if not self.accept(value):
+            raise self.error(repr(value))
+
+    def statements(self) -> Iterator[Triple]:
+        """Yield the triples of the text, statement by statement."""
+        while self.token is not None:
+            kind, value = self.token
+            if value in ("@prefix", "@base") or (kind == "keyword" and
+                                                 value.upper() in ("PREFIX", "BASE")):
+                self.next()
+                if value.lower().endswith("prefix"):
+                    kind, name = self.next()
+                    if kind != "pname" or not name.endswith(":"):
+                        raise self.error("a prefix name")
+                    self.prefixes[name[:-1]] = self.iri_ref()
+                else:
+                    self.base = self.iri_ref()
+                if value.startswith("@"):
+                    self.expect(".")
+                continue
+            if self.accept("["):
+                subject = self.blank_node_properties()
+                if self.token is not None and self.token[1] != ".":
+                    self.predicate_objects(subject)
+            else:
+                subject = self.subject()
+                self.predicate_objects(subject)
+            self.expect(".")
+            yield from self.triples
+            self.triples = []
+
+    def blank(self) -> str:
+        self.count += 1
+        return "_:g{}".format(self.count)
+
+    def iri_ref(self) -> str:
+        kind, value = self.next()
+        if kind != "iri":
+            raise self.error("an IRI")
+        return urljoin(self.base, _unescape(value)) if self.base else _unescape(value)
+
+    def resolve(self, kind: str, value: str) -> str:
+        if kind == "iri":
+            return urljoin(self.base, _unescape(value)) if self.base else _unescape(value)
+        if kind == "bnode":
+            # keep the labels of the text apart from the generated ones
+            return "_:b" + value[2:]
+        if kind == "pname":
+            prefix, _, local = value.partition(":")
+            if prefix not in self.prefixes:
+                raise SyntaxError("Undefined prefix {!r} in Turtle".format(prefix))
+            return self.prefixes[prefix] + _LOCAL_ESCAPE.sub(r"\1", local)
+        raise self.error("an IRI or a blank node")
+
+    def subject(self) -> str:
+        if self.accept("("):
+            return self.collection()
+        return self.resolve(*self.next())
+
+    def predicate_objects(self, subject: str) -> None:
+        while True:
+            kind, value = self.next()
+            predicate = rdf["type"] if (kind, value) == ("keyword", "a") \
+                else self.resolve(kind, value)
+            while True:
+                self.triples.append((subject, predicate, self.object()))
+                if not self.accept(","):
+                    break
+            if not self.accept(";"):
+                return
+            # a trailing ";" may end the list
+            while self.accept(";"):
+                pass
+            if self.token is None or self.token[1] in (".", "]"):
+                return
+
+    def blank_node_properties(self) -> str:
+        node = self.blank()
+        if not self.accept("]"):
+            self.predicate_objects(node)
+            self.expect("]")
+        return node
+
+    def collection(self) -> str:
+        items = []
+        while not self.accept(")"):
+            items.append(self.object())
+        head = rdf["namespace"] + "nil"
+        for item in reversed(items):
+            node = self.blank()
+            self.triples.append((node, rdf["namespace"] + "first", item))
+            self.triples.append((node, rdf["namespace"] + "rest", head))
+            head = node
+        return head
+
+    def object(self) -> Term:
+        kind, value = self.next()
+        if value == "[" and kind == "punct":
+            return self.blank_node_properties()
+        if value == "(" and kind == "punct":
+            return self.collection()
+        if kind in ("string", "long"):
+            quote = 3 if kind == "long" else 1
+            text = _unescape(value[quote:-quote])
+            if self.token is not None and self.token[0] == "at":
+                self.next()
+                return Literal(text, _LANG_STRING)
+            if self.accept("^^"):
+                kind, value = self.next()
+                return Literal(text, self.resolve(kind, value))
+            return Literal(text, xsdNamespace + "string")
+        if kind == "number":
+            if "e" in value.lower():
+                return Literal(value, xsdNamespace + "double")
+            return Literal(value, xsdNamespace + ("decimal" if "." in value else "integer"))
+        if kind == "keyword" and value in ("true", "false"):
+            return Literal(value, xsdNamespace + "boolean")
+        return self.resolve(kind, value)
+
+
+def parse_turtle(text: str, base: str = "") -> Iterator[Triple]:
+    """
+    Parse Turtle, statement by statement.
+
+    Prefixes, base, "a", predicate and object lists, blank node property lists,
+    collections and all the literal forms are supported. Language tags are dropped.
+
+    :param text: Turtle document
+    :param base: base IRI to resolve the relative IRIs against
+    :return: iterator of triples, in the format of iter_triples
+    :raise SyntaxError: on invalid or unsupported Turtle
+    """
+    return _TurtleParser(text, base).statements()
+
+
+# Nodes embedded in their parent when building an expanded doc, the other IRIs
+# are kept as references like in the expanded generated doc.
+_EMBEDDED = frozenset((hydra["supportedClass"], hydra["supportedProperty"], hydra["property"],
+                       hydra["supportedOperation"], hydra["possibleStatus"], hydra["manages"]))
+# Lists which are always present in a generated doc, even when empty.
+_EMPTY_LISTS = {
+    hydra["ApiDocumentation"]: (hydra["supportedClass"], hydra["possibleStatus"]),
+    hydra["supportedClass"]: (hydra["supportedProperty"], hydra["supportedOperation"]),
+}
+_NATIVE_TYPES = {xsdNamespace + "boolean": lambda value: value in ("true", "1"),
+                 xsdNamespace + "integer": int,
+                 xsdNamespace + "double": float}
+
+
+def _value(literal_: Literal) -> Dict[str, Any]:
+    """Get the expanded value object of a literal, native for booleans and numbers."""
+    datatype = literal_.datatype
+    if datatype in (xsdNamespace + "string", _LANG_STRING):
+        return {"@value": literal_.value}
+    native = _NATIVE_TYPES.get(datatype)
+    if native is not None:
+        try:
+            return {"@value": native(literal_.value)}
+        except ValueError:
+            pass
+    return {"@value": literal_.value, "@type": datatype}
+
+
+def triples_to_expanded(triples: Iterable[Triple]) -> List[Dict[str, Any]]:
+    """
+    Build the expanded JSON-LD API Documentations of triples, as jsonld.expand would.
+
+    The triples are grouped by subject in one pass, then the nodes are embedded in
+    their ApiDocumentation: classes, properties, operations, statuses and manages
+    blocks are embedded, the other IRIs are references.
+
+    :return: list of the hydra:ApiDocumentation nodes
+    :raise SyntaxError: if no subject is a hydra:ApiDocumentation
+    """
+    nodes = dict()  # type: Dict[str, Dict[str, Any]]
+    roots = []
+    for subject, predicate, object_ in triples:
+        node = nodes.get(subject)
+        if node is None:
+            node = nodes[subject] = {"@id": subject}
+        if predicate == rdf["type"]:
+            node.setdefault("@type", []).append(object_)
+            if object_ == hydra["ApiDocumentation"]:
+                roots.append(node)
+        elif isinstance(object_, Literal):
+            node.setdefault(predicate, []).append(_value(object_))
+        else:
+            node.setdefault(predicate, []).append({"@id": object_})
+    if not roots:
+        raise SyntaxError("No {} found in the triples".format(hydra["ApiDocumentation"]))
+
+    done = set()  # type: Set[str]
+    visiting = set()  # type: Set[str]
+
+    def embed(node: Dict[str, Any], defaults: Tuple[str, ...]) -> Dict[str, Any]:
+        visiting.add(node["@id"])
+        for key in defaults:
+            node.setdefault(key, [])
+        for predicate, values in node.items():
+            if predicate.startswith("@"):
+                continue
+            for i, value in enumerate(values):
+                target = value.get("@id")
+                child = nodes.get(target) if target is not None else None
+                # cycles stay references
+                if child is None or target in visiting or \
+                        not (predicate in _EMBEDDED or target.startswith("_:")):
+                    continue
+                if target not in done:
+                    embed(child, _EMPTY_LISTS.get(predicate, ()))
+                values[i] = child
+        visiting.discard(node["@id"])
+        done.add(node["@id"])
+        return node
+
+    expanded = [embed(root, _EMPTY_LISTS[hydra["ApiDocumentation"]]) for root in roots]
+    for node in nodes.values():
+        # blank node labels carry no meaning once embedded
+        if node["@id"].startswith("_:") and node["@id"] in done:
+            del node["@id"]
+    return expanded
@@ -0,0 +1,225 @@
+"""Registry of the HydraDocs of many tenant APIs, kept under a memory budget.
+
+The docs are built on first use, one per (server url, API name). The least
+recently used docs are evicted when the resident docs go over the budget and
+are pickled to a spill directory, so getting them again loads the snapshot
+instead of running create_doc. create_doc sets the global DocUrl.doc_url and
+IriPool, so the docs are built one at a time while the loads of snapshots and
+the hits of the other tenants go on.
+
+Example:
+    registry = DocRegistry(lambda url, name: create_doc(docs[name], url, name),
+                           budget=512 * 2 ** 20)
+    apidoc = registry.get(HYDRUS_SERVER_URL, API_NAME)
+"""
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hydra_python_core.doc_writer import HydraDoc
+
+Key = Tuple[str, str]
+
+
+def deep_sizeof(root: Any) -> int:
+    """Get the bytes of an object and of all the objects it references, each counted once."""
+    seen = set()
+    stack = [root]
+    size = 0
+    getsizeof = sys.getsizeof
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size += getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+    return size
+
+
+class TenantStats:
+    """Counters of the `get` calls of a tenant."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.loads = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "builds": self.builds,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "bytes": self.bytes,
+        }
+
+
+class DocRegistry:
+    """HydraDocs by (server url, API name), built on demand and evicted least recently used.
+
+    :param loader: function building the HydraDoc of (server url, API name)
+    :param budget: bytes of resident docs, measured by `sizeof`; the last used doc
+                   stays resident even when it is larger
+    :param spill_dir: directory of the snapshots of evicted docs, a temporary
+                      directory by default
+    :param sizeof: function measuring a HydraDoc, `deep_sizeof` by default
+    """
+
+    def __init__(self, loader: Callable[[str, str], HydraDoc], budget: int,
+                 spill_dir: str = None, sizeof: Callable[[Any], int]=deep_sizeof) -> None:
+        self.loader = loader
+        self.budget = budget
+        self.sizeof = sizeof
+        self.resident_bytes = 0
+        self._spill_dir = spill_dir
+        self._temporary = spill_dir is None
+        self._docs = OrderedDict()  # type: Dict[Key, Tuple[HydraDoc, int]]
+        self._spilled = dict()  # type: Dict[Key, str]
+        # evicted docs until their snapshot is written, taken back by `get` meanwhile
+        self._evicting = dict()  # type: Dict[Key, Tuple[HydraDoc, int]]
+        self._stats = dict()  # type: Dict[Key, TenantStats]
+        self._lock = threading.Lock()
+        # one build at a time, the loader sets globals of doc_writer
+        self._build_lock = threading.Lock()
+        # one build or load at a time per tenant
+        self._tenant_locks = dict()  # type: Dict[Key, threading.Lock]
+        # number of the tenant, naming its snapshot
+        self._numbers = dict()  # type: Dict[Key, int]
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _tenant(self, key: Key) -> Tuple[TenantStats, threading.Lock]:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = TenantStats()
+                self._tenant_locks[key] = threading.Lock()
+                self._numbers[key] = len(self._numbers)
+            return stats, self._tenant_locks[key]
+
+    def get(self, server_url: str, api_name: str) -> HydraDoc:
+        """Get the HydraDoc of a tenant, loading its snapshot or building it if needed."""
+        key = (server_url, api_name)
+        stats, tenant_lock = self._tenant(key)
+        with self._lock:
+            entry = self._resident(key)
+            if entry is not None:
+                stats.hits += 1
+                return entry[0]
+            stats.misses += 1
+        with tenant_lock:
+            with self._lock:
+                # built by another thread while this one waited
+                entry = self._resident(key)
+                if entry is not None:
+                    return entry[0]
+                path = self._spilled.get(key)
+            if path is not None:
+                with open(path, "rb") as f:
+                    apidoc = pickle.load(f)
+                stats.loads += 1
+                # the snapshot is the doc measured when it was built
+                size = stats.bytes
+            else:
+                with self._build_lock:
+                    apidoc = self.loader(server_url, api_name)
+                stats.builds += 1
+                size = self.sizeof(apidoc)
+            with self._lock:
+                self._docs[key] = (apidoc, size)
+                self.resident_bytes += size
+                stats.bytes = size
+                evicted = self._over_budget()
+        for evicted_key, evicted_doc in evicted:
+            self._spill(evicted_key, evicted_doc)
+        return apidoc
+
+    def _resident(self, key: Key) -> Optional[Tuple[HydraDoc, int]]:
+        """Get the entry of a resident doc, or of a doc being spilled, called with the lock held."""
+        entry = self._docs.get(key)
+        if entry is None:
+            entry = self._evicting.pop(key, None)
+            if entry is None:
+                return None
+            self._docs[key] = entry
+            self.resident_bytes += entry[1]
+        self._docs.move_to_end(key)
+        return entry
+
+    def _over_budget(self) -> List[Tuple[Key, HydraDoc]]:
+        """Remove the least recently used docs over the budget, called with the lock held."""
+        evicted = []
+        while self.resident_bytes > self.budget and len(self._docs) > 1:
+            key, (apidoc, size) = self._docs.popitem(last=False)
+            self._evicting[key] = (apidoc, size)
+            self.resident_bytes -= size
+            self._stats[key].evictions += 1
+            evicted.append((key, apidoc))
+        return evicted
+
+    def _spill(self, key: Key, apidoc: HydraDoc) -> None:
+        """Write the snapshot of an evicted doc, once per doc."""
+        with self._tenant_locks[key]:
+            path = self._spilled.get(key)
+            written = path is None
+            if written:
+                if self._spill_dir is None:
+                    self._spill_dir = tempfile.mkdtemp(prefix="hydra-docs-")
+                path = os.path.join(self._spill_dir, "{}.pickle".format(self._numbers[key]))
+                with open(path, "wb") as f:
+                    pickle.dump(apidoc, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                entry = self._evicting.get(key)
+                if entry is not None and entry[0] is apidoc:
+                    del self._evicting[key]
+                current = entry or self._docs.get(key)
+                # the doc may have been invalidated while it was written
+                if current is not None and current[0] is apidoc:
+                    self._spilled[key] = path
+                    written = False
+            if written:
+                os.remove(path)
+
+    def invalidate(self, server_url: str, api_name: str) -> None:
+        """Drop the resident doc and the snapshot of a tenant, it is built again on next use."""
+        key = (server_url, api_name)
+        with self._lock:
+            entry = self._docs.pop(key, None)
+            if entry is not None:
+                self.resident_bytes -= entry[1]
+            self._evicting.pop(key, None)
+            path = self._spilled.pop(key, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def stats(self) -> Dict[Key, Dict[str, int]]:
+        """Get the counters of every tenant, `bytes` being the size of its last built doc."""
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    def close(self) -> None:
+        """Remove the temporary spill directory."""
+        if self._temporary and self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+        self._spilled.clear()
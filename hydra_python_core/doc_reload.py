@@ -0,0 +1,262 @@
+"""Reloadable API Doc, rebuilt in the background when its file changes.
+
+The holder polls the modification time of the doc file. A changed file is
+built into a new HydraDoc aside, then swapped in with a single assignment, so
+a request which took `holder.current` keeps a complete doc until it is done.
+The representations cached for the classes of a version are carried over to
+the next one, except those of the classes changed by the reload.
+
+Example:
+    holder = DocHolder("api_doc.jsonld", HYDRUS_SERVER_URL, API_NAME)
+    holder.start()
+    version = holder.current  # the same doc for the whole request
+    context = version.representation(class_id, "context", lambda: build_context(...))
+
+A LiveDoc is changed at runtime the same way: a batch of changes is made to a
+copy of the current doc under a writer lock, then the copy is swapped in, so
+readers never wait and never see half of a batch.
+
+Example:
+    live = LiveDoc(apidoc)
+    with live.mutate() as apidoc:
+        apidoc.add_supported_class(class_)
+        apidoc.add_supported_collection(collection)
+    body = live.current.generated
+"""
+import json
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from hydra_python_core.doc_diff import DocDiff
+from hydra_python_core.doc_writer import DocUrl, DocUrlScope, HydraDoc
+
+Stat = Tuple[int, int]
+
+
+def load_doc(path: str, HYDRUS_SERVER_URL: str = None, API_NAME: str = None) -> HydraDoc:
+    """Create the HydraDoc of a JSON-LD API Documentation file, rebuilt directly if generated."""
+    from hydra_python_core.doc_maker import create_doc_from_generated
+    with open(path) as f:
+        doc = json.load(f)
+    return create_doc_from_generated(doc, HYDRUS_SERVER_URL, API_NAME)
+
+
+class DocVersion:
+    """A HydraDoc, its `generate()` output and the representations cached for it.
+
+    The cache is keyed by class id, or by the doc @id for the representations
+    of the whole doc, then by the name of the representation.
+    """
+
+    def __init__(self, apidoc: HydraDoc, number: int, stat: Optional[Stat], doc_url: str,
+                 cache: Dict[str, Dict[str, Any]]=None) -> None:
+        self.apidoc = apidoc
+        self.number = number
+        self.stat = stat
+        # DocUrl.doc_url of the doc, see DocUrlScope
+        self.doc_url = doc_url
+        self.generated = apidoc.generate()
+        self.cache = cache if cache is not None else dict()  # type: Dict[str, Dict[str, Any]]
+
+    def representation(self, key: str, name: str, build: Callable[[], Any]) -> Any:
+        """Get a cached representation of a class of this version, built on first use."""
+        representations = self.cache.get(key)
+        if representations is None:
+            representations = self.cache.setdefault(key, {})
+        if name not in representations:
+            representations.setdefault(name, build())
+        return representations[name]
+
+
+class DocHolder:
+    """Current version of a doc file, reloaded when the file changes.
+
+    :param path: path of the doc file
+    :param HYDRUS_SERVER_URL: url of the hydrus server
+    :param API_NAME: name of the api
+    :param interval: seconds between two checks of the file by `start`
+    :param loader: function building the HydraDoc of the file, `load_doc` by default
+    """
+
+    def __init__(self, path: str, HYDRUS_SERVER_URL: str = None, API_NAME: str = None,
+                 interval: float = 1.0,
+                 loader: Callable[[str, Optional[str], Optional[str]], HydraDoc]=None) -> None:
+        self.path = path
+        self.server_url = HYDRUS_SERVER_URL
+        self.api_name = API_NAME
+        self.interval = interval
+        self.loader = loader or load_doc
+        self.error = None  # type: Optional[Exception]
+        self._listeners = list()  # type: List[Callable[[DocVersion, DocVersion, DocDiff], None]]
+        self._lock = threading.Lock()
+        self._failed = None  # type: Optional[Stat]
+        self._stop = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+        stat = self._stat()
+        apidoc = self.loader(path, HYDRUS_SERVER_URL, API_NAME)
+        self.current = DocVersion(apidoc, 1, stat, DocUrl.doc_url)
+
+    @property
+    def apidoc(self) -> HydraDoc:
+        """Get the HydraDoc of the current version."""
+        return self.current.apidoc
+
+    def _stat(self) -> Stat:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def add_listener(self, listener: Callable[[DocVersion, DocVersion, DocDiff], None]) -> None:
+        """Call `listener(old, new, diff)` after every reload."""
+        self._listeners.append(listener)
+
+    def check(self) -> bool:
+        """Reload the doc if its file changed since the last load, return True if it did."""
+        stat = self._stat()
+        if stat == self.current.stat or stat == self._failed:
+            return False
+        return self.reload()
+
+    def reload(self) -> bool:
+        """
+        Build the doc of the file and swap it in.
+
+        :return: True once the new version is current
+        :raise Exception: The error of the loader, the current version is kept.
+        """
+        with self._lock:
+            stat = self._stat()
+            # the DocUrl.doc_url set by create_doc is the version's, not the process'
+            try:
+                with DocUrlScope() as scope:
+                    apidoc = self.loader(self.path, self.server_url, self.api_name)
+            except Exception:
+                self._failed = stat
+                raise
+            old = self.current
+            new = DocVersion(apidoc, old.number + 1, stat, scope.doc_url)
+            diff = DocDiff(old.generated, new.generated)
+            new.cache.update(self._kept(old, new, diff))
+            self.current = new
+            self._failed = None
+            self.error = None
+        for listener in self._listeners:
+            listener(old, new, diff)
+        return True
+
+    @staticmethod
+    def _kept(old: DocVersion, new: DocVersion, diff: DocDiff) -> Dict[str, Dict[str, Any]]:
+        """Get the cached representations still valid for the new version."""
+        if not diff.patch:
+            return old.cache
+        if any(not op["path"].startswith("/supportedClass/") for op in diff.patch):
+            # the context or the doc itself changed, every representation may depend on it
+            return {}
+        changed = diff.changed_classes()
+        classes = {class_["@id"] for class_ in new.generated["supportedClass"]}
+        return {key: representations for key, representations in old.cache.items()
+                if key in classes and key not in changed}
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as error:
+                self.error = error
+
+    def start(self) -> None:
+        """Check the file every `interval` seconds in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="DocHolder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the checks and wait for a running reload."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> 'DocHolder':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class LiveDoc:
+    """A HydraDoc changed at runtime, read through copy-on-write versions.
+
+    Readers take `current`, a DocVersion which is never changed once it is
+    current, so they don't wait for the writers nor for each other. The changes
+    are made in `mutate`, one batch at a time.
+
+    :param apidoc: the HydraDoc of the first version, not to be changed afterwards
+    """
+
+    def __init__(self, apidoc: HydraDoc) -> None:
+        self._listeners = list()  # type: List[Callable[[DocVersion, DocVersion, DocDiff], None]]
+        self._lock = threading.Lock()
+        doc_url = "{}/{}?resource=".format(urljoin(apidoc.base_url, apidoc.API), apidoc.doc_name)
+        self.current = DocVersion(apidoc, 1, None, doc_url)
+
+    @property
+    def apidoc(self) -> HydraDoc:
+        """Get the HydraDoc of the current version."""
+        return self.current.apidoc
+
+    def add_listener(self, listener: Callable[[DocVersion, DocVersion, DocDiff], None]) -> None:
+        """Call `listener(old, new, diff)` after every batch of changes."""
+        self._listeners.append(listener)
+
+    @contextmanager
+    def mutate(self, entrypoint: bool = True) -> Iterator[HydraDoc]:
+        """
+        Change a copy of the current doc, swapped in when the block is done.
+
+        The classes and collections added by the block are linked from the
+        EntryPoint, unless the block changed the EntryPoint itself. A block
+        which raises changes nothing.
+
+        :param entrypoint: link the classes and collections added from the EntryPoint
+        :return: the copy of the doc to change
+        """
+        with self._lock:
+            old = self.current
+            # the copy is made the way doc_registry spills docs, without its triple index
+            apidoc = pickle.loads(pickle.dumps(old.apidoc, pickle.HIGHEST_PROTOCOL))
+            links = [link.id_ for link in apidoc.entrypoint.entrypoint.supportedProperty]
+            # the templates made for the block take the doc's url, whatever the global one is
+            with DocUrlScope(old.doc_url):
+                yield apidoc
+                if entrypoint and links == [link.id_ for link in
+                                            apidoc.entrypoint.entrypoint.supportedProperty]:
+                    self._link(old.apidoc, apidoc)
+            if old.apidoc._triple_index is not None:
+                # the index of the new version is ready before readers get it
+                apidoc.triple_index()
+            new = DocVersion(apidoc, old.number + 1, None, old.doc_url)
+            diff = DocDiff(old.generated, new.generated)
+            new.cache.update(DocHolder._kept(old, new, diff))
+            self.current = new
+        for listener in self._listeners:
+            listener(old, new, diff)
+
+    @staticmethod
+    def _link(old: HydraDoc, new: HydraDoc) -> None:
+        """Add the classes and collections added to `new` to its EntryPoint, see gen_EntryPoint."""
+        for path, entry in new.parsed_classes.items():
+            if path not in old.parsed_classes and entry["class"].endpoint:
+                new.entrypoint.add_Class(entry["class"])
+        for path, entry in new.collections.items():
+            if path not in old.collections:
+                new.entrypoint.add_Collection(entry["collection"])
+        if new._triple_index is not None:
+            new._triple_index.sync_entrypoint()
@@ -0,0 +1,193 @@
+"""Compact Python classes for the instances of the classes of a HydraDoc.
+
+`resource_class` makes a class with one `__slots__` field per supported
+property of a HydraClass, so an instance takes a fraction of the memory of the
+dict of its JSON-LD. Its `__init__`, `to_jsonld` and `from_jsonld` are written
+for the properties of the class, the way dataclasses writes its methods:
+
+- a required property can't be missing,
+- a property which is not writeable can't be set once the instance is made,
+- a property which is not readable is left out of `to_jsonld`,
+- `from_jsonld` takes the keys of the class Context or the property IRIs, and
+  rejects the other keys; the expanded values and @type lists of jsonld.expand
+  are taken too.
+
+Example:
+    Book = resource_classes(apidoc)["Book"]
+    book = Book.from_jsonld(request.json)
+    response = book.to_jsonld()
+"""
+import keyword
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from hydra_python_core.doc_members import literal
+from hydra_python_core.doc_writer import Context, HydraClass, HydraDoc, HydraLink
+
+Field = Tuple[str, str, str, bool, bool, bool]
+
+
+class Resource(ABC):
+    """Base of the resource classes, see `resource_class`."""
+
+    __slots__ = ()
+    # attribute, context key, IRI, required, readable and writeable of each property
+    _fields = ()  # type: Tuple[Field, ...]
+    class_id = None  # type: Optional[str]
+    class_title = None  # type: Optional[str]
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, ", ".join(
+            "{}={!r}".format(name, getattr(self, name)) for name in self.__slots__))
+
+    @abstractmethod
+    def to_jsonld(self) -> Dict[str, Any]:
+        """Get the instance as compacted JSON-LD, written for each resource class."""
+
+    @classmethod
+    @abstractmethod
+    def from_jsonld(cls, data: Dict[str, Any]) -> 'Resource':
+        """Make an instance of its compacted or expanded JSON-LD, written for each class."""
+
+
+def _identifier(name: str, taken: List[str]) -> str:
+    """Get a Python attribute name for a property title, unique in `taken`."""
+    # the parser normalizes the names of the generated source with NFKC
+    name = unicodedata.normalize("NFKC", name)
+    name = "".join(c if ("_" + c).isidentifier() else "_" for c in name).lstrip("_")
+    if not name.isidentifier():
+        name = "f_" + name
+    if keyword.iskeyword(name):
+        name += "_"
+    identifier = name
+    i = 1
+    while identifier in taken:
+        identifier = "{}_{}".format(name, i)
+        i += 1
+    taken.append(identifier)
+    return identifier
+
+
+def _fields(class_: HydraClass) -> List[Field]:
+    taken = ["id_", "to_jsonld", "from_jsonld", "class_id", "class_title"]
+    fields = []
+    for prop in class_.supportedProperty:
+        iri = prop.prop.id_ if isinstance(prop.prop, HydraLink) else prop.prop
+        fields.append((_identifier(prop.title, taken), prop.title, iri, bool(prop.required),
+                       prop.read is not False, prop.write is not False))
+    return fields
+
+
+def _source(fields: List[Field], readonly: bool) -> str:
+    """Get the source of the methods of a resource class."""
+    names = ["id_"] + [field[0] for field in fields]
+    lines = ["def __init__(self, {}):".format(", ".join(name + "=None" for name in names))]
+    for name, key, _, required, _, _ in fields:
+        if required:
+            lines.append("    if {} is None:".format(name))
+            lines.append("        raise ValueError({!r})".format(
+                "Missing required property {!r}".format(key)))
+    if readonly:
+        # the slots are set through their descriptors, __setattr__ refuses the read-only ones
+        lines.extend("    _set_{}(self, {})".format(name, name) for name in names)
+    else:
+        lines.extend("    self.{} = {}".format(name, name) for name in names)
+
+    lines.append("def to_jsonld(self):")
+    lines.append("    data = {'@context': _context, '@type': _type}")
+    lines.append("    if self.id_ is not None:")
+    lines.append("        data['@id'] = self.id_")
+    for name, key, _, _, readable, _ in fields:
+        if readable:
+            lines.append("    value = self.{}".format(name))
+            lines.append("    if value is not None:")
+            lines.append("        data[{!r}] = value".format(key))
+    lines.append("    return data")
+
+    lines.append("def from_jsonld(cls, data):")
+    lines.append("    if not _keys.issuperset(data):")
+    lines.append("        raise ValueError('Unknown properties {}'.format(")
+    lines.append("            ', '.join(sorted(set(data) - _keys))))")
+    lines.append("    types = data.get('@type', _type)")
+    lines.append("    for type_ in (types if type(types) is list else (types,)):")
+    lines.append("        if type_ not in _types:")
+    lines.append("            raise ValueError('Not a {}: {}'.format(_type, type_))")
+    lines.append("    get = data.get")
+    lines.append("    v = get('@id')")
+    # expanded values are value objects in lists
+    lines.append("    if type(v) in _nested:")
+    lines.append("        v = _literal(v)")
+    values = ["v"]
+    for i, (name, key, iri, _, _, _) in enumerate(fields):
+        lines.append("    v{} = get({!r})".format(i, key))
+        if iri != key:
+            lines.append("    if v{} is None:".format(i))
+            lines.append("        v{} = get({!r})".format(i, iri))
+        lines.append("    if type(v{}) in _nested:".format(i))
+        lines.append("        v{} = _literal(v{})".format(i, i))
+        values.append("v{}".format(i))
+    lines.append("    return cls({})".format(", ".join(values)))
+    return "\n".join(lines)
+
+
+def _setattr(readonly: frozenset) -> Any:
+    def __setattr__(self: Resource, name: str, value: Any) -> None:
+        if name in readonly:
+            raise AttributeError("{!r} is not writeable".format(name))
+        object.__setattr__(self, name, value)
+    return __setattr__
+
+
+def resource_class(class_: HydraClass, context: Any = None) -> type:
+    """
+    Make the resource class of a HydraClass.
+
+    :param class_: the HydraClass
+    :param context: @context written by `to_jsonld`, the class Context by default;
+                    the URL of the served context can be given instead
+    :return: a subclass of Resource named after the class title
+    """
+    if context is None:
+        context = Context(class_.id_, class_=class_).generate()
+    fields = _fields(class_)
+    keys = {"@context", "@id", "@type"}
+    for _, key, iri, _, _, _ in fields:
+        keys.update((key, iri))
+    readonly = frozenset(field[0] for field in fields if not field[5])
+    namespace = {
+        "_context": context,
+        "_type": class_.title,
+        "_types": frozenset({class_.title, class_.id_}),
+        "_keys": frozenset(keys),
+        "_nested": (list, dict),
+        "_literal": literal,
+    }  # type: Dict[str, Any]
+    exec(_source(fields, bool(readonly)), namespace)
+    attributes = {
+        "__slots__": ("id_",) + tuple(field[0] for field in fields),
+        "__doc__": "Instance of {}.".format(class_.title),
+        "_fields": tuple(fields),
+        "class_id": class_.id_,
+        "class_title": class_.title,
+        "__init__": namespace["__init__"],
+        "to_jsonld": namespace["to_jsonld"],
+        "from_jsonld": classmethod(namespace["from_jsonld"]),
+    }
+    if readonly:
+        attributes["__setattr__"] = _setattr(readonly)
+    resource = type(_identifier(class_.title, []), (Resource,), attributes)
+    for name in resource.__slots__:
+        namespace["_set_" + name] = getattr(resource, name).__set__
+    return resource
+
+
+def resource_classes(apidoc: HydraDoc) -> Dict[str, type]:
+    """Make the resource classes of the classes of a HydraDoc, by class path."""
+    return {path: resource_class(entry["class"], entry["context"].generate())
+            for path, entry in apidoc.parsed_classes.items()}
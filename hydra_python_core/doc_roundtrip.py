@@ -0,0 +1,243 @@
+"""Rebuild a HydraDoc directly from its own `generate()` output.
+
+A doc written by `HydraDoc.generate()` has a fixed shape: the standard
+`Context`, compact keys and one known set of keys for every class, property,
+operation and status. Such a doc is rebuilt with the doc_writer templates
+without JSON-LD expansion, and is only accepted if the rebuilt doc generates
+the same output again. Any other doc is left to `create_doc`.
+
+This includes the docs written by an older doc_writer. An example is
+samples/doc_writer_sample_output.py, whose Context has no "xsd" entry.
+Hand-written docs such as samples/hydra_doc_sample.py, which has no
+"entrypoint", are also left to `create_doc`. Neither sample is rebuilt,
+because neither is exactly what `generate()` writes today.
+
+Example:
+    apidoc = rebuild_doc(json.load(f))
+    if apidoc is None:
+        apidoc = create_doc(doc)
+"""
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import unquote, urljoin
+
+from hydra_python_core.doc_writer import (HydraDoc, HydraClass, HydraClassProp, HydraClassOp,
+                                          HydraStatus, HydraError, HydraLink, HydraCollection,
+                                          DocUrl)
+from hydra_python_core.namespace import hydra
+
+_CLASS_KEYS = frozenset({"@id", "@type", "title", "description",
+                         "supportedProperty", "supportedOperation"})
+_CLASS_OPTIONAL = frozenset({"subClassOf"})
+_PROP_KEYS = frozenset({"@type", "title", "required", "readable", "writeable", "property"})
+_PROP_OPTIONAL = frozenset({"description", "range"})
+_LINK_KEYS = frozenset({"@id", "@type", "title", "description", "range", "domain",
+                        "supportedOperation"})
+_OP_KEYS = frozenset({"@type", "title", "method", "expects", "returns",
+                      "expectsHeader", "returnsHeader", "possibleStatus"})
+_STATUS_KEYS = frozenset({"@context", "@type", "statusCode", "title", "description"})
+_STATUS_OPTIONAL = frozenset({"@id"})
+_COLLECTION_KEYS = frozenset({"@id", "@type", "subClassOf", "title", "description",
+                              "supportedOperation", "supportedProperty", "manages"})
+_DOC_KEYS = frozenset({"@context", "@id", "@type", "title", "description", "entrypoint",
+                       "supportedClass", "possibleStatus"})
+_METHODS = frozenset({"GET", "PUT", "POST", "DELETE"})
+# ids of the operations of a HydraCollection, by the flag creating them
+_COLLECTION_OPS = (("get", "_:{}_retrieve"), ("put", "_:{}_create"),
+                   ("post", "_:{}_update"), ("delete", "_:{}_delete"))
+
+
+class _NotGenerated(Exception):
+    """Raised when a part of the doc does not have the shape of the `generate()` output."""
+
+
+def _check(item: Any, keys: FrozenSet[str],
+           optional: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+    """Get `item` if it is a dict with all the `keys` and no others than the `optional` ones."""
+    if not isinstance(item, dict):
+        raise _NotGenerated
+    if optional:
+        if not keys <= item.keys() <= keys | optional:
+            raise _NotGenerated
+    elif item.keys() != keys:
+        raise _NotGenerated
+    return item
+
+
+def _list(value: Any) -> List[Any]:
+    if not isinstance(value, list):
+        raise _NotGenerated
+    return value
+
+
+def _status(status: Any) -> HydraStatus:
+    _check(status, _STATUS_KEYS, _STATUS_OPTIONAL)
+    if status["@context"] != "https://www.w3.org/ns/hydra/core":
+        raise _NotGenerated
+    if status["@type"] == "Status":
+        type_ = HydraStatus
+    elif status["@type"] == "Error":
+        type_ = HydraError
+    else:
+        raise _NotGenerated
+    return type_(status["statusCode"], status.get("@id"), status["title"], status["description"])
+
+
+def _operation(op: Any) -> HydraClassOp:
+    _check(op, _OP_KEYS)
+    if op["method"] not in _METHODS:
+        raise _NotGenerated
+    return HydraClassOp(op["title"], op["method"], op["expects"], op["returns"],
+                        list(_list(op["expectsHeader"])), list(_list(op["returnsHeader"])),
+                        [_status(status) for status in _list(op["possibleStatus"])])
+
+
+def _link(link: Dict[str, Any]) -> HydraLink:
+    _check(link, _LINK_KEYS)
+    link_ = HydraLink(link["@id"], link["title"], link["description"],
+                      link["domain"], link["range"])
+    for op in _list(link["supportedOperation"]):
+        link_.add_supported_op(_operation(op))
+    return link_
+
+
+def _property(prop: Any) -> HydraClassProp:
+    _check(prop, _PROP_KEYS, _PROP_OPTIONAL)
+    if prop["@type"] != "SupportedProperty" or not isinstance(prop.get("description", ""), str):
+        raise _NotGenerated
+    property_ = prop["property"]
+    if isinstance(property_, dict):
+        property_ = _link(property_)
+    kwargs = {"range": prop["range"]} if "range" in prop else {}
+    return HydraClassProp(property_, prop["title"], prop["readable"], prop["writeable"],
+                          prop["required"], prop.get("description", ""), **kwargs)
+
+
+def _class(item: Dict[str, Any], path: Optional[str], endpoint: bool) -> HydraClass:
+    _check(item, _CLASS_KEYS, _CLASS_OPTIONAL)
+    parents = item.get("subClassOf")
+    class_ = HydraClass(item["title"], item["description"], path, endpoint,
+                        list(parents) if isinstance(parents, list) else parents, item["@id"])
+    for prop in _list(item["supportedProperty"]):
+        class_.add_supported_prop(_property(prop))
+    for op in _list(item["supportedOperation"]):
+        class_.add_supported_op(_operation(op))
+    return class_
+
+
+def _collection(collection: Dict[str, Any], path: Optional[str]) -> HydraCollection:
+    _check(collection, _COLLECTION_KEYS)
+    name = collection["title"]
+    if not isinstance(name, str) or not isinstance(collection["manages"], dict):
+        raise _NotGenerated
+    ops = {op.get("@id") for op in _list(collection["supportedOperation"])
+           if isinstance(op, dict)}
+    flags = {flag: id_.format(name) in ops for flag, id_ in _COLLECTION_OPS}
+    return HydraCollection(name, path, collection["description"],
+                           dict(collection["manages"]), **flags)
+
+
+def _urls(doc: Dict[str, Any], HYDRUS_SERVER_URL: Optional[str],
+          API_NAME: Optional[str]) -> Tuple[str, str, str, str]:
+    """Get the API name, entrypoint, base url and doc name of the HydraDoc of `doc`."""
+    doc_id = doc["@id"]
+    entrypoint = doc["entrypoint"]
+    if not isinstance(doc_id, str) or not isinstance(entrypoint, str) or "/" not in doc_id:
+        raise _NotGenerated
+    api_url, doc_name = doc_id.rsplit("/", 1)
+    if HYDRUS_SERVER_URL is not None and API_NAME is not None:
+        base_url, api = HYDRUS_SERVER_URL, API_NAME
+    elif HYDRUS_SERVER_URL is None and API_NAME is None:
+        base_url, api = api_url.rsplit("/", 1)
+        base_url += "/"
+    else:
+        raise _NotGenerated
+    if urljoin(base_url, api) != api_url or not entrypoint.startswith(base_url):
+        raise _NotGenerated
+    entrypoint_endpoint = entrypoint[len(base_url):]
+    if urljoin(base_url, entrypoint_endpoint) != entrypoint:
+        raise _NotGenerated
+    return api, entrypoint_endpoint, base_url, doc_name
+
+
+def _entrypoint_paths(entrypoint: Any, doc_url: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Get the paths of the endpoint classes and collections of the EntryPoint, by title."""
+    classes = dict()  # type: Dict[str, str]
+    collections = dict()  # type: Dict[str, str]
+    prefix = "{}EntryPoint/".format(doc_url)
+    for prop in _list(_check(entrypoint, _CLASS_KEYS)["supportedProperty"]):
+        link = prop.get("property") if isinstance(prop, dict) else None
+        if not isinstance(link, dict) or not isinstance(link.get("label"), str) \
+                or not isinstance(link.get("@id"), str) or not link["@id"].startswith(prefix):
+            raise _NotGenerated
+        path = link["@id"][len(prefix):]
+        if prop.get("hydra:description") == "The {} collection".format(link.get("label")):
+            collections[link["label"]] = unquote(path)
+        else:
+            classes[link["label"]] = path
+    return classes, collections
+
+
+def _rebuild(doc: Dict[str, Any], HYDRUS_SERVER_URL: Optional[str],
+             API_NAME: Optional[str]) -> HydraDoc:
+    _check(doc, _DOC_KEYS)
+    context = doc["@context"]
+    if doc["@type"] != "ApiDocumentation" or not isinstance(context, dict):
+        raise _NotGenerated
+    api, entrypoint_endpoint, base_url, doc_name = _urls(doc, HYDRUS_SERVER_URL, API_NAME)
+    apidoc = HydraDoc(api, doc["title"], doc["description"], entrypoint_endpoint, base_url,
+                      doc_name)
+    # the doc carries the standard context, and the entries added to it
+    if any(key not in context for key in apidoc.context.context):
+        raise _NotGenerated
+    for key, value in context.items():
+        if apidoc.context.context.get(key) != value:
+            apidoc.add_to_context(key, dict(value) if isinstance(value, dict) else value)
+
+    classes = _list(doc["supportedClass"])
+    if not classes or not isinstance(classes[-1], dict) \
+            or classes[-1].get("@id") != apidoc.entrypoint.entrypoint.id_:
+        raise _NotGenerated
+    entrypoint = classes[-1]
+    class_paths, collection_paths = _entrypoint_paths(entrypoint, DocUrl.doc_url)
+    for class_ in classes[:-1]:
+        if not isinstance(class_, dict) or not isinstance(class_.get("title"), str):
+            raise _NotGenerated
+        title = class_["title"]
+        if class_.get("@type") == "Collection":
+            apidoc.add_supported_collection(_collection(class_, collection_paths.get(title)))
+        elif class_.get("@id") == hydra["Resource"]:
+            apidoc.add_baseResource()
+        elif class_.get("@id") == hydra["Collection"]:
+            apidoc.add_baseCollection()
+        elif class_.get("@type") == "hydra:Class":
+            apidoc.add_supported_class(_class(class_, class_paths.get(title),
+                                              title in class_paths))
+        else:
+            raise _NotGenerated
+    for status in _list(doc["possibleStatus"]):
+        apidoc.add_possible_status(_status(status))
+    if entrypoint["supportedProperty"]:
+        apidoc.gen_EntryPoint()
+    return apidoc
+
+
+def rebuild_doc(doc: Dict[str, Any], HYDRUS_SERVER_URL: str = None,
+                API_NAME: str = None) -> Optional[HydraDoc]:
+    """
+    Rebuild the HydraDoc of the `generate()` output of a HydraDoc.
+
+    :param doc: dictionary of hydra api doc
+    :param HYDRUS_SERVER_URL: url of the hydrus server, with API_NAME or neither
+    :param API_NAME: name of the api
+    :return: the HydraDoc, whose `generate()` output is equal to `doc`, or None if
+             `doc` is not such an output of the current doc_writer, as the samples
+             written by hand or by older versions, or was written for another server url
+    """
+    try:
+        apidoc = _rebuild(doc, HYDRUS_SERVER_URL, API_NAME)
+    except _NotGenerated:
+        return None
+    # a doc of the same shape may still hold what the templates don't write back
+    if apidoc.generate() != doc:
+        return None
+    return apidoc
@@ -0,0 +1,248 @@
+"""Single pass structural validator for Hydra API Documentations.
+
+The validator walks the doc once, compacted or expanded, and collects every
+structural problem create_doc would stumble on instead of stopping at the first
+one. Errors are reported with a JSON path to the offending node.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Union
+from hydra_python_core.namespace import hydra, hydraNamespace, rdfsNamespace
+
+# canonical names of the keys the validator looks at, by namespace
+_HYDRA_KEYS = ("entrypoint", "supportedClass", "possibleStatus", "supportedProperty",
+               "supportedOperation", "property", "readable", "required", "writeable",
+               "method", "statusCode", "manages", "object", "title", "description")
+_RDFS_KEYS = ("domain", "range", "subClassOf")
+_TYPES = ("Link", "Collection", "Resource")
+
+# Every spelling of the known keys: full IRI, hydra:/rdfs: CURIE and the bare term
+# of the default hydra Context.
+_DEFAULT_KEYS = dict()  # type: Dict[str, str]
+for _name in _HYDRA_KEYS:
+    _DEFAULT_KEYS[hydraNamespace + _name] = _name
+    _DEFAULT_KEYS["hydra:" + _name] = _name
+    _DEFAULT_KEYS[_name] = _name
+for _name in _RDFS_KEYS:
+    _DEFAULT_KEYS[rdfsNamespace + _name] = _name
+    _DEFAULT_KEYS["rdfs:" + _name] = _name
+    _DEFAULT_KEYS[_name] = _name
+
+_DEFAULT_TYPES = dict()  # type: Dict[str, str]
+for _name in _TYPES:
+    _DEFAULT_TYPES[hydraNamespace + _name] = _name
+    _DEFAULT_TYPES["hydra:" + _name] = _name
+    _DEFAULT_TYPES[_name] = _name
+
+_KNOWN_IRIS = dict()  # type: Dict[str, str]
+_KNOWN_IRIS.update((iri, name) for iri, name in _DEFAULT_KEYS.items() if "://" in iri)
+_KNOWN_IRIS.update((iri, name) for iri, name in _DEFAULT_TYPES.items() if "://" in iri)
+
+_REQUIRED_PROP_KEYS = ("readable", "required", "writeable")
+_METHODS = frozenset(("GET", "PUT", "POST", "DELETE"))
+_NAMES = {name: "hydra:" + name for name in _HYDRA_KEYS + _TYPES}
+_NAMES.update((name, "rdfs:" + name) for name in _RDFS_KEYS)
+
+
+class _Validator:
+    """Walk a doc once and collect the errors."""
+
+    def __init__(self, context: Any) -> None:
+        self.keys = dict(_DEFAULT_KEYS)
+        self.types = dict(_DEFAULT_TYPES)
+        for context_ in (context if isinstance(context, list) else [context]):
+            if isinstance(context_, dict):
+                self._add_context_terms(context_)
+        self.errors = list()  # type: List[Dict[str, str]]
+
+    def _add_context_terms(self, context: Dict[str, Any]) -> None:
+        """Recognize the terms the doc's own context maps to known IRIs."""
+        for term, value in context.items():
+            iri = value.get("@id") if isinstance(value, dict) else value
+            if not isinstance(iri, str):
+                continue
+            prefix, sep, suffix = iri.partition(":")
+            if sep and isinstance(context.get(prefix), str):
+                iri = context[prefix] + suffix
+            name = _KNOWN_IRIS.get(iri)
+            if name is None:
+                continue
+            if name in _TYPES:
+                self.types[term] = name
+            else:
+                self.keys[term] = name
+
+    def error(self, path: str, message: str) -> None:
+        self.errors.append({"path": path, "message": message})
+
+    def fields(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Index the node by canonical key name, keeping the original key."""
+        fields = dict()
+        for key in node:
+            name = self.keys.get(key)
+            if name is not None:
+                fields[name] = key
+        return fields
+
+    def require(self, fields: Dict[str, str], path: str, names: Iterable[str]) -> None:
+        for name in names:
+            if name not in fields:
+                self.error(path, "missing {}".format(_NAMES[name]))
+
+    def type_names(self, node: Dict[str, Any]) -> List[str]:
+        types = node.get("@type", [])
+        if not isinstance(types, list):
+            types = [types]
+        return [self.types[type_] for type_ in types
+                if isinstance(type_, str) and type_ in self.types]
+
+    def validate_doc(self, doc: Dict[str, Any], path: str) -> None:
+        fields = self.fields(doc)
+        if "@id" not in doc:
+            self.error(path, "missing @id")
+        self.require(fields, path, ("entrypoint", "supportedClass", "possibleStatus"))
+        if "supportedClass" in fields:
+            key = fields["supportedClass"]
+            for i, class_ in _nodes(doc[key]):
+                self.validate_class(class_, _join(_join(path, key), i))
+        if "possibleStatus" in fields:
+            self.validate_statuses(doc, fields["possibleStatus"], path)
+
+    def validate_class(self, class_: Any, path: str) -> None:
+        if not isinstance(class_, dict):
+            self.error(path, "supportedClass must be an object")
+            return
+        fields = self.fields(class_)
+        class_id = class_.get("@id")
+        if class_id is None:
+            self.error(path, "missing @id")
+        types = self.type_names(class_)
+        if "manages" in fields:
+            self.validate_manages(class_[fields["manages"]], _join(path, fields["manages"]))
+        elif "Collection" in types and class_id not in (hydra["Collection"], "hydra:Collection"):
+            self.error(path, "collection is missing {}".format(_NAMES["manages"]))
+        self.require(fields, path, ("supportedProperty",))
+        # create_doc skips the base classes and the EntryPoint, they may omit operations
+        base_class = class_id in (hydra["Resource"], hydra["Collection"], "hydra:Resource",
+                                  "hydra:Collection") \
+            or (isinstance(class_id, str) and "EntryPoint" in class_id)
+        if not base_class:
+            self.require(fields, path, ("supportedOperation",))
+        if "supportedProperty" in fields:
+            key = fields["supportedProperty"]
+            for i, prop in _nodes(class_[key]):
+                self.validate_supported_property(prop, _join(_join(path, key), i), base_class)
+        if "supportedOperation" in fields:
+            self.validate_operations(class_, fields["supportedOperation"], path)
+
+    def validate_manages(self, manages: Any, path: str) -> None:
+        manages = _first(manages)
+        if not isinstance(manages, dict):
+            self.error(path, "manages must be an object")
+        elif "object" not in self.fields(manages):
+            self.error(path, "missing {}".format(_NAMES["object"]))
+
+    def validate_supported_property(self, prop: Any, path: str, base_class: bool) -> None:
+        if not isinstance(prop, dict):
+            self.error(path, "supportedProperty must be an object")
+            return
+        fields = self.fields(prop)
+        if base_class:
+            # their properties are written with "required": null, dropped by expansion
+            self.require(fields, path, ("property",))
+        else:
+            self.require(fields, path, ("property",) + _REQUIRED_PROP_KEYS)
+        if "property" in fields:
+            property_ = _first(prop[fields["property"]])
+            if isinstance(property_, dict) and "Link" in self.type_names(property_):
+                self.validate_link(property_, _join(path, fields["property"]))
+
+    def validate_link(self, link: Dict[str, Any], path: str) -> None:
+        fields = self.fields(link)
+        if "@id" not in link:
+            self.error(path, "missing @id")
+        self.require(fields, path, ("domain", "range"))
+        if "supportedOperation" in fields:
+            self.validate_operations(link, fields["supportedOperation"], path)
+
+    def validate_operations(self, node: Dict[str, Any], key: str, path: str) -> None:
+        path = _join(path, key)
+        for i, op in _nodes(node[key]):
+            op_path = _join(path, i)
+            if not isinstance(op, dict):
+                self.error(op_path, "supportedOperation must be an object")
+                continue
+            fields = self.fields(op)
+            self.require(fields, op_path, ("method",))
+            if "method" in fields:
+                method = _value(op[fields["method"]])
+                if method not in _METHODS:
+                    self.error(_join(op_path, fields["method"]),
+                               "unsupported method {!r}".format(method))
+            if "possibleStatus" in fields:
+                self.validate_statuses(op, fields["possibleStatus"], op_path)
+
+    def validate_statuses(self, node: Dict[str, Any], key: str, path: str) -> None:
+        path = _join(path, key)
+        for i, status in _nodes(node[key]):
+            status_path = _join(path, i)
+            if not isinstance(status, dict):
+                self.error(status_path, "possibleStatus must be an object")
+            elif "statusCode" not in self.fields(status):
+                self.error(status_path, "missing {}".format(_NAMES["statusCode"]))
+
+
+def _join(path: str, key: Union[str, int]) -> str:
+    """Append an object key or an array index to a JSON path."""
+    if isinstance(key, int):
+        return "{}[{}]".format(path, key)
+    if key.isidentifier():
+        return "{}.{}".format(path, key)
+    return "{}[{!r}]".format(path, key)
+
+
+def _nodes(value: Any) -> Iterable[Any]:
+    """Enumerate a value which may be a single node or a list of nodes."""
+    return enumerate(value if isinstance(value, list) else [value])
+
+
+def _first(value: Any) -> Any:
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _value(value: Any) -> Any:
+    """Get the scalar of a compacted value or of an expanded value object."""
+    value = _first(value)
+    if isinstance(value, dict):
+        return value.get("@value", value.get("@id"))
+    return value
+
+
+def validate_doc(doc: Union[Dict[str, Any], List[Dict[str, Any]]],
+                 context: Optional[Any] = None) -> List[Dict[str, str]]:
+    """
+    Validate the structure of a compacted or expanded API Documentation.
+
+    :param doc: dictionary of hydra api doc, or the list returned by jsonld.expand
+    :param context: context to resolve the terms with, defaults to the doc's @context
+    :return: list of errors as {"path": JSON path, "message": description},
+             empty when the doc is valid
+    """
+    if isinstance(doc, list):
+        validator = _Validator(context)
+        for i, item in enumerate(doc):
+            if isinstance(item, dict):
+                validator.validate_doc(item, "$[{}]".format(i))
+            else:
+                validator.error("$[{}]".format(i), "API Documentation must be an object")
+        return validator.errors
+
+    if context is None:
+        context = doc.get("@context")
+    validator = _Validator(context)
+    if "@context" not in doc and not any("://" in key for key in doc):
+        validator.error("$", "missing @context")
+    if "@type" not in doc:
+        validator.error("$", "missing @type")
+    validator.validate_doc(doc, "$")
+    return validator.errors
@@ -1,11 +1,17 @@
 """API Doc templates generator."""
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import quote, urljoin
+from hydra_python_core.doc_hierarchy import ClassHierarchy, class_parents
+from hydra_python_core.fingerprint import Fingerprinted
+from hydra_python_core.instrumentation import ContextStack, phase
+from hydra_python_core.namespace import NamespaceRegistry, hydra, rdf, rdfs
 
 
-class HydraDoc:
+class HydraDoc(Fingerprinted):
     """Class for an API Doc."""
 
+    _fingerprint_exclude = frozenset({"hierarchy"})
+
     def __init__(self, API: str, title: str, desc: str,
                  entrypoint: str, base_url: str, doc_name: str) -> None:
         """Initialize the APIDoc."""
@@ -19,10 +25,20 @@ class HydraDoc:
         self.collections = dict()  # type: Dict[str, Any]
         # type: List[Union[HydraStatus,HydraError]]
         self.possible_status = list()
-        self.entrypoint = HydraEntryPoint(base_url, entrypoint)
         self.desc = desc
         self.doc_name = doc_name
+        # set before the EntryPoint, whose context uses the url of the doc
         self.doc_url = DocUrl(self.base_url, self.API, self.doc_name)
+        self.entrypoint = HydraEntryPoint(base_url, entrypoint)
+        self._triple_index = None  # type: Any
+        self.hierarchy = ClassHierarchy()
+        self.hierarchy.add_class(self.entrypoint.entrypoint.id_)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the doc without its triple index, built again on first use."""
+        state = super().__getstate__()
+        state["_triple_index"] = None
+        return state
 
     def add_supported_class(
             self, class_: 'HydraClass') -> None:
@@ -34,10 +50,15 @@ class HydraDoc:
         """
         if not isinstance(class_, HydraClass):
             raise TypeError("Type is not <HydraClass>")
+        replaced = self.parsed_classes.get(class_.path)
         self.parsed_classes[class_.path] = {
             "context": Context(address="{}{}".format(self.base_url, self.API), class_=class_),
             "class": class_,
         }
+        self.invalidate()
+        self.hierarchy.add_class(class_.id_, class_parents(class_.parents))
+        if self._triple_index is not None:
+            self._triple_index.add_class(class_, replaced["class"] if replaced else None)
 
     def add_supported_collection(self, collection_: 'HydraCollection') -> None:
         """Add a supported Collection
@@ -50,9 +71,15 @@ class HydraDoc:
         if not isinstance(collection_, HydraCollection):
             raise TypeError("Type is not <HydraCollection>")
 
+        replaced = self.collections.get(collection_.path)
         self.collections[collection_.path] = {
             "context": Context(address="{}{}".format(self.base_url, self.API),
                                collection=collection_), "collection": collection_}
+        self.invalidate()
+        self.hierarchy.add_class(collection_.collection_id, [hydra["Collection"]])
+        if self._triple_index is not None:
+            self._triple_index.add_collection(
+                collection_, replaced["collection"] if replaced else None)
 
     def add_possible_status(self, status: Union['HydraStatus', 'HydraError']) -> None:
         """Add a new possibleStatus.
@@ -64,6 +91,9 @@ class HydraDoc:
         if not isinstance(status, HydraStatus):
             raise TypeError("Type is not <HydraStatus>")
         self.possible_status.append(status)
+        self.invalidate()
+        if self._triple_index is not None:
+            self._triple_index.add_status(status)
 
     def add_baseCollection(self) -> None:
         """Add Collection class to the API Doc."""
@@ -73,12 +103,20 @@ class HydraDoc:
             "http://www.w3.org/ns/hydra/core#member", "members", False, False, None)
         collection.add_supported_prop(member)
         self.other_classes.append(collection)
+        self.invalidate()
+        self.hierarchy.add_class(collection.id_, [hydra["Resource"]])
+        if self._triple_index is not None:
+            self._triple_index.add_class(collection)
 
     def add_baseResource(self) -> None:
         """Add Resource class to the API Doc."""
         resource = HydraClass(
             _id="http://www.w3.org/ns/hydra/core#Resource", title="Resource", desc=None)
         self.other_classes.append(resource)
+        self.invalidate()
+        self.hierarchy.add_class(resource.id_)
+        if self._triple_index is not None:
+            self._triple_index.add_class(resource)
 
     def add_to_context(
             self, key: str, value: Union[Dict[str, str], str]) -> None:
@@ -94,13 +132,31 @@ class HydraDoc:
         for collection in self.collections:
             self.entrypoint.add_Collection(
                 self.collections[collection]["collection"])
+        if self._triple_index is not None:
+            self._triple_index.sync_entrypoint()
 
-    def generate(self) -> Dict[str, Any]:
-        """Get the Hydra API Doc as a python dict."""
+    def generate(self, compact: bool = False) -> Dict[str, Any]:
+        """Get the Hydra API Doc as a python dict.
+
+        :param compact: compact every IRI of the doc to the shortest term or CURIE
+                        of its context, with a prefix added for the API vocabulary
+        """
         parsed_classes = [self.parsed_classes[key]["class"]
                           for key in self.parsed_classes]
         collections = [self.collections[key]["collection"]
                        for key in self.collections]
+        with phase("generate.supportedClass") as class_phase:
+            supported_classes = [x.generate() for x in parsed_classes + self.other_classes]
+            class_phase.add(len(supported_classes))
+        with phase("generate.collections") as collection_phase:
+            supported_classes.extend(x.generate() for x in collections)
+            collection_phase.add(len(collections))
+        with phase("generate.entrypoint") as entrypoint_phase:
+            supported_classes.append(self.entrypoint.generate())
+            entrypoint_phase.add()
+        with phase("generate.possibleStatus") as status_phase:
+            possible_status = [status.generate() for status in self.possible_status]
+            status_phase.add(len(possible_status))
         doc = {
             "@context": self.context.generate(),
             "@id": "{}/{}".format(urljoin(self.base_url, self.API), self.doc_name),
@@ -108,26 +164,117 @@ class HydraDoc:
             "title": self.title,
             "description": self.desc,
             "entrypoint": urljoin(self.base_url, self.entrypoint_endpoint),
-            "supportedClass": [
-                x.generate()
-                for x in parsed_classes + self.other_classes + collections + [self.entrypoint]
-            ],
-            "possibleStatus": [status.generate() for status in self.possible_status]
+            "supportedClass": supported_classes,
+            "possibleStatus": possible_status
         }
+        if compact:
+            with phase("generate.compact"):
+                doc = self._compact(doc)
+        return doc
+
+    def is_subclass(self, sub: str, sup: str) -> bool:
+        """Check if the class `sub` is `sup` or a direct or indirect subclass of it."""
+        return self.hierarchy.is_subclass(sub, sup)
+
+    def triple_index(self) -> Any:
+        """Get the DocIndex of the doc, built on first use and updated as the doc grows."""
+        if self._triple_index is None:
+            from hydra_python_core.doc_index import DocIndex
+            self._triple_index = DocIndex(self)
+        return self._triple_index
+
+    def iter_triples(self) -> Iterator[Tuple[str, str, Any]]:
+        """Iterate over the RDF triples of the Hydra API Doc, see `doc_rdf.iter_triples`."""
+        from hydra_python_core.doc_rdf import iter_triples
+        return iter_triples(self)
+
+    def _compact(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact the generated doc against its context and the vocabulary prefix."""
+        context = dict(doc["@context"])
+        if "vocab" not in context:
+            vocab = "{}/{}?resource=".format(urljoin(self.base_url, self.API), self.doc_name)
+            # "=" is not a gen-delim, the prefix has to be declared explicitly
+            context["vocab"] = {"@id": vocab, "@prefix": True}
+        registry = NamespaceRegistry.from_context(context)
+        doc = _compact_node(doc, registry)
+        doc["@context"] = context
         return doc
 
+    def check_integrity(self) -> Dict[str, Any]:
+        """Check that the references inside the vocabulary point to defined classes.
 
-class HydraClass():
+        The operations' expects and returns, the links' domain and range, the
+        properties' range and the collections' manages object are checked
+        against an index of the class and collection ids built once. IRIs
+        outside the vocabulary of the doc (hydra, xsd, schema.org...) are not
+        checked. CURIEs are expanded against the context of the doc first,
+        "vocab:" being the vocabulary when the context doesn't define it, as
+        in `generate(compact=True)`.
+
+        :return: {"valid": bool, "checked": number of references checked,
+                  "dangling": [{"source": id, "location": str, "reference": IRI}]}
+        """
+        vocab = "{}/{}?resource=".format(urljoin(self.base_url, self.API), self.doc_name)
+        classes = [self.parsed_classes[key]["class"] for key in self.parsed_classes]
+        collections = [self.collections[key]["collection"] for key in self.collections]
+        context = self.context.generate()
+        registry = NamespaceRegistry.from_context(context)
+        if "vocab" not in context:
+            registry.add_prefix("vocab", vocab)
+        expand = registry.expand
+        index = {expand(class_.id_) for class_ in classes + self.other_classes}
+        index.update(expand(collection.collection_id) for collection in collections)
+        index.add(expand(self.entrypoint.entrypoint.id_))
+        index.add("{}EntryPoint".format(vocab))
+        report = {"valid": True, "checked": 0, "dangling": []}  # type: Dict[str, Any]
+
+        def check(source: str, location: str, reference: Any) -> None:
+            if not isinstance(reference, str):
+                return
+            iri = expand(reference)
+            if not iri.startswith(vocab):
+                return
+            report["checked"] += 1
+            if iri not in index:
+                report["dangling"].append(
+                    {"source": source, "location": location, "reference": reference})
+
+        def check_ops(source: str, location: str, operations: List[Any]) -> None:
+            for i, op in enumerate(operations):
+                check(source, "{}supportedOperation[{}].expects".format(location, i), op.expects)
+                check(source, "{}supportedOperation[{}].returns".format(location, i), op.returns)
+
+        for class_ in classes + self.other_classes:
+            for i, prop in enumerate(class_.supportedProperty):
+                location = "supportedProperty[{}]".format(i)
+                if isinstance(prop, HydraClassProp):
+                    check(class_.id_, location + ".range", prop.kwargs.get("range"))
+                    if isinstance(prop.prop, HydraLink):
+                        check(class_.id_, location + ".property.domain", prop.prop.domain)
+                        check(class_.id_, location + ".property.range", prop.prop.range)
+                        check_ops(class_.id_, location + ".property.",
+                                  prop.prop.supportedOperation)
+            check_ops(class_.id_, "", class_.supportedOperation)
+        for collection in collections:
+            if isinstance(collection.manages, dict):
+                check(collection.collection_id, "manages.object",
+                      collection.manages.get("object"))
+            check_ops(collection.collection_id, "", collection.supportedOperation)
+        report["valid"] = not report["dangling"]
+        return report
+
+
+class HydraClass(Fingerprinted):
     """Template for a new class."""
 
     def __init__(
             self, title: str, desc: str, path: str = None,
             endpoint: bool = True, sub_classof: None = None, _id: str = None) -> None:
         """Initialize the Hydra_Class."""
-        self.id_ = _id if _id is not None else "{}{}".format(DocUrl.doc_url, title)
-        self.title = title
-        self.desc = desc
-        self.path = path if path else title
+        self.id_ = intern_iri(_id if _id is not None else "{}{}".format(DocUrl.doc_url, title))
+        self.title = intern_iri(title)
+        self.desc = intern_iri(desc)
+        self.path = intern_iri(path if path else title)
         self.parents = None
         self.endpoint = endpoint
         self.supportedProperty = list()  # type: List
@@ -148,6 +295,7 @@ class HydraClass():
                 prop, (HydraClassProp, EntryPointClass, EntryPointCollection)):
             raise TypeError("Type is not <HydraClassProp>")
         self.supportedProperty.append(prop)
+        self.invalidate()
 
     def add_supported_op(
             self, op: Union['EntryPointOp', 'HydraClassOp']) -> None:
@@ -160,6 +308,7 @@ class HydraClass():
         if not isinstance(op, (HydraClassOp, EntryPointOp)):
             raise TypeError("Type is not <HydraClassOp>")
         self.supportedOperation.append(op)
+        self.invalidate()
 
     def generate(self) -> Dict[str, Any]:
         """Get the Hydra class as a python dict."""
@@ -176,7 +325,7 @@ class HydraClass():
         return class_
 
 
-class HydraClassProp():
+class HydraClassProp(Fingerprinted):
     """Template for a new property."""
 
     def __init__(self,
@@ -188,13 +337,13 @@ class HydraClassProp():
                  desc: str = "",
                  **kwargs) -> None:
         """Initialize the Hydra_Prop."""
-        self.prop = prop
-        self.title = title
+        self.prop = intern_iri(prop)
+        self.title = intern_iri(title)
         self.read = read
         self.write = write
         self.required = required
-        self.desc = desc
-        self.kwargs = kwargs
+        self.desc = intern_iri(desc)
+        self.kwargs = {key: intern_iri(value) for key, value in kwargs.items()}
 
     def generate(self) -> Dict[str, Any]:
         """Get the Hydra prop as a python dict."""
@@ -216,7 +365,7 @@ class HydraClassProp():
         return prop
 
 
-class HydraClassOp():
+class HydraClassOp(Fingerprinted):
     """Template for a new supportedOperation."""
 
     def __init__(
@@ -230,10 +379,10 @@ class HydraClassOp():
         possible_status: List[Union['HydraStatus', 'HydraError']]=[],
     ) -> None:
         """Initialize the Hydra_Prop."""
-        self.title = title
-        self.method = method
-        self.expects = expects
-        self.returns = returns
+        self.title = intern_iri(title)
+        self.method = intern_iri(method)
+        self.expects = intern_iri(expects)
+        self.returns = intern_iri(returns)
         self.expects_header = expects_header
         self.returns_header = returns_header
         self.possible_status = possible_status
@@ -265,7 +414,7 @@ class HydraClassOp():
         return op
 
 
-class HydraCollection():
+class HydraCollection(Fingerprinted):
     """Class for Hydra Collection."""
 
     def __init__(
@@ -276,10 +425,11 @@ class HydraCollection():
             manages: Union[Dict[str, Any], List]=None,
             get: bool = True, post: bool = True, put: bool = True, delete: bool = True) -> None:
         """Generate Collection for related resources."""
-        self.collection_id = "{}{}".format(DocUrl.doc_url, quote(collection_name, safe=''))
-        self.name = collection_name
-        self.collection_description = collection_description
-        self.path = collection_path if collection_path else self.name
+        self.collection_id = intern_iri(
+            "{}{}".format(DocUrl.doc_url, quote(collection_name, safe='')))
+        self.name = intern_iri(collection_name)
+        self.collection_description = intern_iri(collection_description)
+        self.path = intern_iri(collection_path if collection_path else self.name)
         self.supportedOperation = list()  # type: List
         self.supportedProperty = [HydraClassProp(
             "http://www.w3.org/ns/hydra/core#member",
@@ -288,6 +438,9 @@ class HydraCollection():
             True,
             False,
             "The members of {}".format(collection_name))]
+        if isinstance(manages, dict) and IriPool.active is not None:
+            # the caller's dict is left as it is
+            manages = {key: intern_iri(value) for key, value in manages.items()}
         self.manages = manages
 
         if get:
@@ -359,12 +512,12 @@ class HydraCollectionOp(HydraClassOp):
                  possible_status: List[Union['HydraStatus', 'HydraError']]=[],
                  ) -> None:
         """Create method."""
-        self.id_ = id_
-        self.type_ = type_
-        self.method = method
-        self.desc = desc
-        self.expects = expects
-        self.returns = returns
+        self.id_ = intern_iri(id_)
+        self.type_ = intern_iri(type_)
+        self.method = intern_iri(method)
+        self.desc = intern_iri(desc)
+        self.expects = intern_iri(expects)
+        self.returns = intern_iri(returns)
         self.expects_header = expects_header
         self.returns_header = returns_header
         self.possible_status = possible_status
@@ -385,7 +538,7 @@ class HydraCollectionOp(HydraClassOp):
         return object_
 
 
-class HydraEntryPoint():
+class HydraEntryPoint(Fingerprinted):
     """Template for a new entrypoint."""
 
     def __init__(self, base_url: str, entrypoint: str) -> None:
@@ -447,12 +600,13 @@ class HydraEntryPoint():
             "@type": "EntryPoint",
 
         }
+        api_url = "{}{}".format(self.url, self.api)
         for item in self.entrypoint.supportedProperty:
             uri = item.id_
-            if item.generate() in self.collections:
+            entrypoint_url = "{}EntryPoint".format(item.doc_url)
+            if isinstance(item, EntryPointCollection):
                 collection_returned = item.generate()
-                collection_id = uri.replace(
-                    "{}EntryPoint".format(DocUrl.doc_url), "{}{}".format(self.url, self.api))
+                collection_id = uri.replace(entrypoint_url, api_url)
                 collection_to_append = {
                     "@id": collection_id,
                     'title': collection_returned['hydra:title'],
@@ -467,13 +621,12 @@ class HydraEntryPoint():
                     object_['collections'].append(collection_to_append)
 
             else:
-                object_[item.name] = uri.replace(
-                    "{}EntryPoint".format(DocUrl.doc_url), "{}{}".format(self.url, self.api))
+                object_[item.name] = uri.replace(entrypoint_url, api_url)
 
         return object_
 
 
-class EntryPointCollection():
+class EntryPointCollection(Fingerprinted):
     """Class for a Collection Entry to the EntryPoint object."""
 
     def __init__(self, collection: HydraCollection) -> None:
@@ -481,10 +634,14 @@ class EntryPointCollection():
         self.name = collection.name
         self.supportedOperation = collection.supportedOperation
         self.manages = collection.manages
+        # the links of the doc keep the url of their doc when another doc is built
+        self.doc_url = DocUrl.doc_url
         if collection.path:
-            self.id_ = "{}EntryPoint/{}".format(DocUrl.doc_url, quote(collection.path, safe=''))
+            self.id_ = intern_iri(
+                "{}EntryPoint/{}".format(DocUrl.doc_url, quote(collection.path, safe='')))
         else:
-            self.id_ = "{}EntryPoint/{}".format(DocUrl.doc_url, quote(self.name, safe=''))
+            self.id_ = intern_iri(
+                "{}EntryPoint/{}".format(DocUrl.doc_url, quote(self.name, safe='')))
 
     def generate(self) -> Dict[str, Any]:
         """Get as a python dict."""
@@ -494,8 +651,8 @@ class EntryPointCollection():
                 "@type": "hydra:Link",
                 "label": self.name,
                 "description": "The {} collection".format(self.name, ),
-                "domain": "{}EntryPoint".format(DocUrl.doc_url),
-                "range": "{}{}".format(DocUrl.doc_url, self.name),
+                "domain": "{}EntryPoint".format(self.doc_url),
+                "range": "{}{}".format(self.doc_url, self.name),
                 "manages": self.manages,
                 "supportedOperation": [],
             },
@@ -516,7 +673,7 @@ class EntryPointCollection():
         return object_
 
 
-class EntryPointClass():
+class EntryPointClass(Fingerprinted):
     """Class for a Operation Entry to the EntryPoint object."""
 
     def __init__(self, class_: HydraClass) -> None:
@@ -524,10 +681,11 @@ class EntryPointClass():
         self.name = class_.title
         self.desc = class_.desc
         self.supportedOperation = class_.supportedOperation
+        self.doc_url = DocUrl.doc_url
         if class_.path:
-            self.id_ = "{}EntryPoint/{}".format(DocUrl.doc_url, class_.path)
+            self.id_ = intern_iri("{}EntryPoint/{}".format(DocUrl.doc_url, class_.path))
         else:
-            self.id_ = "{}EntryPoint/{}".format(DocUrl.doc_url, self.name)
+            self.id_ = intern_iri("{}EntryPoint/{}".format(DocUrl.doc_url, self.name))
 
     def generate(self) -> Dict[str, Any]:
         """Get as Python Dict."""
@@ -537,8 +695,8 @@ class EntryPointClass():
                 "@type": "hydra:Link",
                 "label": self.name,
                 "description": self.desc,
-                "domain": "{}EntryPoint".format(DocUrl.doc_url),
-                "range": "{}{}".format(DocUrl.doc_url, self.name),
+                "domain": "{}EntryPoint".format(self.doc_url),
+                "range": "{}{}".format(self.doc_url, self.name),
                 "supportedOperation": []
             },
             "hydra:title": self.name.lower(),
@@ -557,7 +715,7 @@ class EntryPointClass():
         return object_
 
 
-class EntryPointOp():
+class EntryPointOp(Fingerprinted):
     """supportedOperation for EntryPoint."""
 
     def __init__(self,
@@ -573,11 +731,11 @@ class EntryPointOp():
                  label: str = "",
                  ) -> None:
         """Create method."""
-        self.id_ = id_
-        self.method = method
-        self.desc = desc
-        self.expects = expects
-        self.returns = returns
+        self.id_ = intern_iri(id_)
+        self.method = intern_iri(method)
+        self.desc = intern_iri(desc)
+        self.expects = intern_iri(expects)
+        self.returns = intern_iri(returns)
         self.expects_header = expects_header
         self.returns_header = returns_header
         self.possible_status = possible_status
@@ -615,7 +773,7 @@ class EntryPointOp():
         return prop
 
 
-class IriTemplateMapping():
+class IriTemplateMapping(Fingerprinted):
     """Class for hydra IriTemplateMapping"""
 
     def __init__(self,
@@ -637,7 +795,7 @@ class IriTemplateMapping():
         return iri_template_mapping
 
 
-class HydraIriTemplate():
+class HydraIriTemplate(Fingerprinted):
     """Class for hydra IriTemplates"""
 
     def __init__(self,
@@ -663,15 +821,15 @@ class HydraIriTemplate():
         return iri_template
 
 
-class HydraStatus():
+class HydraStatus(Fingerprinted):
     """Class for possibleStatus in Hydra Doc."""
 
     def __init__(self, code: int, id_: str = None, title: str = "", desc: str = "") -> None:
         """Create method."""
         self.code = code
-        self.id_ = id_
-        self.title = title
-        self.desc = desc
+        self.id_ = intern_iri(id_)
+        self.title = intern_iri(title)
+        self.desc = intern_iri(desc)
 
     def generate(self, status_type: str = "Status") -> Dict[str, Any]:
         """Get as Python dict."""
@@ -700,17 +858,17 @@ class HydraError(HydraStatus):
         return error
 
 
-class HydraLink():
+class HydraLink(Fingerprinted):
     """Template for a link property."""
     def __init__(
             self, id_: str, title: str = "",
             desc: str = "", domain: str = "", range_: str = "") -> None:
         """Initialize the Hydra_Link."""
-        self.id_ = id_ if "http" in id_ else "{}{}".format(DocUrl.doc_url, id_)
-        self.range = range_
-        self.title = title
-        self.desc = desc
-        self.domain = domain
+        self.id_ = intern_iri(id_ if "http" in id_ else "{}{}".format(DocUrl.doc_url, id_))
+        self.range = intern_iri(range_)
+        self.title = intern_iri(title)
+        self.desc = intern_iri(desc)
+        self.domain = intern_iri(domain)
         self.supportedOperation = list()  # type: List
 
     def add_supported_op(
@@ -724,6 +882,7 @@ class HydraLink():
         if not isinstance(op, (HydraClassOp, EntryPointOp)):
             raise TypeError("Type is not <HydraClassOp>")
         self.supportedOperation.append(op)
+        self.invalidate()
 
     def generate(self) -> Dict[str, Any]:
         """Get the Hydra link as a python dict."""
@@ -739,7 +898,7 @@ class HydraLink():
         return link
 
 
-class Context():
+class Context(Fingerprinted):
     """Class for JSON-LD context."""
 
     def __init__(self,
@@ -850,10 +1009,155 @@ class Context():
     def add(self, key: str, value: Union[Dict[str, str], str]) -> None:
         """Add entry to context."""
         self.context[key] = value
+        self.invalidate()
+
+
+_doc_url_scope = ContextStack("DocUrl.scope")
+
+
+class _DocUrlType(type):
+    """Metaclass of DocUrl, `DocUrl.doc_url` being the one of the active DocUrlScope if any."""
+
+    @property
+    def doc_url(cls) -> str:
+        scope = _doc_url_scope.top()
+        return cls._doc_url if scope is None else scope.doc_url
+
+    @doc_url.setter
+    def doc_url(cls, value: str) -> None:
+        scope = _doc_url_scope.top()
+        if scope is None:
+            cls._doc_url = value
+        else:
+            scope.doc_url = value
 
 
-class DocUrl:
-    doc_url = ''
+class DocUrl(metaclass=_DocUrlType):
+    _doc_url = ''
 
     def __init__(self, base_url: str, api_name: str, doc_name: str) -> None:
         DocUrl.doc_url = "{}/{}?resource=".format(urljoin(base_url, api_name), doc_name)
+
+    @property
+    def doc_url(self) -> str:
+        return DocUrl.doc_url
+
+
+class DocUrlScope:
+    """Keep the DocUrl.doc_url set in a block to the block.
+
+    In the block DocUrl.doc_url is the scope's own, for the thread or asyncio
+    task which entered it only, so a doc can be built or changed while the
+    other threads build the templates of another doc.
+
+    Example:
+        with DocUrlScope() as scope:
+            apidoc = create_doc(doc, HYDRUS_SERVER_URL, API_NAME)
+        doc_url = scope.doc_url
+    """
+
+    def __init__(self, doc_url: str = None) -> None:
+        """Initialize the scope.
+
+        :param doc_url: DocUrl.doc_url at the start of the block, the current one by default
+        """
+        self.doc_url = DocUrl.doc_url if doc_url is None else doc_url
+
+    def __enter__(self) -> 'DocUrlScope':
+        _doc_url_scope.push(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _doc_url_scope.pop()
+
+
+_active_pool = ContextStack("IriPool.active")
+
+
+class IriPool:
+    """Per-doc pool keeping a single copy of every IRI and repeated literal.
+
+    While a pool is active the doc_writer constructors store the pooled copy
+    of their string arguments, so the thousands of references to the same
+    class IRI, title or description of a large doc share one string object.
+
+    The active pool is kept in a ContextVar, so each thread and asyncio task
+    pools into its own.
+
+    Example:
+        with IriPool():
+            class_ = HydraClass(...)
+    """
+
+    active = _active_pool
+
+    def __init__(self) -> None:
+        self.strings = dict()  # type: Dict[str, str]
+        for namespace in (hydra, rdf, rdfs):
+            for iri in namespace.values():
+                self.strings[iri] = iri
+
+    def __enter__(self) -> 'IriPool':
+        _active_pool.push(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _active_pool.pop()
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, value: Any) -> Any:
+        """Get the pooled copy of `value` if it is a string."""
+        if not isinstance(value, str):
+            return value
+        return self.strings.setdefault(value, value)
+
+
+def _compact_node(node: Dict[str, Any], registry: NamespaceRegistry) -> Dict[str, Any]:
+    """Compact the keys and IRIs of a generated node, recursively."""
+    compacted = dict()
+    for key, value in node.items():
+        if key == "@context":
+            compacted[key] = value
+            continue
+        if key == "@id":
+            value = _compact_value(value, registry, False)
+        elif key == "@type":
+            value = _compact_value(value, registry, True)
+        elif registry.coercion(key) == "@id":
+            value = _compact_value(value, registry, False)
+        elif isinstance(value, (dict, list)):
+            value = _compact_value(value, registry, None)
+        compacted[registry.compact_key(key)] = value
+    return compacted
+
+
+def _compact_value(value: Any, registry: NamespaceRegistry, vocab: Optional[bool]) -> Any:
+    """
+    Compact an IRI value, a node or a list of them.
+
+    :param vocab: True for vocabulary relative IRIs, False for document relative
+                  IRIs, None for literals which are left as is
+    """
+    if isinstance(value, str):
+        if vocab is None:
+            return value
+        if ":" not in value:
+            # relative IRI or term, left as is
+            return value
+        return registry.compact(registry.expand(value, vocab), vocab)
+    if isinstance(value, dict):
+        # nodes with their own @context (statuses) are left as is
+        return value if "@context" in value else _compact_node(value, registry)
+    if isinstance(value, list):
+        return [_compact_value(x, registry, vocab) for x in value]
+    return value
+
+
+def intern_iri(value: Any) -> Any:
+    """Get the copy of `value` pooled by the active IriPool, if any."""
+    pool = _active_pool.top()
+    if pool is None or not isinstance(value, str):
+        return value
+    return pool.strings.setdefault(value, value)
@@ -0,0 +1,167 @@
+"""Content fingerprints of the doc_writer templates, cached as a Merkle tree.
+
+The fingerprint of a template hashes its own attributes and the fingerprints
+of the templates it holds, so it is computed once per template and a change
+only recomputes the templates between the changed one and the doc. Setting an
+attribute of a template, or adding to it with its `add_` methods, drops the
+cached fingerprints of the template and of the templates holding it.
+
+Lists and dicts of a template edited in place must be followed by
+`invalidate()`, the template can't see these changes.
+
+Example:
+    if request_etag == apidoc.etag():
+        ...  # 304 Not Modified
+"""
+import gc
+import hashlib
+import json
+import weakref
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple, Union
+
+# values written with their repr, the most frequent ones being tested first
+_SCALARS = frozenset({str, type(None), bool, int, float})
+# fingerprinted attribute names in sorted order, by template class and attribute names
+_orders = dict()  # type: Dict[type, Dict[Tuple[str, ...], Tuple[str, ...]]]
+# one encoder for all the dicts, json.dumps would build one per call
+_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+# Fingerprinted.__setattr__ is installed by the first fingerprint, see _watch
+_watching = False
+
+
+def _encode(value: Any, owner: 'Fingerprinted') -> str:
+    """Get a string standing for `value`, templates being replaced by their fingerprint."""
+    cls = value.__class__
+    if cls in _SCALARS:
+        return repr(value)
+    if cls is list or cls is tuple:
+        return "[{}]".format(",".join([repr(item) if item.__class__ in _SCALARS
+                                       else _encode(item, owner) for item in value]))
+    if isinstance(value, Fingerprinted):
+        fingerprint = value._fingerprint or value.fingerprint()
+        value._add_owner(owner)
+        return fingerprint
+    if isinstance(value, dict):
+        try:
+            # the dicts without templates, like the terms of a Context, are encoded in C
+            return _encoder.encode(value)
+        except TypeError:
+            pass
+        return "{{{}}}".format(",".join(sorted([repr(str(key)) + ":" + _encode(item, owner)
+                                                for key, item in value.items()])))
+    if isinstance(value, (list, tuple)):
+        return _encode(list(value), owner)
+    if isinstance(value, (str, int, float)):
+        return repr(value)
+    return "<{}>".format(type(value).__name__)
+
+
+def _watched_setattr(self: 'Fingerprinted', name: str, value: Any) -> None:
+    object.__setattr__(self, name, value)
+    if self._fingerprint is not None and name[0] != "_":
+        self.invalidate()
+
+
+def _watch() -> None:
+    """Watch the attributes of the templates, from the first fingerprint on.
+
+    Before it no fingerprint is cached and there is nothing to invalidate, so
+    the docs which are never fingerprinted are built at full speed.
+    """
+    global _watching
+    Fingerprinted.__setattr__ = _watched_setattr  # type: ignore
+    _watching = True
+
+
+class Fingerprinted:
+    """Mixin of the templates, with a cached fingerprint of their content.
+
+    Setting an attribute drops the cached fingerprints. A list or dict of the
+    template changed in place is not seen: call `invalidate()` after it.
+    """
+
+    _fingerprint = None  # type: Optional[str]
+    # templates holding this one, told when its fingerprint changes, not kept alive by it;
+    # a single reference until a second holder is added
+    _owners = None  # type: Optional[Union[weakref.ref, Set[weakref.ref]]]
+    # attributes derived from the others, left out of the fingerprint
+    _fingerprint_exclude = frozenset()  # type: FrozenSet[str]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_fingerprint", None)
+        state.pop("_owners", None)
+        return state
+
+    def _add_owner(self, owner: 'Fingerprinted') -> None:
+        owners = self._owners
+        # without a callback, the reference to an object is made once and shared
+        owner_ref = weakref.ref(owner)
+        if owners.__class__ is set:
+            owners.add(owner_ref)
+        elif owners is None or owners() is None:
+            object.__setattr__(self, "_owners", owner_ref)
+        elif owners is not owner_ref:
+            object.__setattr__(self, "_owners", {owners, owner_ref})
+
+    def fingerprint(self) -> str:
+        """Get the hex digest of the content of the template and of the templates it holds."""
+        fingerprint = self._fingerprint
+        if fingerprint is None:
+            if not _watching:
+                _watch()
+            if gc.isenabled():
+                # The fingerprints and owner references made for a whole doc all outlive
+                # the call, a collection would scan the doc for garbage there isn't.
+                gc.disable()
+                try:
+                    return self._digest()
+                finally:
+                    gc.enable()
+            return self._digest()
+        return fingerprint
+
+    def _digest(self) -> str:
+        """Compute and cache the fingerprint, the templates held reusing theirs."""
+        attributes = self.__dict__
+        names = tuple(attributes)
+        orders = _orders.get(self.__class__)
+        if orders is None:
+            orders = _orders.setdefault(self.__class__, {})
+        order = orders.get(names)
+        if order is None:
+            order = orders[names] = tuple(sorted(
+                name for name in names
+                if name[0] != "_" and name not in self._fingerprint_exclude))
+        parts = [type(self).__name__]
+        append = parts.append
+        for name in order:
+            value = attributes[name]
+            append(name)
+            append(repr(value) if value.__class__ in _SCALARS else _encode(value, self))
+        fingerprint = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+        object.__setattr__(self, "_fingerprint", fingerprint)
+        return fingerprint
+
+    def etag(self) -> str:
+        """Get the fingerprint as a strong HTTP ETag."""
+        return '"{}"'.format(self.fingerprint())
+
+    def invalidate(self) -> None:
+        """Drop the cached fingerprint of the template and of the templates holding it."""
+        stack = [self]
+        while stack:
+            template = stack.pop()
+            # the holders of a template without fingerprint have none either
+            if template is None or template._fingerprint is None:
+                continue
+            object.__setattr__(template, "_fingerprint", None)
+            owners = template._owners
+            if owners.__class__ is set:
+                # the references of the dead holders are dropped here
+                alive = [owner for owner in (owner_ref() for owner_ref in owners)
+                         if owner is not None]
+                object.__setattr__(template, "_owners", {weakref.ref(owner) for owner in alive})
+                stack.extend(alive)
+            elif owners is not None:
+                stack.append(owners())
@@ -0,0 +1,182 @@
+"""Validation of batches of instances against the supported properties of a HydraClass.
+
+A batch is checked for the whole of it at once rather than one instance at a
+time:
+
+- the rows are grouped by their set of keys, and each distinct set is checked
+  once with set operations for missing required properties, properties which
+  are not writeable and unknown properties,
+- the values of each property are checked against the property `range` as one
+  column; the columns of numpy arrays of numbers are checked by their dtype,
+  their NaN being missing values.
+
+Errors are returned by row index, so the valid rows of an import can go ahead.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from hydra_python_core.doc_members import column_type, literal
+from hydra_python_core.doc_writer import HydraClass, HydraLink
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+Errors = Dict[int, List[str]]
+
+# Python types and dtype kinds of the values of the typed ranges, by column_type
+_TYPES = {"q": (int,), "d": (int, float), "b": (bool,), "str": (str,)}
+_KINDS = {"q": "iu", "d": "iuf", "b": "b", "str": ""}
+_NAMES = {"q": "an integer", "d": "a number", "b": "a boolean", "str": "a string"}
+
+
+def _range_type(range_: Any) -> Any:
+    """Get the key of the type of a range in _TYPES, None if its values are not checked."""
+    typecode = column_type(range_)
+    if typecode != "s":
+        return typecode
+    if range_ in ("xsd:string", "http://www.w3.org/2001/XMLSchema#string"):
+        return "str"
+    return None
+
+
+class _Properties:
+    """The supported properties of a class, by context key and by IRI."""
+
+    def __init__(self, class_: HydraClass) -> None:
+        self.keys = {"@id": None, "@type": None, "@context": None}  # type: Dict[str, Any]
+        self.required = set()
+        self.readonly = set()
+        self.ranges = dict()  # type: Dict[str, Any]
+        for prop in class_.supportedProperty:
+            iri = prop.prop.id_ if isinstance(prop.prop, HydraLink) else prop.prop
+            self.keys[prop.title] = self.keys[iri] = prop.title
+            if prop.required:
+                self.required.add(prop.title)
+            if prop.write is False:
+                self.readonly.add(prop.title)
+            range_type = _range_type(prop.kwargs.get("range"))
+            if range_type is not None:
+                self.ranges[prop.title] = range_type
+        self.required = frozenset(self.required)
+        self.readonly = frozenset(self.readonly)
+
+    def check_keys(self, keys: Iterable[str], readonly: bool = True) -> List[str]:
+        """Get the errors of a set of keys, of the readonly properties unless told not to."""
+        known = {key for key in keys if key in self.keys}
+        titles = {self.keys[key] for key in known}
+        errors = ["unknown property {!r}".format(key) for key in sorted(set(keys) - known)]
+        errors.extend("missing required property {!r}".format(title)
+                      for title in sorted(self.required - titles))
+        if readonly:
+            errors.extend("{!r} is not writeable".format(title)
+                          for title in sorted(titles & self.readonly))
+        return errors
+
+
+def _add(errors: Errors, rows: Iterable[int], message: str) -> None:
+    for row in rows:
+        errors.setdefault(row, []).append(message)
+
+
+def _check_values(properties: _Properties, title: str, rows: Sequence[int],
+                  values: Sequence[Any], errors: Errors) -> None:
+    """Check the values of a property in the rows which have it."""
+    values = [literal(value) if isinstance(value, (list, dict)) else value for value in values]
+    range_type = properties.ranges.get(title)
+    missing = [row for row, value in zip(rows, values) if value is None]
+    if missing and title in properties.required:
+        _add(errors, missing, "missing required property {!r}".format(title))
+    if range_type is None:
+        return
+    allowed = _TYPES[range_type]
+    invalid = [row for row, value in zip(rows, values)
+               if value is not None and type(value) not in allowed]
+    _add(errors, invalid, "{!r} must be {}".format(title, _NAMES[range_type]))
+
+
+def validate_batch(class_: HydraClass, instances: Sequence[Mapping[str, Any]]) -> Errors:
+    """
+    Validate the compacted or expanded JSON-LD of instances to create or replace.
+
+    The expanded values are checked by the @value of their value objects.
+
+    :param class_: the HydraClass of the instances
+    :param instances: the instances, keyed by context keys or property IRIs
+    :return: the error messages of each invalid row, by row index in ascending order
+    """
+    properties = _Properties(class_)
+    errors = dict()  # type: Errors
+    shapes = dict()  # type: Dict[frozenset, List[int]]
+    for row, instance in enumerate(instances):
+        shapes.setdefault(frozenset(instance), []).append(row)
+
+    # rows of each property, the property being given by its key in those rows
+    columns = dict()  # type: Dict[str, List[Tuple[str, List[int]]]]
+    for keys, rows in shapes.items():
+        for message in properties.check_keys(keys):
+            _add(errors, rows, message)
+        for key in keys:
+            title = properties.keys.get(key)
+            if title is not None:
+                columns.setdefault(title, []).append((key, rows))
+
+    for title in sorted(columns):
+        keyed_rows = columns[title]
+        rows = [row for _, key_rows in keyed_rows for row in key_rows]
+        values = [instances[row][key] for key, key_rows in keyed_rows for row in key_rows]
+        _check_values(properties, title, rows, values, errors)
+    return {row: errors[row] for row in sorted(errors)}
+
+
+def validate_columns(class_: HydraClass, columns: Mapping[str, Sequence[Any]],
+                     size: int = None) -> Errors:
+    """
+    Validate instances given as columns, one per property with None for the missing values.
+
+    The numpy arrays of numbers are checked by their dtype, NaN being a missing value.
+
+    :param class_: the HydraClass of the instances
+    :param columns: values of each property, by context key or property IRI
+    :param size: number of instances, the length of the columns by default
+    :return: the error messages of each invalid row, by row index in ascending order
+    """
+    properties = _Properties(class_)
+    if size is None:
+        size = len(next(iter(columns.values()))) if columns else 0
+    errors = dict()  # type: Errors
+    # the keys are the shape of every row, the readonly properties being those with values
+    for message in properties.check_keys(columns, readonly=False):
+        _add(errors, range(size), message)
+
+    for key, values in columns.items():
+        title = properties.keys.get(key)
+        if title is None:
+            continue
+        if len(values) != size:
+            raise ValueError("Column {!r} has {} values, not {}".format(key, len(values), size))
+        if numpy is not None and isinstance(values, numpy.ndarray) and values.dtype.kind != "O":
+            _check_array(properties, title, values, errors)
+            continue
+        present = [row for row, value in enumerate(values) if value is not None]
+        if present and title in properties.readonly:
+            _add(errors, present, "{!r} is not writeable".format(title))
+        _check_values(properties, title, range(size), values, errors)
+    return {row: errors[row] for row in sorted(errors)}
+
+
+def _check_array(properties: _Properties, title: str, values: Any, errors: Errors) -> None:
+    """Check a numpy column of numbers with masks."""
+    if values.dtype.kind == "f":
+        present = ~numpy.isnan(values)
+    else:
+        present = numpy.ones(len(values), dtype=bool)
+    if title in properties.required:
+        _add(errors, numpy.flatnonzero(~present).tolist(),
+             "missing required property {!r}".format(title))
+    if title in properties.readonly:
+        _add(errors, numpy.flatnonzero(present).tolist(), "{!r} is not writeable".format(title))
+    range_type = properties.ranges.get(title)
+    if range_type is not None and values.dtype.kind not in _KINDS[range_type]:
+        _add(errors, numpy.flatnonzero(present).tolist(),
+             "{!r} must be {}".format(title, _NAMES[range_type]))
@@ -0,0 +1,159 @@
+"""Lightweight phase instrumentation for create_doc and HydraDoc.generate.
+
+Phases are only timed while an `Instrumentation` is active, otherwise `phase`
+hands back a shared no-op context manager. The active recorder is kept in a
+ContextVar, so each thread and asyncio task records into its own (each thread
+on Python 3.6, which has no contextvars).
+
+Example:
+    with Instrumentation() as instrumentation:
+        apidoc = create_doc(doc, HYDRUS_SERVER_URL, API_NAME)
+        apidoc.generate()
+    metrics = instrumentation.as_dict()
+"""
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover
+    # Python 3.6, one value per thread
+    class ContextVar:  # type: ignore
+        """The get and set of a ContextVar, over a threading.local."""
+
+        def __init__(self, name: str, default: Any = None) -> None:
+            self.name = name
+            self._default = default
+            self._local = threading.local()
+
+        def get(self) -> Any:
+            return getattr(self._local, "value", self._default)
+
+        def set(self, value: Any) -> None:
+            self._local.value = value
+
+PhaseHook = Callable[[str, float, int], None]
+
+
+class ContextStack:
+    """Stack of the objects made active by `with` blocks, one per thread and asyncio task.
+
+    As a class attribute it reads as the object on top of the stack, None when empty.
+    A block pops the object it pushed even if other threads use the same object.
+    """
+
+    def __init__(self, name: str) -> None:
+        # the top of the stack and the node below it
+        self._var = ContextVar(name, default=None)  # type: ContextVar[Any]
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        return self.top()
+
+    def top(self) -> Any:
+        node = self._var.get()
+        return None if node is None else node[0]
+
+    def push(self, value: Any) -> None:
+        self._var.set((value, self._var.get()))
+
+    def pop(self) -> None:
+        node = self._var.get()
+        self._var.set(None if node is None else node[1])
+
+
+_active = ContextStack("Instrumentation.active")
+
+
+class Instrumentation:
+    """Record wall time, call counts and object counts per phase.
+
+    Only the phases of the thread or asyncio task which entered the recorder are
+    recorded.
+    """
+
+    active = _active
+
+    def __init__(self, hook: Optional[PhaseHook] = None) -> None:
+        """Initialize the recorder.
+
+        :param hook: optional callable called as hook(phase, seconds, objects)
+                     every time a phase finishes
+        """
+        self.hook = hook
+        self.phases = dict()  # type: Dict[str, Dict[str, Any]]
+
+    def __enter__(self) -> 'Instrumentation':
+        _active.push(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _active.pop()
+
+    def record(self, name: str, seconds: float, objects: int = 0) -> None:
+        """Add one finished call of the phase `name`."""
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = {"calls": 0, "seconds": 0.0, "objects": 0}
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["objects"] += objects
+        if self.hook is not None:
+            self.hook(name, seconds, objects)
+
+    def reset(self) -> None:
+        """Drop all the recorded phases."""
+        self.phases.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Get the recorded phases as a python dict."""
+        return {name: dict(stats) for name, stats in self.phases.items()}
+
+
+class _Phase:
+    """Context manager timing a single phase call."""
+
+    __slots__ = ("instrumentation", "name", "objects", "start")
+
+    def __init__(self, instrumentation: Instrumentation, name: str) -> None:
+        self.instrumentation = instrumentation
+        self.name = name
+        self.objects = 0
+        self.start = 0.0
+
+    def __enter__(self) -> '_Phase':
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.instrumentation.record(self.name, perf_counter() - self.start, self.objects)
+
+    def add(self, count: int = 1) -> None:
+        """Count objects produced by the phase."""
+        self.objects += count
+
+
+class _NullPhase:
+    """Shared no-op phase used when instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullPhase':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def add(self, count: int = 1) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name: str) -> Any:
+    """Time the phase `name` on the active Instrumentation, if any."""
+    instrumentation = _active.top()
+    if instrumentation is None:
+        return _NULL_PHASE
+    return _Phase(instrumentation, name)
@@ -1,6 +1,7 @@
 """
 Namespace for hydra vocabulary
 """
+from typing import Any, Dict, Optional, Tuple
 
 hydraNamespace = "http://www.w3.org/ns/hydra/core#"
 
@@ -86,5 +87,152 @@ rdfs = {
     "comment": rdfsNamespace + "comment",
     "domain": rdfsNamespace + "domain",
     "label": rdfsNamespace + "label",
-    "range": rdfsNamespace + "range"
+    "range": rdfsNamespace + "range",
+    "subClassOf": rdfsNamespace + "subClassOf"
 }
+
+# IRIs ending with one of these characters can be used as prefixes (JSON-LD 1.1)
+_GEN_DELIMS = frozenset(":/?#[]@")
+
+
+class PrefixTrie:
+    """Character trie finding the longest registered prefix of an IRI in O(len(IRI))."""
+
+    def __init__(self) -> None:
+        self.root = dict()  # type: Dict[str, Any]
+
+    def add(self, prefix: str, value: Any) -> None:
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[""] = value
+
+    def longest_prefix(self, iri: str) -> Tuple[int, Any]:
+        """Get (length, value) of the longest prefix of `iri`, (0, None) if none matches."""
+        node = self.root
+        match = (0, None)
+        for i, char in enumerate(iri):
+            node = node.get(char)
+            if node is None:
+                break
+            if "" in node:
+                match = (i + 1, node[""])
+        return match
+
+
+class NamespaceRegistry:
+    """Compact and expand IRIs against the terms and prefixes of a JSON-LD context."""
+
+    def __init__(self) -> None:
+        self.prefixes = dict()  # type: Dict[str, str]
+        self.terms = dict()  # type: Dict[str, Tuple[str, Optional[str]]]
+        self.trie = PrefixTrie()
+        # IRI -> shortest term, any coercion and per coercion
+        self._type_terms = dict()  # type: Dict[str, str]
+        self._key_terms = dict()  # type: Dict[Tuple[str, Optional[str]], str]
+        # a doc repeats the same keys and IRIs, their compacted forms are cached
+        self._cache = dict()  # type: Dict[Tuple[str, Optional[bool]], str]
+
+    @classmethod
+    def from_context(cls, context: Dict[str, Any]) -> 'NamespaceRegistry':
+        """Build the registry of a context, the values of `Context.generate()`."""
+        registry = cls()
+        definitions = []
+        for term, definition in context.items():
+            if term.startswith("@"):
+                continue
+            if isinstance(definition, str):
+                definitions.append((term, definition, None, None))
+            elif isinstance(definition, dict) and isinstance(definition.get("@id"), str):
+                definitions.append((term, definition["@id"], definition.get("@type"),
+                                    definition.get("@prefix")))
+        # prefixes first, the terms may be CURIEs using them
+        for term, iri, coercion, prefix in definitions:
+            if ":" in term or "://" not in iri:
+                continue
+            if prefix or (prefix is None and coercion is None and iri[-1] in _GEN_DELIMS):
+                registry.add_prefix(term, iri)
+        for term, iri, coercion, _ in definitions:
+            registry.add_term(term, registry.expand(iri), coercion)
+        return registry
+
+    def add_prefix(self, prefix: str, iri: str) -> None:
+        """Register `prefix` for CURIEs of the namespace `iri`."""
+        self.prefixes[prefix] = iri
+        self._cache.clear()
+        current = self.trie.longest_prefix(iri)
+        # keep the shortest prefix name of a namespace
+        if current[0] != len(iri) or len(prefix) < len(current[1]):
+            self.trie.add(iri, prefix)
+
+    def add_term(self, term: str, iri: str, coercion: Optional[str] = None) -> None:
+        """Register `term` for `iri`, with the @type coercion of its definition."""
+        self.terms[term] = (iri, coercion)
+        self._cache.clear()
+        if len(term) < len(self._type_terms.get(iri, term + " ")):
+            self._type_terms[iri] = term
+        if len(term) < len(self._key_terms.get((iri, coercion), term + " ")):
+            self._key_terms[(iri, coercion)] = term
+
+    def expand(self, value: str, vocab: bool = False) -> str:
+        """
+        Expand a term or a CURIE to an IRI.
+
+        :param vocab: True for vocabulary relative values (keys and @type) where terms apply
+        """
+        if vocab and value in self.terms:
+            return self.terms[value][0]
+        prefix, sep, suffix = value.partition(":")
+        if sep and not suffix.startswith("//") and prefix in self.prefixes:
+            return self.prefixes[prefix] + suffix
+        return value
+
+    def curie(self, iri: str) -> str:
+        """Get the shortest CURIE of `iri`, the IRI itself if no prefix matches."""
+        length, prefix = self.trie.longest_prefix(iri)
+        if prefix is None or length == len(iri):
+            return iri
+        suffix = iri[length:]
+        curie = "{}:{}".format(prefix, suffix)
+        # a CURIE looking like an absolute IRI or shadowed by a term would not expand back
+        if suffix.startswith("//") or curie in self.terms:
+            return iri
+        return curie
+
+    def compact(self, iri: str, vocab: bool = False) -> str:
+        """
+        Compact an IRI to the shortest term or CURIE.
+
+        :param vocab: True for vocabulary relative values (@type) where terms apply
+        """
+        cached = self._cache.get((iri, vocab))
+        if cached is None:
+            cached = self._type_terms.get(iri) if vocab else None
+            if cached is None:
+                cached = self.curie(iri)
+            self._cache[(iri, vocab)] = cached
+        return cached
+
+    def compact_key(self, key: str) -> str:
+        """Compact a key to the shortest term with the same coercion, or a CURIE."""
+        cached = self._cache.get((key, None))
+        if cached is None:
+            cached = self._cache[(key, None)] = self._compact_key(key)
+        return cached
+
+    def _compact_key(self, key: str) -> str:
+        if key.startswith("@"):
+            return key
+        iri, coercion = self.terms.get(key, (None, None))
+        if iri is None:
+            iri = self.expand(key)
+        term = self._key_terms.get((iri, coercion))
+        if term is not None:
+            return term
+        if coercion is None and "://" in iri:
+            return self.curie(iri)
+        return key
+
+    def coercion(self, key: str) -> Optional[str]:
+        """Get the @type coercion of the term `key`."""
+        return self.terms.get(key, (None, None))[1]
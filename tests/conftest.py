@@ -1,9 +1,11 @@
+import copy
 import pytest
 from hydra_python_core.doc_writer import HydraClass
 from hydra_python_core.doc_writer import HydraEntryPoint
 from hydra_python_core.doc_writer import HydraCollection
 from hydra_python_core.doc_writer import Context
 from samples import doc_writer_sample_output
+from benchmarks.synthetic_doc import strip_remote_contexts
 
 @pytest.fixture(name="get_hydra_class")
 def get_hydra_class():
@@ -46,4 +48,10 @@ def get_context():
 @pytest.fixture(name="get_doc")
 def get_doc():
     doc = doc_writer_sample_output.doc
-    return doc
\ No newline at end of file
+    return doc
+
+
+@pytest.fixture(name="get_offline_doc")
+def get_offline_doc():
+    doc = copy.deepcopy(doc_writer_sample_output.doc)
+    return strip_remote_contexts(doc)
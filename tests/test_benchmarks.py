@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from hydra_python_core import doc_maker
+from benchmarks import import_time, run
+from benchmarks.synthetic_doc import make_doc
+
+
+class TestSyntheticDoc:
+
+    def test_make_doc_sizes(self):
+        doc = make_doc(20, properties=3, links=2, operations=4, collections=5, statuses=2)
+        classes = [class_ for class_ in doc["supportedClass"] if "manages" not in class_]
+        collections = [class_ for class_ in doc["supportedClass"] if "manages" in class_]
+        # 20 classes, Resource, Collection and the EntryPoint
+        assert len(classes) == 23
+        assert len(collections) == 5
+        assert len(doc["possibleStatus"]) == 2
+        assert "https://www.w3.org/ns/hydra/core" not in json.dumps(doc)
+        with pytest.raises(ValueError):
+            make_doc(0)
+
+    def test_create_doc_on_synthetic_doc(self):
+        doc = make_doc(20, collections=4)
+        apidoc = doc_maker.create_doc(doc, "http://hydrus.com/", "api")
+        assert len(apidoc.parsed_classes) == 20
+        assert len(apidoc.collections) == 4
+
+    def test_run_cli(self, tmpdir):
+        output = tmpdir.join("results.json")
+        run.main(["--sizes", "2", "4", "--repeat", "1", "--output", str(output)])
+        results = json.loads(output.read())
+        assert [result["classes"] for result in results["results"]] == [2, 4]
+        for result in results["results"]:
+            assert set(result["seconds"]) == {"create_doc", "generate",
+                                              "entrypoint_get", "json_dumps"}
+
+
+class TestImportTime:
+
+    def test_parse_importtime(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   json.decoder\n"
+                  "import time:       300 |        420 | json\n")
+        assert import_time.parse_importtime(stderr) == {"json.decoder": (120, 120),
+                                                        "json": (300, 420)}
+
+    def test_deferred_imports(self):
+        result = import_time.bench_module("hydra_python_core.doc_maker", repeat=1,
+                                          budget_ms=import_time.BUDGET_MS * 5)
+        assert result["deferred_imported"] == []
+        assert result["within_budget"]
+
+    def test_scoped_document_loader(self):
+        from pyld import jsonld
+        loader = jsonld.get_document_loader()
+        doc_maker.create_doc(make_doc(2), "http://hydrus.com/", "api")
+        assert jsonld.get_document_loader() is loader
@@ -0,0 +1,69 @@
+"""Check that public operations scale near-linearly.
+
+Every operation runs at doubling input sizes and the growth exponent is fitted
+in log-log space, so no absolute timing threshold is needed. The check fails
+when an operation grows faster than n log n plus `TOLERANCE`; quadratic code
+paths show an exponent close to 2. The docs have light classes so that
+per-class work does not hide the cross-class costs.
+"""
+import json
+import os
+
+import pytest
+from pyld import jsonld
+
+from hydra_python_core import doc_maker
+from hydra_python_core.instrumentation import Instrumentation
+from benchmarks.complexity import growth_exponent, nlogn_exponent, time_sizes
+from benchmarks.synthetic_doc import build_doc, make_doc
+
+SIZES = [500, 1000, 2000, 4000]
+CREATE_DOC_SIZES = [200, 400, 800, 1600]
+TOLERANCE = float(os.environ.get("HYDRA_COMPLEXITY_TOLERANCE", "0.2"))
+
+
+def assert_near_linear(sizes, timings):
+    exponent = growth_exponent(sizes, timings)
+    threshold = nlogn_exponent(sizes) + TOLERANCE
+    assert exponent < threshold, \
+        "grows as n^{:.2f} (threshold n^{:.2f}), timings {}".format(exponent, threshold, timings)
+
+
+def light_doc(size):
+    return build_doc(size, properties=0, links=1, operations=1, statuses=0)
+
+
+class TestComplexity:
+
+    def test_create_doc(self, monkeypatch):
+        # The expansion is pyld's work, it is replaced by a copy of a cached result
+        # and only the create_doc phases which run after it are timed.
+        docs, expanded = [], {}
+        for size in CREATE_DOC_SIZES:
+            doc = make_doc(size, properties=0, operations=0, statuses=0,
+                           api_name="api{}".format(size))
+            expanded[doc["@id"]] = json.dumps(jsonld.expand(doc))
+            docs.append(doc)
+        monkeypatch.setattr(doc_maker.jsonld, "expand",
+                            lambda doc, options=None: json.loads(expanded[doc["@id"]]))
+        timings = []
+        for doc in docs:
+            best = float("inf")
+            for _ in range(3):
+                with Instrumentation() as instrumentation:
+                    doc_maker.create_doc(doc, "http://hydrus.com/", "api")
+                best = min(best, sum(stats["seconds"] for name, stats
+                                     in instrumentation.as_dict().items()
+                                     if name != "create_doc.expand"))
+            timings.append(best)
+        assert_near_linear(CREATE_DOC_SIZES, timings)
+
+    @pytest.mark.parametrize("operation", [
+        lambda apidoc: apidoc.generate(),
+        lambda apidoc: apidoc.entrypoint.get(),
+    ], ids=["generate", "entrypoint_get"])
+    def test_doc_writer_operations(self, operation):
+        assert_near_linear(SIZES, time_sizes(light_doc, operation, SIZES))
+
+    def test_build_doc(self):
+        assert_near_linear(SIZES, time_sizes(lambda size: size, light_doc, SIZES))
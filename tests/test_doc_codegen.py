@@ -0,0 +1,47 @@
+import importlib.util
+
+import pytest
+
+from hydra_python_core.doc_codegen import generate_module, write_module
+from hydra_python_core.doc_writer import DocUrl
+from samples import doc_writer_sample
+from benchmarks.synthetic_doc import build_doc
+
+
+def import_doc(path):
+    spec = importlib.util.spec_from_file_location("generated_api_doc", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.api_doc
+
+
+class TestDocCodegen:
+
+    @pytest.mark.parametrize("apidoc", [doc_writer_sample.api_doc, build_doc(8)])
+    def test_round_trip(self, tmpdir, apidoc):
+        path = str(tmpdir.join("api_doc.py"))
+        assert write_module(apidoc, path).endswith(".pyc")
+        DocUrl.doc_url = ""
+        loaded = import_doc(path)
+        assert DocUrl.doc_url == "http://hydrus.com/api/vocab?resource="
+        assert loaded.generate() == apidoc.generate()
+        assert loaded.fingerprint() == apidoc.fingerprint()
+        assert loaded.entrypoint.get() == apidoc.entrypoint.get()
+        entrypoint = loaded.entrypoint.entrypoint.id_
+        assert loaded.is_subclass(entrypoint, "http://www.w3.org/ns/hydra/core#Resource")
+
+    def test_shared_objects(self, tmpdir):
+        path = str(tmpdir.join("api_doc.py"))
+        write_module(build_doc(4), path)
+        loaded = import_doc(path)
+        class0 = loaded.parsed_classes["Class0"]["class"]
+        link = loaded.entrypoint.entrypoint.supportedProperty[0]
+        assert link.name == "Class0"
+        # a change to the operations of a class is seen by its EntryPoint link
+        assert link.supportedOperation is class0.supportedOperation
+
+    def test_unsupported_attribute(self):
+        apidoc = build_doc(2)
+        apidoc.parsed_classes["Class0"]["class"].hook = lambda: None
+        with pytest.raises(ValueError):
+            generate_module(apidoc)
@@ -0,0 +1,63 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from hydra_python_core import doc_compiler
+from benchmarks.synthetic_doc import build_doc
+
+
+def write_docs(tmpdir, sizes):
+    paths = []
+    for size in sizes:
+        path = tmpdir.join("api{}.jsonld".format(size))
+        path.write(json.dumps(build_doc(size).generate()))
+        paths.append(str(path))
+    return paths
+
+
+class TestDocCompiler:
+
+    def test_bundle(self, tmpdir):
+        source, = write_docs(tmpdir, [5])
+        result = doc_compiler.compile_source(source, str(tmpdir.join("out")))
+        bundle = result["bundle"]
+        with open(os.path.join(bundle, "index.json")) as f:
+            index = json.load(f)
+        # vocab, EntryPoint and its context, 5 classes and 1 collection
+        assert result["routes"] == len(index["routes"]) == 9
+        assert index["etag"] == build_doc(5).etag()
+        vocab = index["routes"]["/api/vocab"]
+        with open(os.path.join(bundle, vocab["file"]), "rb") as f:
+            data = f.read()
+        with open(os.path.join(bundle, vocab["gzip"]), "rb") as f:
+            assert gzip.decompress(f.read()) == data
+        assert json.loads(data.decode()) == build_doc(5).generate()
+        assert vocab["gzip_bytes"] < vocab["bytes"]
+        context = index["classes"]["http://hydrus.com/api/vocab?resource=Class0"]
+        with open(os.path.join(bundle, index["routes"][context]["file"])) as f:
+            assert json.load(f)["@context"]["Class0"] == \
+                "http://hydrus.com/api/vocab?resource=Class0"
+        assert "/api" in index["routes"]
+        assert "/api/contexts/EntryPoint.jsonld" in index["routes"]
+
+    def test_sources_and_errors(self, tmpdir):
+        output = str(tmpdir.join("out"))
+        results = doc_compiler.compile_sources(
+            ["samples.doc_writer_sample", "samples/hydra_doc_sample.py"], output)
+        assert results[0]["bundle"] == os.path.join(output, "doc_writer_sample")
+        assert results[1]["error"].startswith("SyntaxError")
+        with pytest.raises(SystemExit):
+            doc_compiler.main(["samples/hydra_doc_sample.py", "--output", output])
+
+    def test_parallel(self, tmpdir):
+        sources = write_docs(tmpdir, [2, 3, 4])
+        sequential = doc_compiler.compile_sources(sources, str(tmpdir.join("seq")), jobs=1)
+        parallel = doc_compiler.compile_sources(sources, str(tmpdir.join("par")), jobs=3)
+        assert [result["etag"] for result in parallel] == \
+            [result["etag"] for result in sequential]
+        for seq, par in zip(sequential, parallel):
+            with open(os.path.join(seq["bundle"], "vocab.jsonld.gz"), "rb") as f1, \
+                    open(os.path.join(par["bundle"], "vocab.jsonld.gz"), "rb") as f2:
+                assert f1.read() == f2.read()
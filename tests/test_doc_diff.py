@@ -0,0 +1,77 @@
+import json
+import random
+
+from hydra_python_core.doc_diff import apply_patch, diff_docs, json_patch
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp, HydraStatus
+from benchmarks.synthetic_doc import build_doc
+
+
+def class_id(apidoc, name):
+    return apidoc.parsed_classes[name]["class"].id_
+
+
+class TestDocDiff:
+
+    def test_same_doc(self):
+        assert json_patch(build_doc(5), build_doc(5)) == []
+
+    def test_changes(self):
+        old = build_doc(4, collections=1)
+        new = build_doc(4, collections=1)
+        added = HydraClass("Added", "A new class", endpoint=False)
+        added.add_supported_prop(HydraClassProp("http://props.hydrus.com/new", "new",
+                                                True, True, False))
+        new.add_supported_class(added)
+        del new.parsed_classes["Class3"]
+        new.parsed_classes["Class1"]["class"].supportedProperty.pop(0)
+        new.parsed_classes["Class2"]["class"].desc = "Changed"
+        new.add_possible_status(HydraStatus(418, title="teapot"))
+        diff = diff_docs(old, new)
+        doc_id = old.generate()["@id"]
+        changes = set(diff.changes)
+        assert ("removed", "class", class_id(old, "Class3"), doc_id) in changes
+        assert ("added", "class", added.id_, doc_id) in changes
+        assert ("changed", "class", class_id(old, "Class1"), doc_id) in changes
+        assert ("removed", "property", "http://props.hydrus.com/prop0",
+                class_id(old, "Class1")) in changes
+        assert ("changed", "class", class_id(old, "Class2"), doc_id) in changes
+        assert ("added", "status", "418 teapot", doc_id) in changes
+        assert class_id(old, "Class0") not in diff.changed_classes()
+        assert apply_patch(old.generate(), diff.patch) == new.generate()
+        assert {"op": "replace", "path": "/supportedClass/2/description",
+                "value": "Changed"} in diff.patch
+
+    def test_reordered_and_escaped(self):
+        old = build_doc(3)
+        new = build_doc(3)
+        classes = new.parsed_classes
+        new.parsed_classes = {key: classes[key] for key in reversed(list(classes))}
+        new.add_to_context("a/b~c", "http://example.com/ab")
+        diff = diff_docs(old, new)
+        assert {"op": "add", "path": "/@context/a~1b~0c",
+                "value": "http://example.com/ab"} in diff.patch
+        assert {"op": "replace", "path": "/supportedClass",
+                "value": new.generate()["supportedClass"]} in diff.patch
+        assert not diff.changed_classes()
+        assert apply_patch(old.generate(), diff.patch) == new.generate()
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            old = build_doc(8, collections=2).generate()
+            new = json.loads(json.dumps(old))
+            classes = new["supportedClass"]
+            for _ in range(rng.randint(1, 6)):
+                class_ = rng.choice(classes)
+                edit = rng.randrange(4)
+                if edit == 0 and class_["supportedProperty"]:
+                    class_["supportedProperty"].pop(rng.randrange(len(class_["supportedProperty"])))
+                elif edit == 1:
+                    class_["title"] += "!"
+                elif edit == 2:
+                    classes.remove(class_)
+                else:
+                    copy = json.loads(json.dumps(class_))
+                    copy["@id"] += "Copy{}".format(rng.random())
+                    classes.insert(rng.randrange(len(classes) + 1), copy)
+            assert apply_patch(old, json_patch(old, new)) == new
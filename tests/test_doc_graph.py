@@ -0,0 +1,54 @@
+from hydra_python_core import doc_maker
+from hydra_python_core.doc_graph import LinkGraph
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp, HydraLink
+from hydra_python_core.namespace import hydra
+from benchmarks.synthetic_doc import build_doc
+
+
+def class_id(apidoc, name):
+    return apidoc.parsed_classes[name]["class"].id_
+
+
+class TestLinkGraph:
+
+    def test_shortest_path(self):
+        apidoc = build_doc(6, links=1)
+        graph = LinkGraph(apidoc)
+        # odd classes are no endpoints, they are reached through a link
+        path = graph.shortest_path(class_id(apidoc, "Class3"))
+        assert [(edge.kind, edge.target) for edge in path] == [
+            ("entrypoint", class_id(apidoc, "Class2")), ("link", class_id(apidoc, "Class3"))]
+        assert path[0].source == graph.entrypoint
+        assert graph.shortest_path(class_id(apidoc, "Class2")) == \
+            [graph.successors(graph.entrypoint)[1]]
+        assert graph.shortest_path(graph.entrypoint) == []
+        # each class links to the next one, the last to the first
+        assert graph.shortest_path(class_id(apidoc, "Class0"), class_id(apidoc, "Class5")) \
+            == graph.successors(class_id(apidoc, "Class5"))
+        assert len(graph.shortest_path(class_id(apidoc, "Class0"),
+                                       class_id(apidoc, "Class1"))) == 5
+
+    def test_unreachable(self):
+        apidoc = build_doc(2, links=0)
+        island = HydraClass("Island", "Linked from nowhere", endpoint=False)
+        island.add_supported_prop(HydraClassProp(
+            HydraLink("Island_link", "link", "", island.id_, class_id(apidoc, "Class0")),
+            "link", read=True, write=False, required=False))
+        apidoc.add_supported_class(island)
+        graph = LinkGraph(apidoc)
+        assert island.id_ not in graph.reachable()
+        assert graph.shortest_path(island.id_) is None
+        assert graph.shortest_path("http://hydrus.com/api/vocab?resource=Unknown") is None
+        assert graph.reachable(island.id_) == {island.id_, class_id(apidoc, "Class0")}
+
+    def test_collections_and_cache(self, get_offline_doc):
+        apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+        graph = LinkGraph(apidoc)
+        extra = class_id(apidoc, "extraClass")
+        path = graph.shortest_path(extra)
+        assert [edge.kind for edge in path] == ["entrypoint", "member"]
+        assert path[1].property == hydra["member"]
+        reachable = graph.reachable()
+        assert graph.reachable() is reachable
+        graph.add_edge(extra, class_id(apidoc, "anotherSingleClass"), "http://x/p", "link")
+        assert graph.reachable() is not reachable
@@ -0,0 +1,123 @@
+from hydra_python_core import doc_maker
+from hydra_python_core.doc_hierarchy import ClassHierarchy
+from hydra_python_core.doc_writer import HydraClass, HydraCollection
+from hydra_python_core.namespace import hydra
+from benchmarks.synthetic_doc import build_doc, strip_remote_contexts
+
+
+def naive_is_subclass(parents, sub, sup, seen=None):
+    """Walk up the hierarchy, the reference for the bitsets."""
+    if sub == sup:
+        return True
+    seen = seen if seen is not None else set()
+    seen.add(sub)
+    return any(naive_is_subclass(parents, parent, sup, seen)
+               for parent in parents.get(sub, ()) if parent not in seen)
+
+
+class TestClassHierarchy:
+
+    def test_transitive(self):
+        hierarchy = ClassHierarchy()
+        hierarchy.add_class("A")
+        hierarchy.add_class("B", ["A"])
+        hierarchy.add_class("C", ["B"])
+        assert hierarchy.is_subclass("C", "A")
+        assert hierarchy.is_subclass("C", "C")
+        assert hierarchy.is_subclass("C", hydra["Resource"])
+        assert not hierarchy.is_subclass("A", "C")
+        assert not hierarchy.is_subclass("A", hydra["Collection"])
+        assert hierarchy.is_subclass(hydra["Collection"], hydra["Resource"])
+        assert hierarchy.superclasses("C") == {"A", "B", "C", hydra["Resource"]}
+        assert hierarchy.subclasses("A") == {"A", "B", "C"}
+
+    def test_multiple_inheritance(self):
+        hierarchy = ClassHierarchy()
+        hierarchy.add_class("D", ["B", "C"])
+        hierarchy.add_class("B", ["A"])
+        assert hierarchy.is_subclass("D", "A")
+        assert hierarchy.is_subclass("D", "C")
+        assert not hierarchy.is_subclass("C", "A")
+
+    def test_parents_added_later(self):
+        hierarchy = ClassHierarchy()
+        hierarchy.add_class("C", ["B"])
+        assert not hierarchy.is_subclass("C", "A")
+        hierarchy.add_class("B", ["A"])
+        hierarchy.add_class("A", ["Z"])
+        assert hierarchy.is_subclass("C", "A")
+        assert hierarchy.is_subclass("C", "Z")
+        assert hierarchy.is_subclass("B", "Z")
+
+    def test_cycle(self):
+        hierarchy = ClassHierarchy()
+        hierarchy.add_class("A", ["B"])
+        hierarchy.add_class("B", ["C"])
+        hierarchy.add_class("C", ["A"])
+        for sub in "ABC":
+            assert hierarchy.superclasses(sub) == {"A", "B", "C", hydra["Resource"]}
+
+    def test_unknown_classes(self):
+        hierarchy = ClassHierarchy()
+        assert hierarchy.is_subclass("X", "X")
+        assert not hierarchy.is_subclass("X", hydra["Resource"])
+        assert "X" not in hierarchy
+
+    def test_naive_walk(self):
+        parents = {"C{}".format(i): ["C{}".format(j) for j in (i // 2, i // 3, i - 5) if j >= 0]
+                   for i in range(1, 60)}
+        hierarchy = ClassHierarchy()
+        # children first, so most of the closure comes from propagation
+        for sub in sorted(parents, reverse=True):
+            hierarchy.add_class(sub, parents[sub])
+        parents["C0"] = [hydra["Resource"]]
+        for sub in parents:
+            for sup in parents:
+                assert hierarchy.is_subclass(sub, sup) == naive_is_subclass(parents, sub, sup)
+
+
+class TestHydraDocHierarchy:
+
+    def test_doc_classes(self):
+        apidoc = build_doc(4, links=0)
+        class_id = apidoc.parsed_classes["Class0"]["class"].id_
+        collection_id = apidoc.collections["Collection0"]["collection"].collection_id
+        assert apidoc.is_subclass(class_id, hydra["Resource"])
+        assert not apidoc.is_subclass(class_id, hydra["Collection"])
+        assert apidoc.is_subclass(collection_id, hydra["Collection"])
+        assert apidoc.is_subclass(collection_id, hydra["Resource"])
+        assert apidoc.is_subclass(apidoc.entrypoint.entrypoint.id_, hydra["Resource"])
+
+    def test_sub_classof(self):
+        apidoc = build_doc(2, links=0)
+        parent = apidoc.parsed_classes["Class0"]["class"]
+        child = HydraClass("Child", "Subclass of Class0", sub_classof=parent.id_)
+        grandchild = HydraClass("Grandchild", "Subclass of Child", sub_classof=[child])
+        apidoc.add_supported_class(grandchild)
+        assert not apidoc.is_subclass(grandchild.id_, parent.id_)
+        apidoc.add_supported_class(child)
+        assert apidoc.is_subclass(grandchild.id_, parent.id_)
+        assert apidoc.is_subclass(grandchild.id_, hydra["Resource"])
+        collection = HydraCollection(collection_name="Children", manages={
+            "property": "rdf:type", "object": child.id_})
+        apidoc.add_supported_collection(collection)
+        assert apidoc.is_subclass(collection.collection_id, hydra["Collection"])
+
+    def test_create_doc(self):
+        apidoc = build_doc(2, links=0)
+        parent = apidoc.parsed_classes["Class0"]["class"]
+        child = HydraClass("Child", "Subclass of Class0", sub_classof=parent.id_)
+        apidoc.add_supported_class(child)
+        both = HydraClass("Both", "Subclass of Child and Class1",
+                          sub_classof=[child.id_, apidoc.parsed_classes["Class1"]["class"].id_])
+        apidoc.add_supported_class(both)
+        doc = strip_remote_contexts(apidoc.generate())
+        created = doc_maker.create_doc(doc, "http://hydrus.com/", "api")
+        classes = {title: entry["class"] for title, entry in created.parsed_classes.items()}
+        assert classes["Child"].parents == classes["Class0"].id_
+        assert created.is_subclass(classes["Child"].id_, classes["Class0"].id_)
+        assert created.is_subclass(classes["Both"].id_, classes["Class0"].id_)
+        assert created.is_subclass(classes["Both"].id_, classes["Class1"].id_)
+        assert not created.is_subclass(classes["Class1"].id_, classes["Class0"].id_)
+        generated = {class_["@id"]: class_ for class_ in created.generate()["supportedClass"]}
+        assert generated[both.id_]["subClassOf"] == both.parents
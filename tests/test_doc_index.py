@@ -0,0 +1,90 @@
+import io
+import itertools
+
+from hydra_python_core import doc_maker, doc_writer
+from hydra_python_core.doc_index import DocIndex, TripleIndex
+from hydra_python_core.doc_rdf import write_ntriples
+from hydra_python_core.namespace import hydra, rdfs
+from benchmarks.synthetic_doc import build_doc
+from tests.test_doc_rdf import canonical
+
+
+def ntriples(triples):
+    out = io.StringIO()
+    write_ntriples(triples, out)
+    return out.getvalue()
+
+
+class TestTripleIndex:
+
+    def test_match_patterns(self):
+        triples = list(build_doc(4, collections=2).iter_triples())
+        index = TripleIndex(triples)
+        assert len(index) == len(set(triples))
+        for subject, predicate, object_ in triples[::7]:
+            for mask in itertools.product((True, False), repeat=3):
+                pattern = [term if bound else None for term, bound in
+                           zip((subject, predicate, object_), mask)]
+                expected = {triple for triple in triples
+                            if all(term is None or term == value
+                                   for term, value in zip(pattern, triple))}
+                assert set(index.match(*pattern)) == expected
+
+    def test_add_remove(self):
+        index = TripleIndex()
+        assert index.add("_:a", hydra["title"], "_:b")
+        assert not index.add("_:a", hydra["title"], "_:b")
+        assert ("_:a", hydra["title"], "_:b") in index
+        index.remove("_:a", hydra["title"], "_:b")
+        assert len(index) == 0
+        assert index.spo == index.pos == index.osp == {}
+
+
+class TestDocIndex:
+
+    def test_incremental_matches_rebuild(self, monkeypatch):
+        init = doc_writer.HydraDoc.__init__
+
+        def init_with_index(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+            self.triple_index()
+
+        monkeypatch.setattr(doc_writer.HydraDoc, "__init__", init_with_index)
+        apidoc = build_doc(5, links=2, collections=2)
+        index = apidoc.triple_index()
+        rebuilt = DocIndex(apidoc)
+        assert len(index) == len(rebuilt)
+        assert canonical(ntriples(index)) == canonical(ntriples(apidoc.iter_triples()))
+
+    def test_replace_class(self):
+        apidoc = build_doc(4, links=2, collections=2)
+        index = apidoc.triple_index()
+        class0 = apidoc.parsed_classes["Class0"]["class"]
+        replacement = doc_writer.HydraClass("Other", "Replaces Class0", path="Class0")
+        replacement.add_supported_prop(doc_writer.HydraClassProp(
+            "http://props.hydrus.com/other", "other", True, False, False))
+        apidoc.add_supported_class(replacement)
+        collection = next(iter(apidoc.collections.values()))["collection"]
+        apidoc.add_supported_collection(doc_writer.HydraCollection(
+            collection_name=collection.name, collection_path=collection.path,
+            manages=collection.manages, get=False))
+        assert canonical(ntriples(index)) == canonical(ntriples(apidoc.iter_triples()))
+        assert not list(index.match(class0.id_))
+        assert class0.id_ not in index.classes_linking_to(class0.id_.replace("Class0", "Class1"))
+
+    def test_queries(self, get_offline_doc):
+        apidoc = build_doc(4, links=1, operations=4)
+        index = apidoc.triple_index()
+        class1 = apidoc.parsed_classes["Class1"]["class"]
+        owners = {owner for owner, _ in index.operations_returning(class1.id_)}
+        # its own GET, PUT, POST and the link operation of Class0
+        assert owners == {class1.id_, class1.id_.replace("Class1", "Class0_link0")}
+        assert len(index.operations_returning(class1.id_)) == 4
+        assert index.classes_linking_to(class1.id_) == \
+            {apidoc.parsed_classes["Class0"]["class"].id_}
+        assert "http://props.hydrus.com/prop0" in \
+            index.properties_with_range("https://www.w3.org/TR/xmlschema-2/#string")
+
+        apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+        index = apidoc.triple_index()
+        assert index.subjects(rdfs["range"], apidoc.parsed_classes["dummyClass"]["class"].id_)
@@ -0,0 +1,55 @@
+import json
+
+from hydra_python_core import doc_maker
+from hydra_python_core.doc_ir import compile_doc, NO_REF, CLASS, COLLECTION, ENTRYPOINT, LINK
+from benchmarks.synthetic_doc import build_doc
+
+
+class TestCompiledDoc:
+
+    def test_generate_matches_hydra_doc(self, get_offline_doc):
+        apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+        assert json.dumps(compile_doc(apidoc).generate()) == json.dumps(apidoc.generate())
+
+        apidoc = build_doc(15, links=2, collections=4, statuses=2)
+        assert json.dumps(compile_doc(apidoc).generate()) == json.dumps(apidoc.generate())
+
+    def test_tables(self):
+        apidoc = build_doc(4, properties=2, links=1, operations=2, collections=2, statuses=1)
+        compiled = compile_doc(apidoc)
+        # 4 classes, Resource, Collection, 2 collections and the EntryPoint
+        assert list(compiled.class_kind) == [CLASS] * 6 + [COLLECTION] * 2 + [ENTRYPOINT]
+        assert len(compiled.iris) == len(set(compiled.iris.iris))
+
+        class_ = apidoc.parsed_classes["Class0"]["class"]
+        row = compiled.class_index(class_.id_)
+        assert compiled.class_title[row] == "Class0"
+        assert len(compiled.properties(row)) == 3
+        assert len(compiled.operations(row)) == 2
+
+        # the link of Class0 goes to Class1, its range resolves to the class row
+        link_prop = [prop for prop in compiled.properties(row)
+                     if compiled.prop_kind[prop] == LINK][0]
+        link = compiled.prop_target[link_prop]
+        assert compiled.resolve(compiled.link_range[link]) == compiled.class_index(
+            apidoc.parsed_classes["Class1"]["class"].id_)
+        assert compiled.resolve(compiled.link_domain[link]) == row
+
+        for op in compiled.operations(row):
+            if compiled.op_method[op] == "GET":
+                assert compiled.resolve(compiled.op_returns[op]) == row
+                assert compiled.op_expects[op] == NO_REF
+            assert len(compiled.statuses(op)) == 1
+
+        collection = compiled.class_index(
+            apidoc.collections["Collection0"]["collection"].collection_id)
+        assert compiled.resolve(compiled.class_manages_object[collection]) == row
+        assert compiled.class_index("http://unknown.com/Class") == NO_REF
+
+    def test_vocab_of_the_compiled_doc(self):
+        first = build_doc(3, api_name="first")
+        # building another doc changes the global DocUrl.doc_url
+        build_doc(3, api_name="second")
+        compiled = compile_doc(first)
+        assert compiled.vocab == "http://hydrus.com/first/vocab?resource="
+        assert compiled.generate() == first.generate()
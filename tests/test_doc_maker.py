@@ -128,7 +128,7 @@ class TestCreateClass(unittest.TestCase):
         # run the function and check if HydraClass has been instantiated
         class_ = doc_maker.create_class(class_dict, endpoint=False)
         mock_class.assert_called_once_with('dummyClass', 'A dummyClass for demo',
-                                           endpoint=False)
+                                           endpoint=False, sub_classof=None)
 
         # check if properties and operations has been added to the hydra class
         self.assertEqual(mock_class.return_value.add_supported_op.call_count,
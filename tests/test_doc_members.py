@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from pyld import jsonld
+
+from hydra_python_core import doc_members
+from hydra_python_core.doc_members import MemberBuffer, column_type
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp
+from hydra_python_core.namespace import hydra
+from benchmarks.synthetic_doc import build_doc
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    doc_members.numpy is None, reason="numpy is not installed"))]
+
+
+def book_class():
+    class_ = HydraClass("Book", "A book")
+    for title, range_ in (("title", "xsd:string"), ("pages", "xsd:integer"),
+                          ("price", "http://www.w3.org/2001/XMLSchema#decimal"),
+                          ("used", "xsd:boolean")):
+        class_.add_supported_prop(HydraClassProp("http://props.hydrus.com/" + title, title,
+                                                 True, True, False, range=range_))
+    return class_
+
+
+def books(count):
+    return [{"@id": "/api/Book/{}".format(i), "@type": "Book", "title": "title{}".format(i % 3),
+             "pages": i, "price": i / 4, "used": i % 2 == 0} for i in range(count)]
+
+
+class TestMemberBuffer:
+
+    def test_column_type(self):
+        assert column_type("xsd:integer") == "q"
+        assert column_type("http://www.w3.org/2001/XMLSchema#double") == "d"
+        assert column_type("xsd:boolean") == "b"
+        assert column_type("xsd:string") == "s"
+        assert column_type(None) == "s"
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_members(self, use_numpy):
+        members = MemberBuffer(book_class(), use_numpy)
+        data = books(10)
+        members.extend(data)
+        # missing values and expanded keys
+        members.append({"@id": "/api/Book/café", "http://props.hydrus.com/pages": 7})
+        data.append({"@id": "/api/Book/café", "@type": "Book", "pages": 7})
+        assert len(members) == 11
+        assert members.members() == data
+        assert json.loads(members.members_json()) == data
+        assert json.loads(members.members_json(3, 5)) == data[3:5]
+        assert list(members.column("pages")) == list(range(10)) + [7]
+        # the titles are interned
+        assert len(members.columns[0][2].values) == 4
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_invalid_members(self, use_numpy):
+        members = MemberBuffer(book_class(), use_numpy)
+        members.extend(books(2))
+        with pytest.raises(TypeError):
+            members.extend(books(2) + [{"@id": "/api/Book/2", "pages": "3"}])
+        with pytest.raises(ValueError):
+            members.append({"@id": "/api/Book/2", "author": "someone"})
+        assert members.members() == books(2)
+
+    def test_page_json(self):
+        apidoc = build_doc(2)
+        collection = apidoc.collections["Collection0"]["collection"]
+        members = MemberBuffer.for_collection(apidoc, collection)
+        assert members.type_ == "Class0"
+        members.extend({"@id": "/api/Class0/{}".format(i), "prop0": "value"} for i in range(25))
+        page = json.loads(members.page_json("/api/Collection0", page=2, page_size=10))
+        assert page["totalItems"] == 25
+        assert page["view"]["next"] == "/api/Collection0?page=3"
+        assert page["view"]["last"] == "/api/Collection0?page=3"
+        assert [member["@id"] for member in page["members"]] == \
+            ["/api/Class0/{}".format(i) for i in range(10, 20)]
+
+        expanded = jsonld.expand(page, {"base": "http://hydrus.com/"})[0]
+        class_ = apidoc.parsed_classes["Class0"]["class"]
+        prop = class_.supportedProperty[0].prop
+        assert expanded["@type"] == [hydra["Collection"]]
+        assert expanded[hydra["totalItems"]] == [{"@value": 25}]
+        assert expanded[hydra["view"]][0][hydra["next"]] == \
+            [{"@id": "http://hydrus.com/api/Collection0?page=3"}]
+        assert len(expanded[hydra["member"]]) == 10
+        assert all(member["@type"] == [class_.id_] and member[prop] == [{"@value": "value"}]
+                   for member in expanded[hydra["member"]])
+
+    def test_expanded_values(self):
+        members = MemberBuffer(book_class())
+        members.append({"@id": "/api/Book/1",
+                        "http://props.hydrus.com/title": [{"@value": "Title"}],
+                        "http://props.hydrus.com/pages": [{"@value": 3}],
+                        "http://props.hydrus.com/used": {"@value": False}})
+        assert members.members() == [{"@id": "/api/Book/1", "@type": "Book", "title": "Title",
+                                      "pages": 3, "used": False}]
+
+    def test_invalid_arguments(self):
+        members = MemberBuffer(book_class())
+        members.extend(books(3))
+        for page, page_size in ((0, 10), (-1, 10), (1, 0)):
+            with pytest.raises(ValueError):
+                members.page_json("/api/Books", page, page_size)
+        with pytest.raises(ValueError):
+            members.members_json(-1)
+        # NaN and Infinity have no JSON
+        for price in (float("nan"), float("inf")):
+            with pytest.raises(ValueError):
+                members.append({"@id": "/api/Book/3", "price": price})
+        assert len(members) == 3
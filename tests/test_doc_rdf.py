@@ -0,0 +1,171 @@
+import copy
+import io
+import json
+
+import pytest
+from pyld import jsonld
+
+from hydra_python_core import doc_maker
+from hydra_python_core.doc_rdf import Literal, iter_triples, parse_ntriples, parse_turtle, \
+    to_nquad, triples_to_expanded, write_nquads, write_ntriples, xsdNamespace
+from hydra_python_core.namespace import hydra, rdf
+from benchmarks.synthetic_doc import build_doc, make_doc
+
+TURTLE_DOC = """
+@prefix hydra: <http://www.w3.org/ns/hydra/core#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+PREFIX vocab: <http://hydrus.com/api/vocab?resource=>
+@base <http://hydrus.com/api/> .
+
+<vocab> a hydra:ApiDocumentation ;
+    hydra:title "Drone API" ;
+    hydra:description \"\"\"A "long"
+description\"\"\" ;
+    hydra:entrypoint <http://hydrus.com/api> ;
+    hydra:possibleStatus [ a hydra:Status ; hydra:statusCode 200 ; hydra:title 'OK' ] ;
+    hydra:supportedClass vocab:Drone .
+
+vocab:Drone a hydra:Class ;
+    hydra:title "Drone" ;
+    hydra:description "A drone"@en ;
+    hydra:supportedProperty [
+        a hydra:SupportedProperty ;
+        hydra:property <http://schema.org/name> ;
+        hydra:title "name" ;
+        hydra:required true ; hydra:readable true ; hydra:writeable false ;
+        rdfs:range <http://www.w3.org/2001/XMLSchema#string>
+    ] ;
+    hydra:supportedOperation [
+        a <http://schema.org/FindAction> ;
+        hydra:title "GetDrone" ; hydra:method "GET" ;
+        hydra:returns vocab:Drone ;
+        hydra:returnsHeader "Content-Type", "Content-Length" ;
+    ] .
+"""
+
+# the part of the hydra core context the generated docs rely on
+HYDRA_CONTEXT = {
+    "hydra": "http://www.w3.org/ns/hydra/core#",
+    "SupportedProperty": "hydra:SupportedProperty",
+    "Collection": "hydra:Collection",
+    "Status": "hydra:Status",
+    "Error": "hydra:Error",
+    "statusCode": "hydra:statusCode",
+    "title": "hydra:title",
+    "description": "hydra:description",
+}
+
+
+def hydra_context_loader(url, options=None):
+    return {"contextUrl": None, "documentUrl": url, "document": {"@context": HYDRA_CONTEXT}}
+
+
+def canonical(nquads):
+    """Get the URDNA2015 canonical N-Quads lines, blank nodes relabeled."""
+    return set(jsonld.normalize(nquads, {"algorithm": "URDNA2015",
+                                         "inputFormat": "application/n-quads",
+                                         "format": "application/n-quads"}).splitlines())
+
+
+def pyld_nquads(apidoc):
+    return jsonld.to_rdf(apidoc.generate(), {"format": "application/n-quads",
+                                             "expandContext": HYDRA_CONTEXT,
+                                             "documentLoader": hydra_context_loader})
+
+
+def ntriples(apidoc):
+    out = io.StringIO()
+    write_ntriples(apidoc.iter_triples(), out)
+    return out.getvalue()
+
+
+class TestDocRdf:
+
+    def test_same_triples_as_pyld(self):
+        apidoc = build_doc(6, links=2, collections=3)
+        assert canonical(ntriples(apidoc)) == canonical(pyld_nquads(apidoc))
+
+    def test_same_triples_as_pyld_sample_doc(self, get_offline_doc):
+        apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+        assert canonical(ntriples(apidoc)) == canonical(pyld_nquads(apidoc))
+
+    def test_iter_triples(self):
+        apidoc = build_doc(2)
+        triples = list(iter_triples(apidoc))
+        class_id = apidoc.parsed_classes["Class0"]["class"].id_
+        assert (class_id, rdf["type"], hydra["Class"]) in triples
+        assert (class_id, hydra["title"], Literal("Class0", xsdNamespace + "string")) in triples
+        assert all(None not in triple for triple in triples)
+        assert list(apidoc.iter_triples()) == triples
+
+    def test_nquads(self):
+        out = io.StringIO()
+        count = write_nquads(build_doc(2).iter_triples(), out, "http://hydrus.com/graph")
+        lines = out.getvalue().splitlines()
+        assert len(lines) == count
+        assert all(line.endswith(" <http://hydrus.com/graph> .") for line in lines)
+
+    def test_literal_escaping(self):
+        triple = ("_:b0", hydra["description"], Literal('a "quoted"\nline\\', xsdNamespace +
+                                                        "string"))
+        assert to_nquad(triple) == \
+            '_:b0 <{}> "a \\"quoted\\"\\nline\\\\" .\n'.format(hydra["description"])
+        triple = ("_:b0", hydra["statusCode"], Literal("200", xsdNamespace + "integer"))
+        assert to_nquad(triple).endswith('"200"^^<{}integer> .\n'.format(xsdNamespace))
+
+
+class TestCreateDocFromTriples:
+
+    @pytest.mark.parametrize("doc", [make_doc(6, links=2, collections=3), None])
+    def test_ntriples_round_trip(self, doc, get_offline_doc):
+        doc = doc if doc is not None else get_offline_doc
+        apidoc = doc_maker.create_doc(copy.deepcopy(doc), "http://hydrus.com/", "api")
+        rebuilt = doc_maker.create_doc_from_triples(
+            ntriples(apidoc), "http://hydrus.com/", "api", context=doc["@context"])
+        assert json.dumps(rebuilt.generate(), sort_keys=True) \
+            == json.dumps(apidoc.generate(), sort_keys=True)
+
+    def test_nquads_file(self, tmpdir):
+        apidoc = build_doc(3)
+        path = tmpdir.join("vocab.nq")
+        with open(str(path), "w") as f:
+            write_nquads(apidoc.iter_triples(), f, "http://hydrus.com/graph")
+        with open(str(path)) as f:
+            rebuilt = doc_maker.create_doc_from_triples(f, "http://hydrus.com/", "api",
+                                                        format="nquads")
+        assert sorted(rebuilt.parsed_classes) == ["Class0", "Class1", "Class2"]
+
+    def test_turtle(self):
+        apidoc = doc_maker.create_doc_from_triples(TURTLE_DOC, "http://hydrus.com/", "api",
+                                                   format="turtle")
+        assert apidoc.title == "Drone API"
+        assert apidoc.desc == 'A "long"\ndescription'
+        class_ = apidoc.parsed_classes["Drone"]["class"]
+        assert class_.desc == "A drone"
+        prop = class_.supportedProperty[0]
+        assert (prop.prop, prop.required, prop.write) == ("http://schema.org/name", True, False)
+        op = class_.supportedOperation[0]
+        assert op.returns == class_.id_
+        assert op.returns_header == ["Content-Type", "Content-Length"]
+        assert apidoc.possible_status[0].code == 200
+
+    def test_turtle_collection_and_blank_nodes(self):
+        triples = list(parse_turtle(
+            "@prefix ex: <http://example.com/> . _:g1 ex:list ( 1 2.5 ) ; ex:b [] ."))
+        subjects = [triple[0] for triple in triples]
+        # the text's own labels never clash with the generated ones
+        assert subjects.count("_:bg1") == 2
+        assert (rdf["namespace"] + "first", Literal("1", xsdNamespace + "integer")) \
+            in [triple[1:] for triple in triples]
+        assert len(set(subjects)) == 3
+
+    def test_invalid_input(self):
+        with pytest.raises(SyntaxError):
+            list(parse_ntriples(["<http://example.com/a> <http://example.com/b> ."]))
+        with pytest.raises(SyntaxError):
+            list(parse_turtle("ex:a ex:b ex:c ."))
+        with pytest.raises(SyntaxError):
+            triples_to_expanded(parse_ntriples(
+                ["<http://example.com/a> <http://example.com/b> <http://example.com/c> ."]))
+        with pytest.raises(ValueError):
+            doc_maker.create_doc_from_triples("", format="rdfxml")
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from hydra_python_core.doc_registry import DocRegistry, deep_sizeof
+from hydra_python_core.doc_writer import HydraClass, HydraDoc
+from benchmarks.synthetic_doc import build_doc
+
+SERVER_URL = "http://hydrus.com/"
+
+
+def counting_loader(builds):
+    def loader(server_url, api_name):
+        builds.append(api_name)
+        return build_doc(3, server_url=server_url, api_name=api_name)
+    return loader
+
+
+class TestDocRegistry:
+
+    def test_lru_eviction_and_spill(self, tmpdir):
+        builds = []
+        size = deep_sizeof(build_doc(3, server_url=SERVER_URL, api_name="api0"))
+        registry = DocRegistry(counting_loader(builds), budget=int(2.5 * size),
+                               spill_dir=str(tmpdir))
+        first = registry.get(SERVER_URL, "api0")
+        expected = first.generate()
+        registry.get(SERVER_URL, "api1")
+        registry.get(SERVER_URL, "api0")
+        # api1 is the least recently used
+        registry.get(SERVER_URL, "api2")
+        assert (SERVER_URL, "api1") not in registry
+        assert (SERVER_URL, "api0") in registry
+        assert len(registry) == 2
+        assert registry.resident_bytes <= registry.budget
+        registry.get(SERVER_URL, "api1")
+        registry.get(SERVER_URL, "api0")
+        registry.get(SERVER_URL, "api1")
+        assert builds == ["api0", "api1", "api2"]
+        stats = registry.stats()
+        # api1 came back in place of api0, then api0 in place of api2
+        assert stats[(SERVER_URL, "api0")]["hits"] == 1
+        assert stats[(SERVER_URL, "api0")]["loads"] == 1
+        assert stats[(SERVER_URL, "api1")] == dict(
+            stats[(SERVER_URL, "api1")], hits=1, misses=2, builds=1, loads=1, evictions=1)
+        assert registry.get(SERVER_URL, "api0").generate() == expected
+
+    def test_invalidate(self):
+        builds = []
+        registry = DocRegistry(counting_loader(builds), budget=0)
+        registry.get(SERVER_URL, "api0")
+        registry.get(SERVER_URL, "api1")
+        registry.invalidate(SERVER_URL, "api0")
+        registry.get(SERVER_URL, "api0")
+        assert builds == ["api0", "api1", "api0"]
+        # a doc larger than the budget stays resident while it is the last used
+        assert len(registry) == 1
+        registry.close()
+
+    def test_single_build_per_tenant(self):
+        builds = []
+        registry = DocRegistry(counting_loader(builds), budget=10 ** 9)
+        docs = []
+        threads = [threading.Thread(target=lambda: docs.append(registry.get(SERVER_URL, "api")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert builds == ["api"]
+        assert all(doc is docs[0] for doc in docs)
+
+    def test_parallel_builds(self):
+        # the builds of different tenants set the same globals, they run one at a time
+        def loader(server_url, api_name):
+            # like create_doc, the doc sets DocUrl.doc_url then its classes read it
+            apidoc = HydraDoc(api_name, "Title", "Description", api_name, server_url, "vocab")
+            time.sleep(0.01)
+            apidoc.add_supported_class(HydraClass("Class0", "Class of the tenant"))
+            return apidoc
+
+        registry = DocRegistry(loader, budget=10 ** 9)
+        names = ["api{}".format(i) for i in range(4)]
+        threads = [threading.Thread(target=registry.get, args=(SERVER_URL, name))
+                   for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name in names:
+            apidoc = registry.get(SERVER_URL, name)
+            prefix = "{}{}/vocab?resource=".format(SERVER_URL, name)
+            assert all(entry["class"].id_.startswith(prefix)
+                       for entry in apidoc.parsed_classes.values())
+
+    def test_get_while_spilling(self, tmpdir):
+        builds = []
+        size = deep_sizeof(build_doc(3, server_url=SERVER_URL, api_name="api0"))
+        registry = DocRegistry(counting_loader(builds), budget=int(1.5 * size),
+                               spill_dir=str(tmpdir))
+        first = registry.get(SERVER_URL, "api0")
+        first.blocker = Blocker()
+        spilling = threading.Thread(target=registry.get, args=(SERVER_URL, "api1"))
+        spilling.start()
+        assert Blocker.started.wait(10)
+        try:
+            # api0 is evicted but not written yet, it is taken back instead of built again
+            assert registry.get(SERVER_URL, "api0") is first
+        finally:
+            Blocker.release.set()
+            spilling.join()
+        assert builds == ["api0", "api1"]
+        assert (SERVER_URL, "api0") in registry
+
+
+class Blocker:
+    """Attribute of a doc whose pickling waits for `release`."""
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def __reduce__(self):
+        Blocker.started.set()
+        Blocker.release.wait(10)
+        return Blocker, ()
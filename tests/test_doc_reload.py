@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from hydra_python_core.doc_index import DocIndex
+from hydra_python_core.doc_reload import DocHolder, LiveDoc
+from hydra_python_core.doc_writer import DocUrl, HydraClass, HydraClassProp, HydraCollection
+from benchmarks.synthetic_doc import build_doc, make_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+def write_doc(path, doc, mtime=None):
+    # written aside then renamed, a polling holder never sees the content without its mtime
+    temporary = path.dirpath().join(path.basename + ".tmp")
+    temporary.write(json.dumps(doc))
+    if mtime is not None:
+        os.utime(str(temporary), ns=(mtime, mtime))
+    os.replace(str(temporary), str(path))
+
+
+class TestDocHolder:
+
+    def test_reload_invalidates_changed_classes(self, tmpdir):
+        path = tmpdir.join("doc.jsonld")
+        doc = make_doc(4, collections=0)
+        write_doc(path, doc, 10 ** 18)
+        holder = DocHolder(str(path), SERVER_URL, API_NAME)
+        first = holder.current
+        ids = [first.apidoc.parsed_classes[key]["class"].id_ for key in ("Class0", "Class1")]
+        for class_id in ids:
+            first.representation(class_id, "generated", lambda: "old " + class_id)
+        first.representation(first.generated["@id"], "doc", lambda: "old doc")
+        assert not holder.check()
+
+        doc["supportedClass"][1]["description"] = "Changed"
+        write_doc(path, doc, 2 * 10 ** 18)
+        reloads = []
+        holder.add_listener(lambda old, new, diff: reloads.append(diff.changed_classes()))
+        assert holder.check()
+        second = holder.current
+        assert second.number == 2 and second is not first
+        # the EntryPoint repeats the description of the class
+        assert reloads == [{ids[1], first.apidoc.entrypoint.entrypoint.id_}]
+        assert second.representation(ids[0], "generated", lambda: "new") == "old " + ids[0]
+        assert second.representation(ids[1], "generated", lambda: "new") == "new"
+        assert second.representation(second.generated["@id"], "doc", lambda: "new") == "new"
+        # the old version still serves the requests which took it
+        assert first.apidoc.parsed_classes["Class1"]["class"].desc != "Changed"
+        assert second.apidoc.parsed_classes["Class1"]["class"].desc == "Changed"
+
+    def test_failed_reload_keeps_version(self, tmpdir):
+        path = tmpdir.join("doc.jsonld")
+        write_doc(path, make_doc(2, collections=0), 10 ** 18)
+        holder = DocHolder(str(path), SERVER_URL, API_NAME)
+        doc_url = DocUrl.doc_url
+        write_doc(path, {"@context": {}}, 2 * 10 ** 18)
+        with pytest.raises(SyntaxError):
+            holder.check()
+        # not retried until the file changes again
+        assert not holder.check()
+        assert holder.current.number == 1
+        assert DocUrl.doc_url == doc_url
+
+    def test_reload_keeps_global_doc_url(self, tmpdir):
+        path = tmpdir.join("doc.jsonld")
+        write_doc(path, make_doc(2, collections=0), 10 ** 18)
+        loading = threading.Event()
+        release = threading.Event()
+
+        def loader(path, server_url, api_name):
+            apidoc = build_doc(2, server_url="http://other.com/", api_name=api_name)
+            if holder_made:
+                loading.set()
+                assert release.wait(10)
+            return apidoc
+
+        holder_made = False
+        holder = DocHolder(str(path), SERVER_URL, API_NAME, loader=loader)
+        holder_made = True
+        DocUrl.doc_url = doc_url = "http://hydrus.com/api/vocab?resource="
+        write_doc(path, make_doc(3, collections=0), 2 * 10 ** 18)
+        reload = threading.Thread(target=holder.check)
+        reload.start()
+        try:
+            assert loading.wait(10)
+            # a request building templates while the doc loads keeps its vocab
+            assert DocUrl.doc_url == doc_url
+        finally:
+            release.set()
+            reload.join()
+        assert holder.current.number == 2
+        assert holder.current.doc_url == "http://other.com/api/vocab?resource="
+        assert DocUrl.doc_url == doc_url
+
+    def test_background_reload(self, tmpdir):
+        path = tmpdir.join("doc.jsonld")
+        write_doc(path, make_doc(2, collections=0), 10 ** 18)
+        holder = DocHolder(str(path), SERVER_URL, API_NAME, interval=0.01)
+        seen = []
+        stop = threading.Event()
+
+        def request():
+            # every version read is complete, 2 classes in the first, 3 in the next
+            while not stop.is_set():
+                version = holder.current
+                seen.append((version.number, len(version.apidoc.parsed_classes)))
+
+        reader = threading.Thread(target=request)
+        reader.start()
+        with holder:
+            write_doc(path, make_doc(3, collections=0), 2 * 10 ** 18)
+            deadline = time.time() + 10
+            while holder.current.number == 1 and time.time() < deadline:
+                time.sleep(0.01)
+        stop.set()
+        reader.join()
+        assert holder.error is None
+        assert holder.current.number == 2
+        assert set(seen) <= {(1, 2), (2, 3)}
+
+
+def add_class(apidoc, name):
+    """Add an endpoint class and its collection."""
+    class_ = HydraClass(name, "Class added at runtime", endpoint=True)
+    class_.add_supported_prop(HydraClassProp("http://props.hydrus.com/prop0", "prop0",
+                                             read=True, write=True, required=False))
+    apidoc.add_supported_class(class_)
+    apidoc.add_supported_collection(HydraCollection(
+        collection_name="{}Collection".format(name), collection_description=name,
+        manages={"property": "rdf:type", "object": class_.id_},
+        collection_path="{}Collection".format(name)))
+
+
+def entrypoint_links(version):
+    """Get the EntryPoint links of a version, checking they match its classes and collections."""
+    apidoc = version.apidoc
+    links = [prop.name for prop in apidoc.entrypoint.entrypoint.supportedProperty]
+    endpoints = [path for path, entry in apidoc.parsed_classes.items()
+                 if entry["class"].endpoint]
+    assert sorted(links) == sorted(endpoints + list(apidoc.collections))
+    entrypoint = [class_ for class_ in version.generated["supportedClass"]
+                  if class_["@id"] == apidoc.entrypoint.entrypoint.id_][0]
+    assert len(entrypoint["supportedProperty"]) == len(links)
+    return links
+
+
+class TestLiveDoc:
+
+    def test_mutate(self):
+        live = LiveDoc(build_doc(2))
+        first = live.current
+        live.apidoc.triple_index()
+        with live.mutate() as apidoc:
+            add_class(apidoc, "Added")
+        assert live.current.number == 2
+        assert "Added" in live.apidoc.parsed_classes
+        assert "AddedCollection" in entrypoint_links(live.current)
+        # the index of the first version was built, the one of the new version is ready
+        assert live.apidoc._triple_index is not None
+        assert set(live.apidoc.triple_index()) == set(DocIndex(live.apidoc))
+        # the first version is unchanged
+        assert "Added" not in first.apidoc.parsed_classes
+        assert first.apidoc.generate() == first.generated
+        with pytest.raises(RuntimeError):
+            with live.mutate() as apidoc:
+                add_class(apidoc, "Failed")
+                raise RuntimeError("rolled back")
+        assert live.current.number == 2
+        assert "Failed" not in live.apidoc.parsed_classes
+
+    def test_mutate_doc_url(self):
+        live = LiveDoc(build_doc(2))
+        build_doc(2, server_url="http://other.com/", api_name="api2")
+        doc_url = DocUrl.doc_url
+        with live.mutate() as apidoc:
+            add_class(apidoc, "Added")
+        assert DocUrl.doc_url == doc_url
+        assert live.apidoc.parsed_classes["Added"]["class"].id_ == \
+            "http://hydrus.com/api/vocab?resource=Added"
+        assert "AddedCollection" in entrypoint_links(live.current)
+        assert all(link.id_.startswith("http://hydrus.com/api/vocab?resource=EntryPoint/")
+                   for link in live.apidoc.entrypoint.entrypoint.supportedProperty)
+
+        # a block replacing an EntryPoint link keeps its own links
+        with live.mutate() as apidoc:
+            links = apidoc.entrypoint.entrypoint.supportedProperty
+            del links[[link.name for link in links].index("AddedCollection")]
+            add_class(apidoc, "Replaced")
+            apidoc.entrypoint.add_Class(apidoc.parsed_classes["Replaced"]["class"])
+        links = [link.name for link in live.apidoc.entrypoint.entrypoint.supportedProperty]
+        assert "AddedCollection" not in links
+        assert "Replaced" in links and "ReplacedCollection" not in links
+
+    def test_concurrent_mutations(self):
+        live = LiveDoc(build_doc(2))
+        classes = len(live.apidoc.parsed_classes)
+        stop = threading.Event()
+        errors = []
+
+        def write(writer):
+            for i in range(10):
+                with live.mutate() as apidoc:
+                    add_class(apidoc, "Writer{}Class{}".format(writer, i))
+
+        def read():
+            number = 0
+            try:
+                while not stop.is_set():
+                    version = live.current
+                    assert version.number >= number
+                    number = version.number
+                    # each batch adds one class and its collection
+                    assert len(version.apidoc.parsed_classes) == classes + number - 1
+                    entrypoint_links(version)
+                    assert version.apidoc.entrypoint.get()["@type"] == "EntryPoint"
+            except AssertionError as error:
+                errors.append(error)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        writers = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+        assert errors == []
+        assert live.current.number == 41
+        assert len(entrypoint_links(live.current)) == len(build_doc(2).entrypoint.entrypoint
+                                                          .supportedProperty) + 80
+        assert live.apidoc.generate() == live.current.generated
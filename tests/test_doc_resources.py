@@ -0,0 +1,68 @@
+import sys
+
+import pytest
+from pyld import jsonld
+
+from hydra_python_core.doc_resources import Resource, resource_class, resource_classes
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp
+from samples import doc_writer_sample
+from benchmarks.synthetic_doc import build_doc
+
+
+class TestResourceClass:
+
+    def test_round_trip(self):
+        Class0 = resource_classes(build_doc(3))["Class0"]
+        assert issubclass(Class0, Resource)
+        assert Class0.__slots__ == ("id_", "prop0", "prop1", "prop2", "prop3", "prop4", "link0")
+        resource = Class0("/api/Class0/1", prop0="a", prop1="b", link0="/api/Class1/2")
+        data = resource.to_jsonld()
+        assert data["@type"] == "Class0"
+        assert data["@context"]["prop0"] == "http://props.hydrus.com/prop0"
+        assert {key: data[key] for key in data if key[0] != "@"} == {
+            "prop0": "a", "prop1": "b", "link0": "/api/Class1/2"}
+        assert Class0.from_jsonld(data) == resource
+        # expanded keys are taken too
+        assert Class0.from_jsonld({"http://props.hydrus.com/prop0": "a"}).prop0 == "a"
+        resource.id_ = "http://hydrus.com/api/Class0/1"
+        expanded = jsonld.expand(resource.to_jsonld())
+        assert expanded[0]["@type"] == [Class0.class_id]
+        assert Class0.from_jsonld(expanded[0]) == resource
+        with pytest.raises(ValueError):
+            Class0.from_jsonld(dict(expanded[0], **{"@type": [Class0.class_id, "Other"]}))
+        assert not hasattr(resource, "__dict__")
+        assert sys.getsizeof(resource) < sys.getsizeof(dict(data))
+
+    def test_enforcement(self):
+        Class0 = resource_classes(build_doc(3))["Class0"]
+        resource = Class0(prop0="a", prop1="b")
+        resource.prop0 = "changed"
+        with pytest.raises(AttributeError):
+            # prop1 is not writeable
+            resource.prop1 = "changed"
+        with pytest.raises(AttributeError):
+            resource.unknown = 1
+        with pytest.raises(ValueError):
+            Class0(prop1="b")
+        with pytest.raises(ValueError):
+            Class0.from_jsonld({"prop0": "a", "unknown": 1})
+        with pytest.raises(ValueError):
+            Class0.from_jsonld({"@type": "Class1", "prop0": "a"})
+
+    def test_titles(self):
+        class_ = HydraClass("Odd Class", "Class with odd property titles")
+        for title in ("class", "first name", "first-name", "1st", "__private", "x²", "²x"):
+            class_.add_supported_prop(HydraClassProp("http://props.hydrus.com/" + title,
+                                                     title, True, False, False))
+        Odd = resource_class(class_, context="http://hydrus.com/api/contexts/Odd.jsonld")
+        assert Odd.__name__ == "Odd_Class"
+        assert Odd.__slots__ == ("id_", "class_", "first_name", "first_name_1", "f_1st",
+                                 "private", "x2", "f_2x")
+        resource = Odd(class_=1, f_1st=2)
+        # readable but not writeable properties are set by the constructor only
+        assert resource.to_jsonld() == {"@context": "http://hydrus.com/api/contexts/Odd.jsonld",
+                                        "@type": "Odd Class", "class": 1, "1st": 2}
+        assert set(resource_classes(doc_writer_sample.api_doc)) == \
+            set(doc_writer_sample.api_doc.parsed_classes)
+        with pytest.raises(TypeError):
+            Resource()
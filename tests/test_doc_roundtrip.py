@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from hydra_python_core.doc_maker import create_doc, create_doc_from_generated
+from hydra_python_core.doc_roundtrip import rebuild_doc
+from samples import doc_writer_sample
+from benchmarks.synthetic_doc import build_doc, make_doc
+
+SERVER_URL = "http://hydrus.com/"
+API_NAME = "api"
+
+
+class TestRebuildDoc:
+
+    @pytest.mark.parametrize("apidoc", [
+        doc_writer_sample.api_doc,
+        build_doc(12),
+        build_doc(4, links=0, collections=0, statuses=0),
+        build_doc(6, links=2, operations=0, collections=3),
+    ])
+    def test_round_trip(self, apidoc):
+        doc = json.loads(json.dumps(apidoc.generate()))
+        rebuilt = rebuild_doc(doc)
+        assert rebuilt is not None
+        assert rebuilt.generate() == doc
+        assert rebuilt.fingerprint() == apidoc.fingerprint()
+        assert rebuild_doc(doc, SERVER_URL, API_NAME) is not None
+
+    def test_other_docs(self):
+        # the statuses of make_doc have no @context
+        assert rebuild_doc(make_doc(3)) is None
+        doc = build_doc(3).generate()
+        assert rebuild_doc(doc, "http://other.com/", API_NAME) is None
+        doc["supportedClass"][0]["extra"] = True
+        assert rebuild_doc(doc) is None
+        doc = build_doc(3).generate()
+        # an operation of a collection which HydraCollection doesn't write
+        doc["supportedClass"][-2]["supportedOperation"][0]["description"] = "Changed"
+        assert rebuild_doc(doc) is None
+
+    def test_create_doc_from_generated(self):
+        doc = build_doc(5).generate()
+        apidoc = create_doc_from_generated(doc)
+        assert apidoc.generate() == doc
+        assert sorted(apidoc.parsed_classes) == sorted(build_doc(5).parsed_classes)
+        # other docs are created by create_doc
+        doc = make_doc(3)
+        assert create_doc_from_generated(doc, SERVER_URL, API_NAME).generate() == \
+            create_doc(doc, SERVER_URL, API_NAME).generate()
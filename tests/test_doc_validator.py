@@ -0,0 +1,78 @@
+from pyld import jsonld
+
+from hydra_python_core.doc_validator import validate_doc
+from samples import doc_writer_sample
+from benchmarks.synthetic_doc import build_doc, strip_remote_contexts
+
+
+def break_doc(doc):
+    class_ = doc["supportedClass"][0]
+    del class_["supportedProperty"][0]["readable"]
+    del class_["supportedOperation"][0]["method"]
+    del class_["supportedOperation"][1]["possibleStatus"][0]["statusCode"]
+    for collection in doc["supportedClass"]:
+        if "manages" in collection:
+            del collection["manages"]
+            collection["@type"] = "hydra:Collection"
+            break
+    for class_ in doc["supportedClass"]:
+        for prop in class_["supportedProperty"]:
+            if isinstance(prop["property"], dict) and prop["property"]["@type"] == "hydra:Link":
+                del prop["property"]["range"]
+                return doc
+
+
+class TestValidateDoc:
+
+    def test_valid_doc(self, get_offline_doc):
+        assert validate_doc(get_offline_doc) == []
+        assert validate_doc(jsonld.expand(get_offline_doc)) == []
+
+    def test_valid_generated_docs(self):
+        # the base Collection and the EntryPoint have properties with "required": null
+        for apidoc in (doc_writer_sample.api_doc, build_doc(5)):
+            doc = strip_remote_contexts(apidoc.generate())
+            assert validate_doc(doc) == []
+            assert validate_doc(jsonld.expand(doc)) == []
+
+    def test_collects_every_error(self, get_offline_doc):
+        doc = break_doc(get_offline_doc)
+        errors = validate_doc(doc)
+        messages = [error["message"] for error in errors]
+        assert messages.count("missing hydra:readable") == 1
+        assert messages.count("missing hydra:method") == 1
+        assert messages.count("missing hydra:statusCode") == 1
+        assert messages.count("collection is missing hydra:manages") == 1
+        assert messages.count("missing rdfs:range") == 1
+        assert {"path": "$.supportedClass[0].supportedProperty[0]",
+                "message": "missing hydra:readable"} in errors
+
+    def test_expanded_doc_errors(self, get_offline_doc):
+        doc = break_doc(get_offline_doc)
+        compact_messages = sorted(error["message"] for error in validate_doc(doc))
+        expanded_errors = validate_doc(jsonld.expand(doc))
+        assert sorted(error["message"] for error in expanded_errors) == compact_messages
+        assert all(error["path"].startswith("$[0]['http://www.w3.org/ns/hydra/core#")
+                   for error in expanded_errors)
+
+    def test_top_level_keys(self):
+        errors = validate_doc({"supportedClass": []})
+        messages = [error["message"] for error in errors]
+        assert "missing @context" in messages
+        assert "missing @id" in messages
+        assert "missing @type" in messages
+        assert "missing hydra:entrypoint" in messages
+
+    def test_context_aliases(self):
+        doc = {
+            "@context": {"h": "http://www.w3.org/ns/hydra/core#", "ops": "h:supportedOperation",
+                         "verb": {"@id": "h:method"}},
+            "@id": "http://hydrus.com/api/vocab",
+            "@type": "ApiDocumentation",
+            "entrypoint": "http://hydrus.com/api",
+            "possibleStatus": [],
+            "supportedClass": [{"@id": "Class", "supportedProperty": [],
+                                "ops": [{"verb": "PATCH"}]}],
+        }
+        assert validate_doc(doc) == [{"path": "$.supportedClass[0].ops[0].verb",
+                                      "message": "unsupported method 'PATCH'"}]
@@ -0,0 +1,113 @@
+import json
+import threading
+
+from pyld import jsonld
+
+from hydra_python_core import doc_maker
+from hydra_python_core.doc_writer import (HydraClass, HydraClassOp, HydraClassProp,
+                                          HydraCollection, HydraLink, HydraStatus, IriPool,
+                                          intern_iri)
+from hydra_python_core.namespace import hydra
+from benchmarks.synthetic_doc import build_doc, strip_remote_contexts
+
+
+class TestHydraDoc:
+
+    def test_check_integrity_valid(self):
+        apidoc = build_doc(10, links=2, collections=3)
+        report = apidoc.check_integrity()
+        assert report["valid"]
+        assert report["dangling"] == []
+        assert report["checked"] > 0
+
+    def test_check_integrity_dangling(self):
+        apidoc = build_doc(3)
+        checked = apidoc.check_integrity()["checked"]
+        vocab = apidoc.parsed_classes["Class0"]["class"].id_.replace("Class0", "")
+        class_ = HydraClass("Broken", "A class with dangling references", endpoint=False)
+        class_.add_supported_op(HydraClassOp("GetMissing", "GET", None, vocab + "Missing"))
+        class_.add_supported_prop(HydraClassProp(
+            HydraLink("broken_link", "link", "", class_.id_, vocab + "Nowhere"),
+            "link", read=True, write=False, required=False))
+        class_.add_supported_prop(HydraClassProp(
+            "http://props.hydrus.com/external", "external", read=True, write=False,
+            required=False, range="http://schema.org/Text"))
+        # CURIEs, of the vocabulary and of a prefix of the context
+        class_.add_supported_op(HydraClassOp("GetCurie", "GET", "vocab:Class1", "vocab:Gone"))
+        class_.add_supported_op(HydraClassOp("GetHydra", "GET", None, "hydra:Collection"))
+        apidoc.add_supported_class(class_)
+
+        report = apidoc.check_integrity()
+        assert not report["valid"]
+        assert sorted((error["location"], error["reference"]) for error in report["dangling"]) \
+            == [("supportedOperation[0].returns", vocab + "Missing"),
+                ("supportedOperation[1].returns", "vocab:Gone"),
+                ("supportedProperty[0].property.range", vocab + "Nowhere")]
+        assert all(error["source"] == class_.id_ for error in report["dangling"])
+        # the link's domain and range, the returns and the CURIEs of the vocabulary
+        assert report["checked"] == checked + 5
+
+    def test_iri_pool(self, get_offline_doc):
+        apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+        class_ = apidoc.parsed_classes["dummyClass"]["class"]
+        for op in class_.supportedOperation:
+            for iri in (op.expects, op.returns):
+                if iri == class_.id_:
+                    assert iri is class_.id_
+        assert IriPool.active is None
+
+    def test_iri_pool_doc_writer(self):
+        with IriPool() as pool:
+            first = HydraStatus(200, title="".join(["O", "K"]))
+            second = HydraStatus(200, title="".join(["O", "K"]))
+            assert first.title is second.title
+            assert intern_iri(hydra["Collection"]) is hydra["Collection"]
+        assert len(pool) > 0
+        assert HydraStatus(200, title="".join(["O", "K"])).title is not first.title
+
+    def test_iri_pool_threads(self):
+        started = threading.Barrier(2)
+        pools = {}
+
+        def build(name):
+            with IriPool() as pool:
+                started.wait(10)
+                HydraStatus(200, title=name)
+                started.wait(10)
+                assert IriPool.active is pool
+            pools[name] = pool
+
+        threads = [threading.Thread(target=build, args=(name,)) for name in ("first", "second")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # each thread pooled into its own pool, none is left active
+        assert "first" in pools["first"].strings and "first" not in pools["second"].strings
+        assert IriPool.active is None
+
+    def test_iri_pool_manages(self):
+        manages = {"property": "rdf:type", "object": "".join(["Class", "0"])}
+        with IriPool():
+            collection = HydraCollection("Collection0", manages=manages)
+        assert collection.manages == manages
+        assert collection.manages is not manages
+
+    def test_generate_compact(self, get_offline_doc):
+        apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+        regular = strip_remote_contexts(apidoc.generate())
+        compact = strip_remote_contexts(apidoc.generate(compact=True))
+        assert len(json.dumps(compact)) < len(json.dumps(regular))
+        assert json.dumps(jsonld.expand(compact), sort_keys=True) \
+            == json.dumps(jsonld.expand(regular), sort_keys=True)
+
+    def test_generate_compact_vocab_prefix(self):
+        compact = build_doc(2).generate(compact=True)
+        assert compact["@context"]["vocab"] == {
+            "@id": "http://hydrus.com/api/vocab?resource=", "@prefix": True}
+        class_ = compact["supportedClass"][0]
+        assert class_["@id"] == "vocab:Class0"
+        assert class_["supportedOperation"][0]["returns"] == "vocab:Class0"
+        # statuses keep their own context and are left as is
+        status = class_["supportedOperation"][0]["possibleStatus"][0]
+        assert status["@context"] == "https://www.w3.org/ns/hydra/core"
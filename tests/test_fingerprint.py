@@ -0,0 +1,87 @@
+import gc
+import pickle
+
+from hydra_python_core.doc_writer import HydraClassOp, HydraClassProp, HydraStatus
+from hydra_python_core import fingerprint
+from hydra_python_core.fingerprint import Fingerprinted
+from benchmarks.synthetic_doc import build_doc
+
+
+class TestFingerprint:
+
+    def test_same_content(self):
+        apidoc = build_doc(5)
+        assert apidoc.fingerprint() == build_doc(5).fingerprint()
+        assert apidoc.fingerprint() != build_doc(6).fingerprint()
+        assert apidoc.etag() == '"{}"'.format(apidoc.fingerprint())
+        copy = pickle.loads(pickle.dumps(apidoc))
+        assert copy.fingerprint() == apidoc.fingerprint()
+
+    def test_attribute_change(self):
+        apidoc = build_doc(3)
+        class0 = apidoc.parsed_classes["Class0"]["class"]
+        class1 = apidoc.parsed_classes["Class1"]["class"]
+        before = (apidoc.fingerprint(), class0.fingerprint(), class1.fingerprint())
+        class0.supportedProperty[0].title = "renamed"
+        assert class0.fingerprint() != before[1]
+        assert apidoc.fingerprint() != before[0]
+        assert class1.fingerprint() == before[2]
+        class0.supportedProperty[0].title = "prop0"
+        assert (apidoc.fingerprint(), class0.fingerprint(), class1.fingerprint()) == before
+
+    def test_add_and_shared_children(self):
+        apidoc = build_doc(2)
+        class0 = apidoc.parsed_classes["Class0"]["class"]
+        class1 = apidoc.parsed_classes["Class1"]["class"]
+        status = HydraStatus(200, title="OK")
+        class0.add_supported_op(HydraClassOp("Get0", "GET", None, class0.id_,
+                                             possible_status=[status]))
+        class1.add_supported_op(HydraClassOp("Get1", "GET", None, class1.id_,
+                                             possible_status=[status]))
+        before = (apidoc.fingerprint(), class0.fingerprint(), class1.fingerprint())
+        status.desc = "Changed"
+        after = (apidoc.fingerprint(), class0.fingerprint(), class1.fingerprint())
+        assert all(old != new for old, new in zip(before, after))
+        class0.add_supported_prop(HydraClassProp("http://props.hydrus.com/new", "new",
+                                                 True, True, False))
+        assert class0.fingerprint() != after[1]
+        assert apidoc.fingerprint() != after[0]
+
+    def test_in_place_edit(self):
+        apidoc = build_doc(2)
+        class0 = apidoc.parsed_classes["Class0"]["class"]
+        before = apidoc.fingerprint()
+        class0.supportedProperty.pop()
+        # the list is not watched
+        assert apidoc.fingerprint() == before
+        class0.invalidate()
+        assert apidoc.fingerprint() != before
+
+    def test_owners_are_weak(self):
+        status = HydraStatus(200, title="OK")
+        op = HydraClassOp("Get", "GET", None, None, possible_status=[status])
+        other = HydraClassOp("Other", "GET", None, None, possible_status=[status])
+        op.fingerprint()
+        assert status._owners() is op
+        other.fingerprint()
+        assert {owner_ref() for owner_ref in status._owners} == {op, other}
+        del op
+        gc.collect()
+        # a shared child does not keep the templates holding it alive
+        before = other.fingerprint()
+        status.desc = "Changed"
+        assert [owner_ref() for owner_ref in status._owners] == [other]
+        assert other.fingerprint() != before
+
+    def test_watched_from_first_fingerprint(self, monkeypatch):
+        if "__setattr__" in Fingerprinted.__dict__:
+            # installed by the fingerprints of the other tests, and again by this one
+            del Fingerprinted.__setattr__
+        monkeypatch.setattr(fingerprint, "_watching", False)
+        apidoc = build_doc(2)
+        # building a doc doesn't go through the hook
+        assert "__setattr__" not in Fingerprinted.__dict__
+        before = apidoc.fingerprint()
+        assert "__setattr__" in Fingerprinted.__dict__
+        apidoc.parsed_classes["Class0"]["class"].title = "Renamed"
+        assert apidoc.fingerprint() != before
@@ -0,0 +1,75 @@
+import pytest
+
+from hydra_python_core import instance_validator
+from hydra_python_core.instance_validator import validate_batch, validate_columns
+from hydra_python_core.doc_writer import HydraClass, HydraClassProp
+from benchmarks.synthetic_doc import build_doc
+
+
+def book_class():
+    class_ = HydraClass("Book", "A book")
+    for title, range_, required, write in (("title", "xsd:string", True, True),
+                                           ("pages", "xsd:integer", False, True),
+                                           ("price", "xsd:decimal", False, True),
+                                           ("isbn", "xsd:string", False, False)):
+        class_.add_supported_prop(HydraClassProp("http://props.hydrus.com/" + title, title,
+                                                 read=True, write=write, required=required,
+                                                 range=range_))
+    return class_
+
+
+class TestValidateBatch:
+
+    def test_valid(self):
+        class_ = build_doc(2).parsed_classes["Class0"]["class"]
+        instances = [{"@id": "/api/Class0/{}".format(i), "@type": "Class0", "prop0": "a",
+                      "http://props.hydrus.com/prop2": "b"} for i in range(10)]
+        assert validate_batch(class_, instances) == {}
+
+    def test_errors_by_row(self):
+        instances = [
+            {"title": "A", "pages": 10, "price": 1},
+            {"pages": 10},
+            {"title": "C", "isbn": "123"},
+            {"http://props.hydrus.com/title": "D", "pages": "10", "price": True},
+            {"title": None, "author": "someone"},
+            {"title": "F", "price": 2.5},
+        ]
+        assert validate_batch(book_class(), instances) == {
+            1: ["missing required property 'title'"],
+            2: ["'isbn' is not writeable"],
+            3: ["'pages' must be an integer", "'price' must be a number"],
+            4: ["unknown property 'author'", "missing required property 'title'"],
+        }
+
+    def test_expanded(self):
+        instances = [
+            {"http://props.hydrus.com/title": [{"@value": "A"}],
+             "http://props.hydrus.com/pages": [{"@value": 10}],
+             "http://props.hydrus.com/price": [{"@value": 2.5}]},
+            {"http://props.hydrus.com/title": [{"@value": "B"}],
+             "http://props.hydrus.com/pages": [{"@value": "10"}]},
+        ]
+        assert validate_batch(book_class(), instances) == {1: ["'pages' must be an integer"]}
+
+
+class TestValidateColumns:
+
+    def test_errors_by_row(self):
+        columns = {"title": ["A", None, "C"], "pages": [1, 2.5, None], "isbn": [None, None, "1"]}
+        assert validate_columns(book_class(), columns) == {
+            1: ["missing required property 'title'", "'pages' must be an integer"],
+            2: ["'isbn' is not writeable"],
+        }
+        assert validate_columns(book_class(), {"pages": [1, 2]}) == {
+            0: ["missing required property 'title'"], 1: ["missing required property 'title'"]}
+        with pytest.raises(ValueError):
+            validate_columns(book_class(), {"title": ["A"], "pages": [1, 2]})
+
+    @pytest.mark.skipif(instance_validator.numpy is None, reason="numpy is not installed")
+    def test_numpy_columns(self):
+        numpy = instance_validator.numpy
+        columns = {"title": ["A", "B", "C"], "pages": numpy.array([1.0, numpy.nan, 3.0]),
+                   "price": numpy.array([1, 2, 3])}
+        assert validate_columns(book_class(), columns) == {
+            0: ["'pages' must be an integer"], 2: ["'pages' must be an integer"]}
@@ -0,0 +1,69 @@
+import threading
+
+from hydra_python_core import doc_maker
+from hydra_python_core.instrumentation import Instrumentation, phase
+
+
+class TestInstrumentation:
+
+    def test_disabled_phase_is_noop(self):
+        assert Instrumentation.active is None
+        with phase("create_doc.expand") as phase_:
+            phase_.add(10)
+        assert Instrumentation.active is None
+
+    def test_create_doc_and_generate_phases(self, get_offline_doc):
+        hooked = []
+        with Instrumentation(hook=lambda *args: hooked.append(args)) as instrumentation:
+            apidoc = doc_maker.create_doc(get_offline_doc, "http://hydrus.com/", "api")
+            apidoc.generate()
+        assert Instrumentation.active is None
+
+        metrics = instrumentation.as_dict()
+        for name in ("create_doc.expand", "create_doc.classify", "create_doc.create_class",
+                     "create_doc.create_collection", "create_doc.create_status",
+                     "create_doc.gen_EntryPoint", "generate.supportedClass",
+                     "generate.collections", "generate.entrypoint",
+                     "generate.possibleStatus"):
+            assert metrics[name]["calls"] == 1
+            assert metrics[name]["seconds"] >= 0
+        assert metrics["create_doc.create_class"]["objects"] == len(apidoc.parsed_classes)
+        assert metrics["create_doc.create_collection"]["objects"] == len(apidoc.collections)
+        assert len(hooked) == len(metrics)
+
+    def test_nested_instrumentation(self):
+        with Instrumentation() as outer:
+            with Instrumentation() as inner:
+                with phase("inner"):
+                    pass
+            with phase("outer") as phase_:
+                phase_.add(2)
+        assert list(inner.as_dict()) == ["inner"]
+        assert outer.as_dict()["outer"]["objects"] == 2
+
+    def test_threads_record_their_own_phases(self):
+        started = threading.Barrier(2)
+        recorders = {}
+
+        def record(name):
+            with Instrumentation() as instrumentation:
+                started.wait(10)
+                for _ in range(100):
+                    with phase(name):
+                        pass
+                started.wait(10)
+            recorders[name] = instrumentation
+
+        with Instrumentation() as main:
+            threads = [threading.Thread(target=record, args=(name,)) for name in ("a", "b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert Instrumentation.active is main
+        assert Instrumentation.active is None
+        assert recorders["a"].as_dict()["a"]["calls"] == 100
+        assert list(recorders["a"].as_dict()) == ["a"]
+        assert list(recorders["b"].as_dict()) == ["b"]
+        # the phases of the other threads are not recorded by the recorder of this one
+        assert main.as_dict() == {}
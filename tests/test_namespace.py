@@ -0,0 +1,56 @@
+from hydra_python_core.doc_writer import Context
+from hydra_python_core.namespace import NamespaceRegistry, PrefixTrie, hydra, rdfs
+
+
+class TestPrefixTrie:
+
+    def test_longest_prefix(self):
+        trie = PrefixTrie()
+        trie.add("http://example.com/", "ex")
+        trie.add("http://example.com/vocab#", "vocab")
+        assert trie.longest_prefix("http://example.com/vocab#Thing") == (25, "vocab")
+        assert trie.longest_prefix("http://example.com/other") == (19, "ex")
+        assert trie.longest_prefix("http://example.org/") == (0, None)
+
+
+class TestNamespaceRegistry:
+
+    def setup_method(self):
+        context = dict(Context("http://hydrus.com/").generate())
+        context["vocab"] = {"@id": "http://hydrus.com/api/vocab?resource=", "@prefix": True}
+        context["https"] = "https://www.example.com/"
+        self.registry = NamespaceRegistry.from_context(context)
+
+    def test_prefixes(self):
+        assert self.registry.prefixes["hydra"] == "http://www.w3.org/ns/hydra/core#"
+        assert self.registry.prefixes["vocab"] == "http://hydrus.com/api/vocab?resource="
+        # expanded term definitions are only prefixes with "@prefix": true
+        assert "property" not in self.registry.prefixes
+
+    def test_compact(self):
+        assert self.registry.compact(hydra["Link"]) == "hydra:Link"
+        assert self.registry.compact("http://hydrus.com/api/vocab?resource=Drone") \
+            == "vocab:Drone"
+        assert self.registry.compact("http://schema.org/Text") == "http://schema.org/Text"
+        # terms only apply to vocabulary relative values
+        assert self.registry.compact(hydra["ApiDocumentation"]) == "hydra:ApiDocumentation"
+        assert self.registry.compact(hydra["ApiDocumentation"], vocab=True) \
+            == "ApiDocumentation"
+
+    def test_compact_suffix_starting_with_slashes(self):
+        assert self.registry.compact("https://www.example.com///x") \
+            == "https://www.example.com///x"
+
+    def test_compact_key(self):
+        assert self.registry.compact_key("hydra:title") == "title"
+        assert self.registry.compact_key(rdfs["label"]) == "label"
+        # the term keeps the @type coercion of the key
+        assert self.registry.compact_key("hydra:property") == "hydra:property"
+        assert self.registry.compact_key("property") == "property"
+        assert self.registry.compact_key("@id") == "@id"
+
+    def test_expand(self):
+        assert self.registry.expand("vocab:Drone") == "http://hydrus.com/api/vocab?resource=Drone"
+        assert self.registry.expand("title") == "title"
+        assert self.registry.expand("title", vocab=True) == hydra["title"]
+        assert self.registry.expand("http://schema.org/Text") == "http://schema.org/Text"